@@ -0,0 +1,300 @@
+from array import array
+from collections import Counter
+from datetime import date
+from functools import lru_cache
+from itertools import compress, repeat
+from operator import and_, le, mod, sub
+
+from deadlines import deadline_ordinal, format_ordinal
+from models import COMPLETED
+from records import PRIORITIES, SUBJECTS
+
+PERIODS = ("day", "week", "month")
+GROUPS = ("subject", "priority")
+LATENESS_BUCKETS = (("erkən", None, -1), ("vaxtında", 0, 0), ("1 gün", 1, 1),
+                    ("2-3 gün", 2, 3), ("4-7 gün", 4, 7), ("8+ gün", 8, None))
+
+
+class Labels:
+    """Etiketləri sütunlarda saxlamaq üçün kiçik tam kodlara çevir"""
+
+    def __init__(self, values):
+        self.values = list(values)
+        self.codes = {value: code for code, value in enumerate(self.values)}
+
+    def code(self, value):
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+LABELS = {"subject": Labels(SUBJECTS), "priority": Labels(PRIORITIES)}
+
+
+def field_ordinal(hw, key):
+    """Tarix sahəsinin sıra nömrəsi; yoxdursa və ya səhvdirsə 0"""
+    packed = getattr(hw, "packed_ordinal", None)
+    ordinal = packed(key) if packed is not None else None
+    if ordinal is None:
+        value = hw.get(key)
+        if isinstance(value, str) and value:
+            ordinal = deadline_ordinal(value.split(" ")[0])
+    return ordinal or 0
+
+
+@lru_cache(maxsize=4096)
+def month_start(ordinal):
+    return date.fromordinal(ordinal).replace(day=1).toordinal() if ordinal > 0 else 0
+
+
+def period_starts(column, period):
+    """Sıra nömrələri sütununu dövrün ilk gününə çevir (tarix yoxdursa <= 0)"""
+    if period == "day":
+        return column
+    if period == "week":
+        # Sıra nömrəsi 1 bazar ertəsidir: o - (o - 1) % 7 həftənin başlanğıcıdır
+        return map(sub, column, map(mod, map(sub, column, repeat(1)), repeat(7)))
+    if period == "month":
+        return map(month_start, column)
+    raise ValueError(f"Naməlum dövr: {period}")
+
+
+def period_start(ordinal, period):
+    """Tarixin düşdüyü dövrün ilk günü"""
+    return next(iter(period_starts((ordinal,), period)))
+
+
+def shift_period(start, period, count):
+    """Dövr başlanğıcını count dövr irəli (mənfi olduqda geri) sürüşdür"""
+    if period == "day":
+        return start + count
+    if period == "week":
+        return start + 7 * count
+    d = date.fromordinal(start)
+    months = d.year * 12 + d.month - 1 + count
+    return date(months // 12, months % 12 + 1, 1).toordinal()
+
+
+class Columns:
+    """Tapşırıqlar sütunlar şəklində: hər sahə ayrıca array, id -> sətir xəritəsi"""
+    TYPES = (("id", "q"), ("created", "l"), ("completed", "l"), ("deadline", "l"),
+             ("subject", "h"), ("priority", "h"), ("done", "b"))
+
+    def __init__(self, homeworks=()):
+        for name, code in self.TYPES:
+            setattr(self, name, array(code))
+        self.rows = {}
+        for hw in homeworks:
+            self.add(hw)
+
+    def __len__(self):
+        return len(self.id)
+
+    @staticmethod
+    def values(hw):
+        done = hw["status"] == COMPLETED
+        return (hw["id"], field_ordinal(hw, "created_date"),
+                field_ordinal(hw, "completed_date") if done else 0,
+                field_ordinal(hw, "deadline"), LABELS["subject"].code(hw["subject"]),
+                LABELS["priority"].code(hw["priority"]), done)
+
+    def add(self, hw):
+        """Tapşırığı yeni sətir kimi əlavə et"""
+        if hw["id"] in self.rows:
+            return self.update(hw)
+        self.rows[hw["id"]] = len(self.id)
+        for (name, _), value in zip(self.TYPES, self.values(hw)):
+            getattr(self, name).append(value)
+
+    def update(self, hw):
+        """Dəyişmiş tapşırığın sətrini yenidən yaz"""
+        row = self.rows.get(hw["id"])
+        if row is None:
+            return self.add(hw)
+        for (name, _), value in zip(self.TYPES, self.values(hw)):
+            getattr(self, name)[row] = value
+
+    def remove(self, hw_id):
+        """Sətri sil: yerinə sonuncu sətir köçürülür"""
+        row = self.rows.pop(hw_id, None)
+        if row is None:
+            return
+        last = len(self.id) - 1
+        for name, _ in self.TYPES:
+            column = getattr(self, name)
+            if row != last:
+                column[row] = column[last]
+            column.pop()
+        if row != last:
+            self.rows[self.id[row]] = row
+
+    @classmethod
+    def merge(cls, parts):
+        """Bir neçə sütun dəstini birləşdir (sətir xəritəsi olmadan, yalnız oxumaq üçün)"""
+        merged = cls()
+        for name, _ in cls.TYPES:
+            column = getattr(merged, name)
+            for part in parts:
+                column.extend(getattr(part, name))
+        return merged
+
+
+class Analytics:
+    """Aktiv tapşırıqlar və arxiv üzrə sütunlu, qruplaşdırılan analitika sorğuları"""
+
+    def __init__(self, active, archive):
+        # active: aktiv tapşırıqların artımlı yenilənən Columns obyektini qaytaran funksiya
+        self.active = active
+        self.archive = archive
+        self._archived = None
+
+    @property
+    def archived(self):
+        """Arxivdəki tapşırıqların sütunları; ilk sorğuda seqmentlərdən oxunur"""
+        if self._archived is None:
+            self._archived = Columns(self.archive.iter_homeworks())
+        return self._archived
+
+    def add_archived(self, homeworks):
+        """Arxivə yeni köçürülmüş tapşırıqları əlavə et"""
+        if self._archived is not None:
+            for hw in homeworks:
+                self._archived.add(hw)
+
+    def columns(self):
+        archived = self.archived
+        return Columns.merge([self.active(), archived]) if len(archived) else self.active()
+
+    @staticmethod
+    def period_counts(cols, period="week", by=None):
+        """(dövr, qrup) -> (ümumi, tamamlanmış, vaxtında) son tarix dövrünə görə"""
+        pairs = list(zip(period_starts(cols.deadline, period),
+                         getattr(cols, by) if by else repeat(0)))
+        total = Counter(pairs)
+        completed = Counter(compress(pairs, cols.done))
+        # Tamamlanmamışların completed sütunu 0-dır, done maskası onları atır
+        on_time = Counter(compress(pairs, map(and_, cols.done,
+                                              map(le, cols.completed, cols.deadline))))
+        return {key: (n, completed[key], on_time[key]) for key, n in total.items()
+                if key[0] > 0}
+
+    def rates(self, period="week", by=None, periods=8, today=None, counts=None):
+        """Son periods dövr üzrə tamamlama və vaxtında tamamlama faizləri"""
+        if counts is None:
+            counts = self.period_counts(self.columns(), period, by)
+        last = period_start((today or date.today()).toordinal(), period)
+        first = shift_period(last, period, 1 - periods)
+        labels = LABELS[by].values if by else None
+        rows = []
+        for (start, group), (total, completed, on_time) in sorted(counts.items()):
+            if first <= start <= last:
+                rows.append(rate_row(start, labels[group] if labels else None,
+                                     total, completed, on_time))
+        return rows
+
+    def rolling(self, period="week", window=4, by=None, periods=8, today=None, counts=None):
+        """Hər dövr üçün son window dövrün cəmi üzrə tamamlama faizi"""
+        if counts is None:
+            counts = self.period_counts(self.columns(), period, by)
+        last = period_start((today or date.today()).toordinal(), period)
+        first = shift_period(last, period, 1 - periods)
+        labels = LABELS[by].values if by else None
+        starts = [shift_period(first, period, i) for i in range(1 - window, periods)]
+        rows = []
+        for group in sorted({group for _, group in counts}):
+            sums = [0, 0, 0]
+            series = [counts.get((start, group), (0, 0, 0)) for start in starts]
+            for i, values in enumerate(series):
+                sums = list(map(sum, zip(sums, values)))
+                if i >= window:
+                    sums = list(map(sub, sums, series[i - window]))
+                if i >= window - 1 and sums[0]:
+                    rows.append(rate_row(starts[i], labels[group] if labels else None, *sums))
+        rows.sort(key=lambda row: deadline_ordinal(row["period"]))
+        return rows
+
+    def lateness(self, by=None, cols=None):
+        """Tamamlanmış tapşırıqların son tarixə nisbətən gecikmə paylanması"""
+        cols = self.columns() if cols is None else cols
+        mask = list(map(all, zip(cols.done, cols.deadline, cols.completed)))
+        days = map(sub, compress(cols.completed, mask), compress(cols.deadline, mask))
+        groups = compress(getattr(cols, by), mask) if by else repeat(0)
+        counts = Counter(zip(groups, days))
+        labels = LABELS[by].values if by else None
+        per_group = {}
+        for (group, late), n in counts.items():
+            per_group.setdefault(group, Counter())[late] = n
+        return [lateness_summary(labels[group] if labels else None, per_group[group])
+                for group in sorted(per_group)]
+
+    def streaks(self, today=None, cols=None):
+        """Ardıcıl ən azı bir tapşırıq tamamlanan günlər: cari və ən uzun seriya"""
+        cols = self.columns() if cols is None else cols
+        days = set(compress(cols.completed, cols.done))
+        days.discard(0)
+        longest = run = 0
+        previous = None
+        for day in sorted(days):
+            run = run + 1 if previous == day - 1 else 1
+            longest = max(longest, run)
+            previous = day
+        today = (today or date.today()).toordinal()
+        current = 0
+        # Bu gün hələ heç nə tamamlanmayıbsa dünənə qədərki seriya davam edir
+        day = today if today in days else today - 1
+        while day in days:
+            current += 1
+            day -= 1
+        return {"current": current, "longest": longest, "active_days": len(days),
+                "last_day": format_ordinal(max(days)) if days else None}
+
+    def report(self, period="week", by=None, window=4, periods=8, today=None):
+        """Dövr faizləri, sürüşən pəncərə, gecikmə və seriyalar bir hesabatda"""
+        if period not in PERIODS:
+            raise ValueError(f"Naməlum dövr: {period}")
+        if by is not None and by not in GROUPS:
+            raise ValueError(f"Naməlum qruplaşdırma: {by}")
+        cols = self.columns()
+        counts = self.period_counts(cols, period, by)
+        return {
+            "period": period,
+            "by": by,
+            "window": window,
+            "rows": len(cols),
+            "rates": self.rates(period, by, periods, today, counts),
+            "rolling": self.rolling(period, window, by, periods, today, counts),
+            "lateness": self.lateness(by, cols),
+            "streaks": self.streaks(today, cols),
+        }
+
+
+def rate_row(start, group, total, completed, on_time):
+    return {"period": format_ordinal(start), "group": group, "total": total,
+            "completed": completed, "on_time": on_time,
+            "rate": round(completed / total * 100, 1) if total else 0.0,
+            "on_time_rate": round(on_time / total * 100, 1) if total else 0.0}
+
+
+def lateness_summary(group, counts):
+    """Gecikmə günlərinin sayğacından xülasə"""
+    total = sum(counts.values())
+    late = {days: n for days, n in counts.items() if days > 0}
+    late_count = sum(late.values())
+    distribution = []
+    for label, low, high in LATENESS_BUCKETS:
+        n = sum(count for days, count in counts.items()
+                if (low is None or days >= low) and (high is None or days <= high))
+        distribution.append({"bucket": label, "count": n})
+    return {
+        "group": group,
+        "count": total,
+        "on_time": total - late_count,
+        "on_time_rate": round((total - late_count) / total * 100, 1) if total else 0.0,
+        "late": late_count,
+        "average_days_late": (round(sum(days * n for days, n in late.items()) / late_count, 1)
+                              if late_count else 0.0),
+        "max_days_late": max(late, default=0),
+        "distribution": distribution,
+    }
@@ -0,0 +1,139 @@
+import gzip
+import io
+import json
+import os
+from datetime import date
+
+from deadlines import deadline_ordinal
+from journal import atomic_write_json
+from records import to_json
+
+
+def completed_ordinal(hw):
+    """Tamamlanma tarixinin sıra nömrəsi (tarix yoxdursa və ya səhvdirsə None)"""
+    completed = hw.get("completed_date")
+    if not completed:
+        return None
+    return deadline_ordinal(completed.split(" ")[0])
+
+
+def month_key(ordinal):
+    """Sıra nömrəsini İLİL-AA seqment açarına çevir"""
+    return date.fromordinal(ordinal).strftime("%Y-%m")
+
+
+class SegmentReader(io.RawIOBase):
+    """Seqment faylını manifestdə qeyd olunmuş ölçüyə qədər oxu"""
+
+    def __init__(self, raw, limit):
+        self.raw = raw
+        self.remaining = limit
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        data = self.raw.read(min(len(buffer), self.remaining))
+        buffer[:len(data)] = data
+        self.remaining -= len(data)
+        return len(data)
+
+
+class Archive:
+    """Köhnə tamamlanmış tapşırıqlar üçün aylıq, sıxılmış, yalnız əlavə olunan seqmentlər"""
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.manifest_path = os.path.join(directory, "manifest.json")
+        self._manifest = None
+
+    @property
+    def manifest(self):
+        """Seqmentlərin say/ölçü məlumatı; ilk müraciətdə oxunur"""
+        if self._manifest is None:
+            self._manifest = {"segments": {}, "pending": []}
+            if os.path.exists(self.manifest_path):
+                with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                    self._manifest.update(json.load(f))
+        return self._manifest
+
+    def exists(self):
+        return os.path.exists(self.manifest_path)
+
+    def segment_path(self, month):
+        return os.path.join(self.directory, f"{month}.jsonl.gz")
+
+    def months(self):
+        """Arxivdəki ayların siyahısı"""
+        return sorted(self.manifest["segments"])
+
+    def pending(self):
+        """Seqmentə yazılmış, amma aktiv saxlamadan hələ çıxarılmamış id-lər"""
+        if self._manifest is None and not self.exists():
+            return []
+        return list(self.manifest["pending"])
+
+    def append(self, homeworks):
+        """Tapşırıqları ay seqmentlərinə əlavə et və id-ləri gözləmədə qeyd et"""
+        groups = {}
+        for hw in homeworks:
+            groups.setdefault(month_key(completed_ordinal(hw)), []).append(hw)
+        os.makedirs(self.directory, exist_ok=True)
+
+        segments = self.manifest["segments"]
+        for month, records in sorted(groups.items()):
+            info = segments.setdefault(month, {"bytes": 0, "count": 0,
+                                               "subjects": {}, "priorities": {}})
+            path = self.segment_path(month)
+            with open(path, 'ab') as raw:
+                # Manifestdə qeyd olunmamış yarımçıq quyruğu at
+                raw.truncate(info["bytes"])
+                raw.seek(info["bytes"])
+                with gzip.GzipFile(fileobj=raw, mode='wb') as gz:
+                    gz.write("".join(json.dumps(hw, ensure_ascii=False, default=to_json) + "\n"
+                                     for hw in records).encode("utf-8"))
+                raw.flush()
+                os.fsync(raw.fileno())
+                info["bytes"] = raw.tell()
+            info["count"] += len(records)
+            for hw in records:
+                for key, value in (("subjects", hw["subject"]), ("priorities", hw["priority"])):
+                    info[key][value] = info[key].get(value, 0) + 1
+
+        self.manifest["pending"] = [hw["id"] for hw in homeworks]
+        atomic_write_json(self.manifest_path, self.manifest)
+
+    def commit(self):
+        """Gözləmədə olan id-lər aktiv saxlamadan çıxarıldı"""
+        if self.manifest["pending"]:
+            self.manifest["pending"] = []
+            atomic_write_json(self.manifest_path, self.manifest)
+
+    def iter_homeworks(self, start=None, end=None):
+        """[start, end] aylarının tapşırıqlarını seqment-seqment axınla ver"""
+        if not self.exists():
+            return
+        for month in self.months():
+            if (start and month < start) or (end and month > end):
+                continue
+            limit = self.manifest["segments"][month]["bytes"]
+            with open(self.segment_path(month), 'rb') as raw, \
+                    gzip.open(SegmentReader(raw, limit), 'rt', encoding='utf-8') as f:
+                for line in f:
+                    yield json.loads(line)
+
+    def stats(self):
+        """Arxivin tamamlama sayğacları (yalnız manifestdən, seqmentləri oxumadan)"""
+        stats = {"total": 0, "completed": 0, "subjects": {}, "priorities": {}}
+        if not self.exists():
+            return stats
+        for info in self.manifest["segments"].values():
+            stats["total"] += info["count"]
+            stats["completed"] += info["count"]
+            for key in ("subjects", "priorities"):
+                for value, n in info[key].items():
+                    bucket = stats[key].setdefault(value, {"total": 0, "completed": 0})
+                    bucket["total"] += n
+                    bucket["completed"] += n
+        return stats
+
@@ -0,0 +1,314 @@
+import argparse
+import builtins
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager, redirect_stdout
+from datetime import date, datetime, timedelta
+
+from dt import HomeworkTracker
+from models import COMPLETED, PENDING, Priority, Subject
+from records import HomeworkRecord, SessionRecord
+from scheduler import WEEKDAYS
+from storage import STORAGE_KINDS, open_storage
+
+DEFAULT_SIZES = (10**3, 10**4, 10**5, 10**6)
+DT_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "dt.py")
+MENU_PROMPT = "Seçiminiz".encode("utf-8")
+VIEW_FILTERS = ("all", "pending", "completed", "urgent", "overdue", "due_soon", "by_deadline")
+# Məlumat və nəticələr gündən-günə dəyişməsin deyə sabit "bu gün"
+ANCHOR_DATE = date(2025, 3, 3)
+# Ölçülən yollar da bu anı "indi" kimi görür ki, görülən iş işə salınma günündən asılı olmasın
+ANCHOR_NOW = datetime(2025, 3, 3, 17, 0)
+
+
+def generate(n, seed=0, today=None, sessions_per_day=None):
+    """N tapşırıq və sıx həftəlik cədvəl yarat (eyni seed - eyni məlumat)"""
+    rng = random.Random(seed)
+    today = today or ANCHOR_DATE
+    subjects = [s.value for s in Subject]
+    priorities = [p.value for p in Priority]
+
+    homeworks = []
+    for hw_id in range(1, n + 1):
+        created = today - timedelta(days=rng.randint(0, 120))
+        deadline = created + timedelta(days=rng.randint(-5, 60))
+        done = rng.random() < 0.4
+        # Tamamlama son tarixdən bir neçə gün əvvəl və ya sonra, yaradılmadan tez olmayaraq
+        completed = min(max(deadline + timedelta(days=rng.randint(-10, 7)), created), today)
+        homeworks.append({
+            "id": hw_id,
+            "title": f"Tapşırıq {hw_id}",
+            "subject": rng.choice(subjects),
+            "description": f"Sintetik tapşırıq #{hw_id}",
+            "deadline": deadline.strftime("%d.%m.%Y"),
+            "priority": rng.choice(priorities),
+            "estimated_time": str(rng.randint(1, 5)),
+            "status": COMPLETED if done else PENDING,
+            "created_date": created.strftime("%d.%m.%Y"),
+            "completed_date": completed.strftime("%d.%m.%Y") if done else None,
+            "notes": [],
+        })
+
+    if sessions_per_day is None:
+        sessions_per_day = max(4, n // 70)
+    schedule = {}
+    for day in WEEKDAYS:
+        sessions = []
+        for _ in range(sessions_per_day):
+            start = rng.randint(6 * 60, 22 * 60)
+            end = min(start + rng.choice((30, 45, 60, 90)), 23 * 60 + 59)
+            session = {"subject": rng.choice(subjects),
+                       "start": f"{start // 60:02d}:{start % 60:02d}",
+                       "end": f"{end // 60:02d}:{end % 60:02d}"}
+            if homeworks and rng.random() < 0.7:
+                hw = rng.choice(homeworks)
+                session.update(subject=hw["subject"], homework_id=hw["id"],
+                               homework_title=hw["title"], completed=hw["status"] == COMPLETED)
+            sessions.append(session)
+        schedule[day] = sessions
+    return homeworks, schedule, {"next_id": n + 1}
+
+
+def seed_store(kind, data_dir, homeworks, schedule, meta):
+    """Yaradılmış məlumatı verilmiş saxlama növünə yaz"""
+    store = open_storage(kind, data_dir=data_dir)
+    try:
+        store.save(homeworks, schedule, meta)
+    finally:
+        store.close()
+
+
+@contextmanager
+def stubbed_io(answers=()):
+    """input() cavablarını ardıcıllıqdan ver, çıxışı at"""
+    answers = iter(answers)
+    original = builtins.input
+    builtins.input = lambda prompt="": next(answers)
+    try:
+        with open(os.devnull, "w", encoding="utf-8") as sink, redirect_stdout(sink):
+            yield
+    finally:
+        builtins.input = original
+
+
+def measure(func, repeat, setup=None):
+    """Funksiyanı repeat dəfə işlət, saniyələrlə min/median/max qaytar"""
+    samples = []
+    for i in range(repeat):
+        args = setup(i) if setup else ()
+        start = time.perf_counter()
+        func(*args)
+        samples.append(time.perf_counter() - start)
+    return summarize(samples)
+
+
+def summarize(samples):
+    """Ölçmələrdən min/median/max"""
+    samples = sorted(samples)
+    repeat = len(samples)
+    return {"min": samples[0], "median": samples[len(samples) // 2], "max": samples[-1],
+            "repeat": repeat}
+
+
+def cold_start(storage, data_dir):
+    """Yeni prosesdə menyunun ilk sorğusuna qədər keçən vaxt (saniyə), sonra çıxış"""
+    start = time.perf_counter()
+    process = subprocess.Popen([sys.executable, DT_SCRIPT, "--storage", storage,
+                                "--data-dir", data_dir],
+                               stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                               stderr=subprocess.DEVNULL)
+    output = b""
+    while MENU_PROMPT not in output:
+        chunk = os.read(process.stdout.fileno(), 65536)
+        if not chunk:
+            break
+        output += chunk
+    elapsed = time.perf_counter() - start
+    # Çıxışda keş yazılır, növbəti işə salma onu oxuyur
+    process.communicate(b"9\n")
+    return elapsed
+
+
+def bench_size(n, storage="json", repeat=3, seed=0):
+    """Bir ölçü üçün bütün isti yolları ölç"""
+    results = {}
+    homeworks, schedule, meta = generate(n, seed)
+    pending = [hw["id"] for hw in homeworks if hw["status"] == PENDING]
+
+    with tempfile.TemporaryDirectory(prefix="dt-bench-") as data_dir:
+        seed_store(storage, data_dir, homeworks, schedule, meta)
+        del homeworks, schedule
+        # İlk işə salma JSON-dan oxuyur, sonrakılar çıxışda yazılmış keşdən
+        results["cold_start[first]"] = summarize([cold_start(storage, data_dir)])
+        results["cold_start[cached]"] = summarize([cold_start(storage, data_dir)
+                                                   for _ in range(repeat)])
+
+        with stubbed_io():
+            tracker = HomeworkTracker(storage=storage, data_dir=data_dir)
+        try:
+            # Yuxarıdakı işə salmalar ikili keşi yazıb; JSON oxunuşu keşsiz ölçülür
+            cache = getattr(tracker.store, "cache", None)
+            if cache is not None:
+                results["load_data[cached]"] = measure(tracker.load_data, repeat)
+                tracker.store.cache = None
+            results["load_data"] = measure(tracker.load_data, repeat)
+            if cache is not None:
+                tracker.store.cache = cache
+            results["save_data"] = measure(tracker.save_data, repeat)
+
+            for filter_type in VIEW_FILTERS:
+                def view(filter_type=filter_type):
+                    with stubbed_io():
+                        tracker.view_homeworks(filter_type, today=ANCHOR_DATE)
+                results[f"view_homeworks[{filter_type}]"] = measure(view, repeat)
+
+            targets = iter(pending)
+
+            def mark_completed():
+                with stubbed_io([str(next(targets))]):
+                    tracker.mark_completed()
+            results["mark_completed"] = measure(mark_completed, min(repeat, len(pending)) or 1)
+
+            def quiet(func):
+                def run():
+                    with stubbed_io():
+                        func()
+                return run
+            results["progress_report"] = measure(quiet(tracker.progress_report), repeat)
+            tracker.index.text
+            for name, query in (("id", f"tapşırıq {n // 2}"), ("broad", "sintetik"),
+                                ("prefix", "TAPŞ")):
+                results[f"search[{name}]"] = measure(
+                    lambda query=query: tracker.search_homeworks(query, status=PENDING), repeat)
+            results["quick_check_in"] = measure(
+                quiet(lambda: tracker.quick_check_in(ANCHOR_NOW)), repeat)
+            tracker.index.columns
+            results["analytics"] = measure(
+                lambda: tracker.analytics_report("week", "subject", today=ANCHOR_DATE), repeat)
+
+            reminders = tracker.reminders
+            now = ANCHOR_NOW
+
+            def reset_reminders(i):
+                reminders.dirty = True
+                reminders.last_check = now - timedelta(hours=1)
+                return ()
+            results["reminder_tick"] = measure(lambda: reminders.tick(now), repeat,
+                                               setup=reset_reminders)
+        finally:
+            tracker.store.close()
+    return results
+
+
+def memory_profile(n, seed=0):
+    """JSON-dan oxunmuş lüğətlər ilə slot qeydlərinin yaddaş ölçüsünü müqayisə et"""
+    homeworks, schedule, _ = generate(n, seed)
+    text = json.dumps({"homeworks": homeworks, "schedule": schedule}, ensure_ascii=False)
+    del homeworks, schedule
+
+    def traced(build):
+        tracemalloc.start()
+        try:
+            data = build(json.loads(text))
+            return tracemalloc.get_traced_memory()[0]
+        finally:
+            tracemalloc.stop()
+            data = None
+
+    as_dicts = traced(lambda data: data)
+    as_records = traced(lambda data: {
+        "homeworks": [HomeworkRecord.from_dict(hw) for hw in data["homeworks"]],
+        "schedule": {day: [SessionRecord.from_dict(s) for s in sessions]
+                     for day, sessions in data["schedule"].items()},
+    })
+    return {"dict_bytes": as_dicts, "record_bytes": as_records,
+            "bytes_per_homework_dict": as_dicts // n, "bytes_per_homework_record": as_records // n,
+            "saving": 1 - as_records / as_dicts}
+
+
+def run_benchmarks(sizes=DEFAULT_SIZES, storage="json", repeat=3, seed=0, progress=None,
+                   memory=False):
+    """Bütün ölçülər üzrə ölç və JSON-a yazıla bilən nəticə qaytar"""
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "storage": storage,
+            "repeat": repeat,
+            "seed": seed,
+        },
+        "results": {},
+    }
+    for n in sizes:
+        if progress:
+            progress(f"⏱️ {n} qeyd ({storage})...")
+        report["results"][str(n)] = bench_size(n, storage, repeat, seed)
+        if memory:
+            report.setdefault("memory", {})[str(n)] = memory_profile(n, seed)
+    return report
+
+
+def compare(report, baseline, tolerance=0.25, min_delta=0.001):
+    """Median üzrə tolerance-dən və min_delta saniyədən çox yavaşlamaları tap"""
+    regressions = []
+    for size, benches in report["results"].items():
+        for name, stats in benches.items():
+            old = baseline.get("results", {}).get(size, {}).get(name)
+            if old is None or not old["median"]:
+                continue
+            ratio = stats["median"] / old["median"]
+            if ratio > 1 + tolerance and stats["median"] - old["median"] >= min_delta:
+                regressions.append((size, name, old["median"], stats["median"], ratio))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ev tapşırığı izləyicisinin benchmarkları")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES),
+                        help="Tapşırıq sayları (standart: 10^3..10^6)")
+    parser.add_argument("--storage", choices=STORAGE_KINDS, default="json")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--memory", action="store_true",
+                        help="Lüğət və slot qeydlərinin yaddaş ölçüsünü də ölç")
+    parser.add_argument("--output", "-o", help="Nəticəni JSON faylına yaz (standart: stdout)")
+    parser.add_argument("--compare", help="Müqayisə üçün əvvəlki JSON nəticəsi")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="İcazə verilən nisbi yavaşlama (0.25 = 25%%)")
+    parser.add_argument("--min-delta", type=float, default=0.001,
+                        help="Nəzərə alınmayan mütləq fərq, saniyə")
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(args.sizes, args.storage, args.repeat, args.seed,
+                            progress=lambda msg: print(msg, file=sys.stderr),
+                            memory=args.memory)
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            regressions = compare(report, json.load(f), args.tolerance,
+                                  args.min_delta)
+        for size, name, old, new, ratio in regressions:
+            print(f"❌ {name} @ {size}: {old * 1000:.2f} ms → {new * 1000:.2f} ms "
+                  f"({ratio:.2f}x)", file=sys.stderr)
+        if regressions:
+            return 1
+        print("✅ Reqressiya yoxdur", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,214 @@
+import csv
+import itertools
+import json
+import os
+
+from intervals import session_interval
+from models import COMPLETED, PENDING, STATUSES, Priority, Subject
+from scheduler import WEEKDAYS, parse_clock
+
+FORMATS = ("csv", "jsonl")
+
+HOMEWORK_FIELDS = ("id", "title", "subject", "description", "deadline", "priority",
+                   "estimated_time", "status", "created_date", "completed_date", "notes")
+SESSION_FIELDS = ("day", "start", "end", "subject", "homework_id", "homework_title",
+                  "completed")
+CSV_FIELDS = ("type",) + HOMEWORK_FIELDS + tuple(
+    field for field in SESSION_FIELDS if field not in HOMEWORK_FIELDS)
+
+
+class ImportReport:
+    """Toplu idxalın nəticəsi"""
+
+    def __init__(self):
+        self.homeworks = 0
+        self.sessions = 0
+        self.errors = []
+
+    @property
+    def ok(self):
+        return not self.errors
+
+    def add_error(self, line, message):
+        self.errors.append((line, message))
+
+    def __str__(self):
+        lines = [f"✅ {self.homeworks} tapşırıq, {self.sessions} sessiya idxal edildi"]
+        for line, message in self.errors:
+            lines.append(f"❌ Sətir {line}: {message}")
+        return "\n".join(lines)
+
+
+def detect_format(path, fmt=None):
+    """Formatı açıq şəkildə və ya fayl uzantısından müəyyən et"""
+    if fmt:
+        return fmt
+    ext = os.path.splitext(path)[1].lower().lstrip(".")
+    if ext in ("jsonl", "ndjson", "json"):
+        return "jsonl"
+    return "csv"
+
+
+def read_records(fp, fmt):
+    """Fayldan (sətir nömrəsi, qeyd) cütlərini axınla oxu"""
+    if fmt == "csv":
+        reader = csv.DictReader(fp)
+        for row in reader:
+            yield reader.line_num, {k: v for k, v in row.items() if v not in (None, "")}
+        return
+    for line_no, line in enumerate(fp, 1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield line_no, ValueError(f"JSON səhvi: {e}")
+            continue
+        yield line_no, record
+
+
+def parse_enum(enum_cls, value, label):
+    """Enum dəyərini və ya adını yoxla, dəyəri qaytar"""
+    if isinstance(value, str):
+        value = value.strip()
+        for member in enum_cls:
+            if value == member.value or value.upper() == member.name:
+                return member.value
+    raise ValueError(f"Yanlış {label}: {value!r}")
+
+
+def parse_bool(value):
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in ("1", "true", "yes", "bəli")
+
+
+def validate_homework(record):
+    """Tapşırıq qeydini yoxla və create_homework arqumentlərinə çevir"""
+    title = str(record.get("title", "")).strip()
+    if not title:
+        raise ValueError("Tapşırığın adı boşdur")
+    status = record.get("status", PENDING)
+    if status not in STATUSES:
+        raise ValueError(f"Yanlış status: {status!r}")
+    notes = record.get("notes", [])
+    if isinstance(notes, str):
+        notes = json.loads(notes)
+    return {
+        "title": title,
+        "subject": parse_enum(Subject, record.get("subject"), "fənn"),
+        "description": str(record.get("description", "")).strip(),
+        "deadline": str(record.get("deadline", "")).strip(),
+        "priority": parse_enum(Priority, record.get("priority"), "prioritet"),
+        "estimated_time": str(record.get("estimated_time", "")).strip(),
+        "status": status,
+        "created_date": record.get("created_date"),
+        "completed_date": record.get("completed_date") if status == COMPLETED else None,
+        "notes": notes,
+    }
+
+
+def validate_session(record, id_map, tracker):
+    """Sessiya qeydini yoxla və (gün, sessiya) qaytar"""
+    day = str(record.get("day", "")).strip().lower()
+    if day not in WEEKDAYS:
+        raise ValueError(f"Yanlış gün: {record.get('day')!r}")
+    for key in ("start", "end"):
+        if parse_clock(record.get(key)) is None:
+            raise ValueError(f"Yanlış vaxt ({key}): {record.get(key)!r}")
+    if session_interval(record) is None:
+        raise ValueError(f"Bitmə vaxtı başlamadan sonra olmalıdır: {record['start']}-{record['end']}")
+
+    session = {
+        "subject": str(record.get("subject", "")).strip(),
+        "start": record["start"].strip(),
+        "end": record["end"].strip(),
+        "completed": parse_bool(record.get("completed", False)),
+    }
+    if record.get("homework_id") not in (None, ""):
+        ref = int(record["homework_id"])
+        hw_id = id_map.get(ref, ref)
+        hw = tracker.find_homework(hw_id)
+        if hw is None:
+            raise ValueError(f"Tapşırıq tapılmadı: {ref}")
+        session["homework_id"] = hw_id
+        session["homework_title"] = record.get("homework_title") or hw["title"]
+        session["subject"] = session["subject"] or hw["subject"]
+    if not session["subject"]:
+        raise ValueError("Fənn boşdur")
+    return day, session
+
+
+def import_records(tracker, records):
+    """(sətir, qeyd) axınını yoxla və bir yazı ilə tətbiq et"""
+    report = ImportReport()
+    id_map = {}
+    with tracker.batch():
+        for line, record in records:
+            try:
+                if isinstance(record, Exception):
+                    raise record
+                kind = record.get("type") or ("session" if "day" in record else "homework")
+                if kind == "homework":
+                    fields = validate_homework(record)
+                    ref = record.get("id")
+                    ref = int(ref) if ref not in (None, "") else None
+                    hw = tracker.create_homework(**fields)
+                    if ref is not None:
+                        id_map[ref] = hw["id"]
+                    report.homeworks += 1
+                elif kind == "session":
+                    day, session = validate_session(record, id_map, tracker)
+                    tracker.add_session(day, session)
+                    report.sessions += 1
+                else:
+                    raise ValueError(f"Naməlum qeyd növü: {kind!r}")
+            except (ValueError, KeyError, TypeError, AttributeError) as e:
+                report.add_error(line, str(e))
+    return report
+
+
+def import_file(tracker, path, fmt=None):
+    """CSV və ya JSONL faylını idxal et"""
+    fmt = detect_format(path, fmt)
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        return import_records(tracker, read_records(f, fmt))
+
+
+def export_records(tracker):
+    """Tapşırıqları (arxiv daxil) və sessiyaları bir-bir qeyd kimi ver"""
+    for hw in itertools.chain(tracker.homeworks, tracker.archived_homeworks()):
+        record = {"type": "homework"}
+        record.update((field, hw.get(field)) for field in HOMEWORK_FIELDS)
+        yield record
+    for day, sessions in tracker.schedule.items():
+        for session in sessions:
+            record = {"type": "session", "day": day}
+            record.update((field, session[field]) for field in SESSION_FIELDS[1:]
+                          if field in session)
+            yield record
+
+
+def write_export(tracker, fp, fmt="jsonl"):
+    """İxracı axın kimi fayla yaz, yazılmış qeydlərin sayını qaytar"""
+    count = 0
+    if fmt == "csv":
+        writer = csv.DictWriter(fp, fieldnames=CSV_FIELDS, extrasaction='ignore')
+        writer.writeheader()
+        for record in export_records(tracker):
+            if "notes" in record:
+                record["notes"] = json.dumps(record["notes"], ensure_ascii=False)
+            writer.writerow(record)
+            count += 1
+        return count
+    for record in export_records(tracker):
+        fp.write(json.dumps(record, ensure_ascii=False) + "\n")
+        count += 1
+    return count
+
+
+def export_file(tracker, path, fmt=None):
+    """Məlumatları CSV və ya JSONL faylına ixrac et"""
+    fmt = detect_format(path, fmt)
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        return write_export(tracker, f, fmt)
@@ -0,0 +1,76 @@
+import heapq
+from bisect import bisect_left, bisect_right, insort
+from datetime import date, datetime
+
+DEADLINE_FORMATS = ("%d.%m.%Y", "%d/%m/%Y", "%d-%m-%Y", "%Y-%m-%d")
+
+
+def deadline_ordinal(deadline):
+    """Son tarixi sıra nömrəsinə çevir, səhv olduqda None qaytar"""
+    if not isinstance(deadline, str):
+        return None
+    text = deadline.strip()
+    for fmt in DEADLINE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).toordinal()
+        except ValueError:
+            continue
+    return None
+
+
+def format_ordinal(ordinal):
+    """Sıra nömrəsini GG.AA.İLİL formatına çevir"""
+    return date.fromordinal(ordinal).strftime("%d.%m.%Y")
+
+
+class DeadlineIndex:
+    """Statuslar üzrə son tarixə görə sıralanmış (sıra nömrəsi, id) siyahıları"""
+
+    def __init__(self):
+        self.ordinals = {}
+        self.by_status = {}
+        self.invalid = {}
+
+    def add(self, hw):
+        """Tapşırığın son tarixini təhlil et və indeksə əlavə et"""
+        ordinal = getattr(hw, "deadline_ordinal", None)
+        if ordinal is None:
+            ordinal = deadline_ordinal(hw["deadline"])
+        if ordinal is None:
+            self.invalid[hw["id"]] = hw["status"]
+            return
+        self.ordinals[hw["id"]] = ordinal
+        insort(self.by_status.setdefault(hw["status"], []), (ordinal, hw["id"]))
+
+    def remove(self, hw):
+        """Tapşırığı indeksdən çıxar"""
+        if self.invalid.pop(hw["id"], None) is not None:
+            return
+        ordinal = self.ordinals.pop(hw["id"], None)
+        if ordinal is None:
+            return
+        entries = self.by_status.get(hw["status"], [])
+        i = bisect_left(entries, (ordinal, hw["id"]))
+        if i < len(entries) and entries[i] == (ordinal, hw["id"]):
+            entries.pop(i)
+
+    def ordinal(self, hw_id):
+        """Təhlil edilmiş son tarix (səhvdirsə None)"""
+        return self.ordinals.get(hw_id)
+
+    def between(self, start=None, end=None, status=None):
+        """[start, end] aralığında son tarixi olan id-ləri tarix sırası ilə qaytar"""
+        lists = [self.by_status.get(status, [])] if status else list(self.by_status.values())
+        ranges = []
+        for entries in lists:
+            lo = bisect_left(entries, (start,)) if start is not None else 0
+            hi = bisect_right(entries, (end, float("inf"))) if end is not None else len(entries)
+            ranges.append(entries[lo:hi])
+        if len(ranges) == 1:
+            return [hw_id for _, hw_id in ranges[0]]
+        return [hw_id for _, hw_id in heapq.merge(*ranges)]
+
+    def invalid_ids(self, status=None):
+        """Son tarixi təhlil edilə bilməyən tapşırıqlar"""
+        return sorted(hw_id for hw_id, hw_status in self.invalid.items()
+                      if status is None or hw_status == status)
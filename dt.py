@@ -1,56 +1,127 @@
+from datetime import date, datetime, timedelta
+import random
+import argparse
+import atexit
+import itertools
 import json
 import os
-from datetime import datetime, timedelta
-import time
+import sys
 import threading
-from enum import Enum
-import random
+import time
+from contextlib import contextmanager
+
+import bulk
+from bulk import SESSION_FIELDS
+from analytics import GROUPS, PERIODS, Analytics
+from archive import Archive, completed_ordinal
+from deadlines import deadline_ordinal, format_ordinal
+from events import EVENTS_FILE, ChangeFeed, EventLog, change_events
+from indexes import HomeworkIndex, compute_stats
+from intervals import estimated_minutes, format_minutes, session_interval
+from metrics import METRICS, timed
+from models import COMPLETED, PENDING, Priority, Subject
+from occurrences import (CALENDAR_FIELDS, SESSION_COPY, Calendar, occurrence_key,
+                         weekday_ordinal)
+from notify import ConsoleSink, Dispatcher, open_sink, reminder_event
+from persister import WriteBehind
+from planner import PLAN_FIELDS, StudyPlanner, plan_tasks
+from records import HomeworkRecord, SessionRecord
+from render import (OUTPUT_FORMATS, PAGE_SIZE, format_analytics, format_homework,
+                    schedule_rows, show_pages, write_records)
+from scheduler import WEEKDAYS, ReminderScheduler
+from storage import CALENDAR_OPS, SCHEDULE_OPS, STORAGE_KINDS, open_storage, write_counters
+
+DAYS_TRANSLATION = {
+    "monday": "Bazar ertəsi",
+    "tuesday": "Çərşənbə axşamı",
+    "wednesday": "Çərşənbə",
+    "thursday": "Cümə axşamı",
+    "friday": "Cümə",
+    "saturday": "Şənbə",
+    "sunday": "Bazar"
+}
+
+MENU_ACTIONS = {"1": "add_homework", "2": "view_homeworks", "3": "mark_completed",
+                "4": "view_schedule", "5": "edit_schedule", "6": "quick_check_in",
+                "7": "progress_report", "8": "reminders", "9": "save_and_exit",
+                "10": "remove_homework", "11": "view_study_plan"}
 
-class Priority(Enum):
-    LOW = "Aşağı"
-    MEDIUM = "Orta"
-    HIGH = "Yüksək"
-    URGENT = "Təcili"
+# Xatırlatma növbəsini yenidən quran dəyişikliklər
+REMINDER_OPS = SCHEDULE_OPS | CALENDAR_OPS
+
+# Menyunun ilk göstərilməsinə qədər keçən vaxtı ölçmək üçün başlanğıc anı
+STARTED = time.perf_counter()
 
-class Subject(Enum):
-    MATH = "Riyaziyyat"
-    SCIENCE = "Elm"
-    HISTORY = "Tarix"
-    LANGUAGE = "Dil"
-    LITERATURE = "Ədəbiyyat"
-    PHYSICS = "Fizika"
-    CHEMISTRY = "Kimya"
-    BIOLOGY = "Biologiya"
-    GEOGRAPHY = "Coğrafiya"
-    ART = "İncəsənət"
-    MUSIC = "Musiqi"
-    SPORT = "İdman"
-    OTHER = "Digər"
 
 class HomeworkTracker:
-    def __init__(self):
-        self.data_file = "homework_data.json"
-        self.schedule_file = "study_schedule.json"
+    def __init__(self, storage="json", compaction_threshold=200, data_dir=".",
+                 archive_after_days=None, write_behind=None, notifier=None):
+        self.storage = storage
+        self.data_dir = data_dir
+        self.store = open_storage(storage, compaction_threshold, data_dir)
+        self.archive = Archive(os.path.join(data_dir, "archive"))
+        self.index = HomeworkIndex()
+        self.analytics = Analytics(lambda: self.index.columns, self.archive)
+        self.planner = StudyPlanner()
+        self.pending_ops = None
+        self.dirty = False
+        self.lock = threading.RLock()
+        self.write_lock = threading.Lock()
+        self.unsaved_ops = []
+        # Tətbiq olunmuş, lakin hələ saxlamaya verilməmiş dəyişikliklər (toplu rejimdə,
+        # end_batch ilə persist_ops arasında və fon yazıçısının növbəsində)
+        self.unpersisted = 0
+        self.writer = None
+        self.schedule_unsaved = False
+        # İlk dəyişiklikdən əvvəlki vəziyyətlə hazırlanmış standart cədvəl yazısı
+        self.schedule_write = None
+        self.events = ChangeFeed(EventLog(os.path.join(data_dir, EVENTS_FILE), sync=True))
+        # (op, hadisə) cütləri: hadisə yalnız op diskə yazıldıqdan sonra yayımlanır
+        self.unpublished = []
+        self.calendar = Calendar(lambda: self.schedule, lambda: self.meta.get("calendar", {}),
+                                 self.due_on)
         self.load_data()
-        self.reminder_thread = None
-        self.stop_reminders = False
+        if archive_after_days is not None:
+            self.archive_completed(archive_after_days)
+        if write_behind is not None:
+            self.writer = WriteBehind(self.write_pending, write_behind)
+        self.tenant = os.path.basename(os.path.abspath(data_dir))
+        self.notifier = notifier
+        self.owns_notifier = notifier is None
+        self.reminders = ReminderScheduler(lambda: self.schedule, self.notify_session,
+                                           lock=self.lock, get_occurrences=self.calendar.day)
         
+    @timed("load_data")
     def load_data(self):
         """Məlumatları yüklə"""
-       
-        if os.path.exists(self.data_file):
-            with open(self.data_file, 'r', encoding='utf-8') as f:
-                self.homeworks = json.load(f)
-        else:
-            self.homeworks = []
-            
-       
-        if os.path.exists(self.schedule_file):
-            with open(self.schedule_file, 'r', encoding='utf-8') as f:
-                self.schedule = json.load(f)
-        else:
-            self.schedule = self.create_default_schedule()
-            self.save_schedule()
+        homeworks, schedule, self.meta, ops = self.store.load()
+        self.homeworks = [HomeworkRecord.from_dict(hw) for hw in homeworks]
+        del homeworks
+        
+        created_default = schedule is None
+        if created_default:
+            schedule = self.create_default_schedule()
+        self.schedule = {day: [SessionRecord.from_dict(s) for s in sessions]
+                         for day, sessions in schedule.items()}
+        
+        # İndekslər ilk müraciətdə qurulur ki, menyu tarixçənin ölçüsündən asılı olmasın
+        self.index.rebuild(self.homeworks, self.schedule)
+        last_id = max((hw["id"] for hw in self.homeworks), default=0)
+        self.meta["next_id"] = max(self.meta.get("next_id", 1), last_id + 1)
+        
+        for op in ops:
+            self.apply_op(op)
+        
+        # Standart cədvəl ilk dəyişiklikdən əvvəl və ya çıxışda yazılır
+        self.schedule_unsaved = created_default
+        self.calendar.invalidate()
+        
+        pending = self.archive.pending()
+        if pending:
+            # Seqmentə yazılıb, lakin aktiv saxlamadan çıxarılmamış tapşırıqlar
+            self.commit_op({"op": "archive_homeworks",
+                            "ids": [hw_id for hw_id in pending if hw_id in self.index.by_id]})
+            self.archive.commit()
     
     def create_default_schedule(self):
         """Standart tədris cədvəli yarat"""
@@ -85,13 +156,564 @@ class HomeworkTracker:
     
     def save_data(self):
         """Ev tapşırıqlarını saxla"""
-        with open(self.data_file, 'w', encoding='utf-8') as f:
-            json.dump(self.homeworks, f, ensure_ascii=False, indent=2)
+        self.save_parts("save_data", ("homeworks",))
     
     def save_schedule(self):
         """Tədris cədvəlini saxla"""
-        with open(self.schedule_file, 'w', encoding='utf-8') as f:
-            json.dump(self.schedule, f, ensure_ascii=False, indent=2)
+        self.save_parts("save_schedule", ("schedule",))
+    
+    def save_all(self):
+        """Bütün məlumatları saxla"""
+        self.save_parts("save_all", ("homeworks", "schedule"))
+        self.dirty = False
+    
+    def save_parts(self, name, parts):
+        """Gözləyən dəyişiklikləri yaz, sonra seçilmiş hissələri tam yenidən yaz"""
+        with self.write_lock:
+            self.write_pending_locked()
+            with self.lock:
+                write = self.store.prepare_save(self.homeworks, self.schedule, self.meta, parts)
+                if "schedule" in parts:
+                    self.schedule_unsaved = False
+                    self.schedule_write = None
+                # Tam yazı tətbiq olunmuş bütün dəyişiklikləri əhatə edir
+                covered = ([op for op, _ in self.unpublished]
+                           if "homeworks" in parts and not self.unpersisted else [])
+            self.write_store(name, write)
+            self.publish_written(covered)
+    
+    def write_pending(self):
+        """Fon yazıçısının topladığı dəyişiklikləri bir yazı ilə saxla"""
+        with self.write_lock:
+            self.write_pending_locked()
+    
+    def write_pending_locked(self):
+        # Vəziyyət kilid altında mətnə çevrilir, disk yazısı isə kilidsiz gedir ki,
+        # interaktiv dövr yazını gözləməsin
+        with self.lock:
+            ops, self.unsaved_ops = self.unsaved_ops, []
+            if not ops:
+                return
+            write = self.prepare_ops(ops)
+        try:
+            self.write_store("record_many", write)
+        except Exception:
+            with self.lock:
+                self.unsaved_ops[:0] = ops
+                self.unpersisted += len(ops)
+            raise
+        self.publish_written(ops)
+    
+    def prepare_ops(self, ops):
+        """ops-un saxlama yazısını kilid altında hazırla"""
+        with self.lock:
+            self.unpersisted -= len(ops)
+            # Başqa saxlanmamış dəyişiklik qalıbsa jurnal snapşota sıxılmır
+            return self.store.prepare_many(ops, self.homeworks, self.schedule, self.meta,
+                                           compact=not self.unpersisted)
+    
+    def record_ops(self, name, ops):
+        """ops-u fon yazıçısı olmadan dərhal yaz"""
+        write = self.prepare_ops(ops)
+        try:
+            self.write_store(name, write)
+        except Exception:
+            # Vəziyyət diskdən öndədir; bağlanışda tam yazı onu saxlayacaq
+            self.dirty = True
+            raise
+        self.publish_written(ops)
+    
+    def publish_written(self, ops):
+        """Diskə yazılmış dəyişikliklərin hadisələrini tətbiq sırası ilə yayımla"""
+        if not ops:
+            return
+        written = {id(op) for op in ops}
+        with self.lock:
+            changes = [change for op, change in self.unpublished if id(op) in written]
+            self.unpublished = [item for item in self.unpublished if id(item[0]) not in written]
+            self.events.publish(changes)
+    
+    def write_store(self, name, func, *args):
+        """Saxlama yazısını icra et; ölçmə aktivdirsə müddəti və yazılan həcmi qeyd et"""
+        if not METRICS.enabled:
+            return func(*args)
+        before = write_counters(self.store)
+        with METRICS.timer(name):
+            result = func(*args)
+        for unit, value in write_counters(self.store).items():
+            METRICS.observe(f"{name}.{unit}", value - before[unit], unit)
+        return result
+    
+    def write_schedule(self):
+        """commit_op-un hazırladığı standart cədvəl yazısını icra et"""
+        with self.lock:
+            write, self.schedule_write = self.schedule_write, None
+        if write is None:
+            return
+        try:
+            self.write_store("save_schedule", write)
+        except Exception:
+            with self.lock:
+                self.schedule_write = write
+            raise
+    
+    def flush(self):
+        """Saxlanmamış dəyişiklikləri diskə yaz"""
+        self.write_schedule()
+        if self.writer is not None:
+            self.writer.flush()
+        if self.dirty and not self.unpersisted:
+            self.save_all()
+        if self.schedule_unsaved:
+            self.save_schedule()
+    
+    def close(self):
+        """Xatırlatmaları dayandır, dəyişiklikləri yaz və saxlamanı bağla"""
+        if self.reminders.running:
+            self.reminders.stop()
+        if self.owns_notifier and self.notifier is not None:
+            self.notifier.close()
+            self.notifier = None
+        if self.writer is not None:
+            self.writer.stop()
+            self.writer = None
+        try:
+            self.flush()
+            with self.lock:
+                # Keş diskdəki JSON-un surətidir: yazılmamış və ya yazılması alınmamış
+                # dəyişiklik qalıbsa keş yazılmır, növbəti açılış JSON-dan oxuyur
+                if self.disk_current() and self.schedule_write is None:
+                    self.store.checkpoint(self.homeworks, self.schedule, self.meta)
+        finally:
+            self.store.close()
+            self.events.close()
+    
+    def migrate_storage(self, kind):
+        """Cari məlumatları başqa saxlama növünə köçür"""
+        target = open_storage(kind, data_dir=self.data_dir)
+        try:
+            # Hədəfdə köhnə jurnal qeydləri ola bilər: snapşotun seq-i onlardan sonra gəlməlidir
+            target.load()
+            target.save(self.homeworks, self.schedule, self.meta)
+        finally:
+            target.close()
+    
+    def apply_op(self, op):
+        """Dəyişiklik qeydini yaddaşdakı vəziyyətə tətbiq et"""
+        kind = op["op"]
+        if kind == "add_homework":
+            hw = HomeworkRecord.from_dict(op["homework"])
+            self.homeworks.append(hw)
+            self.index.add_homework(hw)
+            self.meta["next_id"] = max(self.meta["next_id"], hw["id"] + 1)
+        elif kind == "complete_homework":
+            hw = self.index.get(op["id"])
+            if hw is not None:
+                self.index.update_homework(hw, status="Tamamlandı", completed_date=op["date"])
+            for day, session in self.index.sessions_for(op["id"]):
+                session["completed"] = True
+        elif kind == "delete_homework":
+            hw = self.index.get(op["id"])
+            if hw is not None:
+                self.index.remove_homework(hw)
+                self.homeworks.remove(hw)
+            for day, session in self.index.sessions_for(op["id"]):
+                self.index.remove_session(day, session)
+                self.schedule[day].remove(session)
+        elif kind == "archive_homeworks":
+            ids = set(op["ids"])
+            for hw_id in ids:
+                hw = self.index.get(hw_id)
+                if hw is not None:
+                    self.index.remove_homework(hw)
+            self.homeworks[:] = [hw for hw in self.homeworks if hw["id"] not in ids]
+        elif kind == "add_session":
+            session = SessionRecord.from_dict(op["session"])
+            self.schedule.setdefault(op["day"], []).append(session)
+            self.index.add_session(op["day"], session)
+        elif kind == "remove_session":
+            removed = self.schedule[op["day"]].pop(op["index"])
+            self.index.remove_session(op["day"], removed)
+        elif kind == "complete_session":
+            self.schedule[op["day"]][op["index"]]["completed"] = True
+        elif kind == "set_occurrence":
+            # Surət üzərində dəyişilir ki, fon yazıçısının götürdüyü meta surəti pozulmasın
+            calendar = dict(self.meta.get("calendar", {}))
+            overrides = dict(calendar.get(op["date"], {}))
+            overrides[op["key"]] = dict(overrides.get(op["key"], {}), **op["fields"])
+            calendar[op["date"]] = overrides
+            self.meta["calendar"] = calendar
+        else:
+            raise ValueError(f"Naməlum əməliyyat: {kind}")
+    
+    def commit_op(self, op):
+        """Dəyişikliyi tətbiq et və saxla"""
+        with self.lock:
+            if self.schedule_unsaved:
+                # Cədvəl op-dan əvvəlki halı ilə indi hazırlanır, yazı isə op-larla birlikdə
+                # persist_ops-da gedir (serverdə icraçıda, hadisə dövründə deyil)
+                self.schedule_write = self.store.prepare_save(self.homeworks, self.schedule,
+                                                              self.meta, ("schedule",))
+                self.schedule_unsaved = False
+            changes = change_events(op, self.schedule)
+            self.apply_op(op)
+            self.unpersisted += 1
+            # Təqvim keşi yayımı gözləmədən (toplu rejimdə də) dərhal yenilənir
+            for change in changes:
+                self.calendar.on_change(*change)
+                self.unpublished.append((op, change))
+        if self.pending_ops is not None:
+            self.pending_ops.append(op)
+            self.dirty = True
+            return
+        if self.writer is not None:
+            self.persist_ops([op])
+            return
+        self.write_schedule()
+        self.record_ops("record", [op])
+        if op["op"] in REMINDER_OPS and self.reminders.running:
+            self.reminders.reschedule()
+    
+    def begin_batch(self):
+        """Dəyişiklikləri yalnız yaddaşda tətbiq etməyə başla"""
+        self.pending_ops = []
+    
+    def end_batch(self):
+        """Toplanmış, hələ yazılmamış dəyişiklikləri qaytar (hadisələri persist_ops yayımlayır)"""
+        ops, self.pending_ops = self.pending_ops, None
+        return ops or []
+    
+    def persist_ops(self, ops):
+        """Toplanmış dəyişiklikləri bir yazı ilə saxla"""
+        if not ops:
+            return
+        self.write_schedule()
+        if self.writer is not None:
+            with self.lock:
+                self.unsaved_ops.extend(ops)
+            self.writer.mark()
+        else:
+            self.record_ops("record_many", ops)
+        self.dirty = False
+        if self.reminders.running and any(op["op"] in REMINDER_OPS for op in ops):
+            self.reminders.reschedule()
+    
+    @contextmanager
+    def batch(self):
+        """Blok daxilindəki dəyişiklikləri bir yazı ilə saxla"""
+        if self.pending_ops is not None:
+            yield
+            return
+        self.begin_batch()
+        try:
+            yield
+        finally:
+            self.persist_ops(self.end_batch())
+    
+    def disk_current(self):
+        """Tətbiq olunmuş bütün dəyişikliklər saxlamaya yazılıbmı (SQL sorğuları üçün)"""
+        # unpublished yazılmamış hər op-u saxlayır: toplu rejim, end_batch ilə persist_ops
+        # arası, fon yazıçısının növbəsi və kilidsiz gedən disk yazısının özü
+        with self.lock:
+            return not (self.unpublished or self.unsaved_ops or self.dirty)
+    
+    def subscribe(self, callback, since=None):
+        """Dəyişiklik hadisələrinə abunə ol; abunəliyi ləğv edən funksiyanı qaytarır"""
+        return self.events.subscribe(callback, since)
+    
+    def changes_since(self, seq=0, limit=None):
+        """seq-dən sonrakı dəyişiklik hadisələri və son seq nömrəsi"""
+        with self.lock:
+            last = self.events.seq
+        return {"events": self.events.since(seq, limit), "last_seq": last}
+    
+    def create_homework(self, title, subject, description, deadline, priority, estimated_time,
+                        status=PENDING, created_date=None, completed_date=None, notes=None):
+        """Ev tapşırığını dialoqsuz yarat"""
+        homework = {
+            "id": self.meta["next_id"],
+            "title": title,
+            "subject": subject,
+            "description": description,
+            "deadline": deadline,
+            "priority": priority,
+            "estimated_time": estimated_time,
+            "status": status,
+            "created_date": created_date or datetime.now().strftime("%d.%m.%Y"),
+            "completed_date": completed_date,
+            "notes": notes if notes is not None else []
+        }
+        self.commit_op({"op": "add_homework", "homework": homework})
+        return self.index.get(homework["id"])
+    
+    def select_homeworks(self, status=None, priority=None, subject=None, deadline=None):
+        """Süzgəclərə uyğun tapşırıqları qaytar"""
+        if self.store.supports_queries and self.disk_current():
+            return self.store.select_homeworks(status=status, priority=priority,
+                                               subject=subject, deadline=deadline)
+        if deadline is None:
+            return self.index.select(status=status, priority=priority, subject=subject)
+        
+        ordinal = deadline_ordinal(deadline)
+        if ordinal is None:
+            return []
+        return [hw for hw in self.homeworks_due_between(ordinal, ordinal, status)
+                if (priority is None or hw["priority"] == priority)
+                and (subject is None or hw["subject"] == subject)]
+    
+    def homeworks_due_between(self, start=None, end=None, status=PENDING):
+        """Son tarixi [start, end] sıra nömrələri aralığında olan tapşırıqlar"""
+        return [self.index.by_id[hw_id]
+                for hw_id in self.index.deadlines.between(start, end, status)]
+    
+    def overdue_homeworks(self, today=None):
+        """Son tarixi keçmiş, hələ tamamlanmamış tapşırıqlar"""
+        today = (today or date.today()).toordinal()
+        return self.homeworks_due_between(end=today - 1)
+    
+    def due_soon(self, days=7, today=None):
+        """Növbəti N gün ərzində (bu gün daxil) son tarixi olan tapşırıqlar"""
+        today = (today or date.today()).toordinal()
+        return self.homeworks_due_between(today, today + days)
+    
+    def homeworks_by_deadline(self, status=None):
+        """Tapşırıqları son tarixə görə sırala; səhv tarixlilər sonda gəlir"""
+        ids = self.index.deadlines.between(status=status)
+        ids += self.index.deadlines.invalid_ids(status)
+        return [self.index.by_id[hw_id] for hw_id in ids]
+    
+    def deadline_calendar(self, days=14, today=None, status=PENDING):
+        """Yaxın günlər üçün (tarix, tapşırıqlar) cütləri"""
+        today = (today or date.today()).toordinal()
+        calendar = []
+        for hw in self.homeworks_due_between(today, today + days - 1, status):
+            day = format_ordinal(self.index.deadlines.ordinal(hw["id"]))
+            if not calendar or calendar[-1][0] != day:
+                calendar.append((day, []))
+            calendar[-1][1].append(hw)
+        return calendar
+    
+    def search_homeworks(self, query, status=None, priority=None, subject=None, limit=20):
+        """Başlıq, təsvir və qeydlərdə mətn axtarışı, ən uyğun olanlar əvvəl"""
+        with METRICS.timer("search"):
+            return self.index.search(query, status=status, priority=priority, subject=subject,
+                                     limit=limit)
+    
+    def homework_stats(self):
+        """Ümumi, fənn və prioritet üzrə tamamlama sayları"""
+        return self.index.stats.snapshot()
+    
+    def history_stats(self):
+        """Aktiv tapşırıqlar və arxiv üzrə birləşmiş tamamlama sayları"""
+        report = self.homework_stats()
+        archived = self.archive.stats()
+        report["total"] += archived["total"]
+        report["completed"] += archived["completed"]
+        for key in ("subjects", "priorities"):
+            for value, counts in archived[key].items():
+                bucket = report[key].setdefault(value, {"total": 0, "completed": 0})
+                bucket["total"] += counts["total"]
+                bucket["completed"] += counts["completed"]
+        return report
+    
+    @timed("analytics")
+    def analytics_report(self, period="week", by=None, window=4, periods=8, today=None):
+        """Tamamlama tarixçəsi üzrə dövr faizləri, gecikmə paylanması və seriyalar"""
+        with self.lock:
+            return self.analytics.report(period, by, window, periods, today)
+    
+    def archive_completed(self, older_than_days=30, today=None):
+        """Köhnə tamamlanmış tapşırıqları arxiv seqmentlərinə köçür, sayını qaytar"""
+        cutoff = (today or date.today()).toordinal() - older_than_days
+        old = []
+        for hw in self.index.select(status=COMPLETED):
+            completed = completed_ordinal(hw)
+            if completed is not None and completed < cutoff:
+                old.append(hw)
+        if not old:
+            return 0
+        self.archive.append(old)
+        self.commit_op({"op": "archive_homeworks", "ids": [hw["id"] for hw in old]})
+        if self.pending_ops is not None:
+            self.persist_ops(self.end_batch())
+            self.begin_batch()
+        # Manifestdəki gözləyən id-lər yalnız arxivləmə diskə yazıldıqdan sonra silinir,
+        # əks halda qəzadan sonra tapşırıqlar həm aktiv, həm arxivdə sayılardı
+        if self.writer is not None:
+            self.writer.flush()
+        self.archive.commit()
+        self.analytics.add_archived(old)
+        return len(old)
+    
+    def archived_homeworks(self, start=None, end=None):
+        """Arxivdəki tapşırıqları (İLİL-AA aralığı üzrə) axınla ver"""
+        return self.archive.iter_homeworks(start, end)
+    
+    def recompute_stats(self):
+        """Tamamlama saylarını sayğaclardan asılı olmadan yenidən hesabla"""
+        if self.store.supports_queries and self.disk_current():
+            return self.store.homework_stats()
+        return compute_stats(self.homeworks)
+    
+    def verify_stats(self):
+        """Sayğacları tam hesablama ilə müqayisə et, fərqləri qaytar"""
+        counters = self.homework_stats()
+        expected = self.recompute_stats()
+        mismatches = []
+        if counters["total"] != expected["total"]:
+            mismatches.append(("total", counters["total"], expected["total"]))
+        if counters["completed"] != expected["completed"]:
+            mismatches.append(("completed", counters["completed"], expected["completed"]))
+        for key in ("subjects", "priorities"):
+            for value in counters[key].keys() | expected[key].keys():
+                if counters[key].get(value) != expected[key].get(value):
+                    mismatches.append((f"{key}:{value}", counters[key].get(value),
+                                       expected[key].get(value)))
+        return mismatches
+    
+    def find_homework(self, hw_id):
+        """ID-yə görə tapşırığı tap"""
+        return self.index.get(hw_id)
+    
+    def complete_homework(self, hw_id):
+        """Tapşırığı və ona aid sessiyaları tamamlandı kimi qeyd et"""
+        hw = self.find_homework(hw_id)
+        if hw is None:
+            return None
+        self.commit_op({
+            "op": "complete_homework",
+            "id": hw_id,
+            "date": datetime.now().strftime("%d.%m.%Y")
+        })
+        return hw
+    
+    def delete_homework(self, hw_id):
+        """Tapşırığı və ona aid sessiyaları sil"""
+        hw = self.find_homework(hw_id)
+        if hw is None:
+            return None
+        self.commit_op({"op": "delete_homework", "id": hw_id})
+        return hw
+    
+    def add_session(self, day, session):
+        """Cədvələ sessiya əlavə et"""
+        self.commit_op({"op": "add_session", "day": day, "session": session})
+        return self.schedule[day][-1]
+    
+    def remove_session(self, day, index):
+        """Cədvəldən sessiyanı sil"""
+        removed = self.schedule[day][index]
+        self.commit_op({"op": "remove_session", "day": day, "index": index})
+        return removed
+    
+    def complete_session(self, day, index, today=None):
+        """Sessiyanın bu gün və ya ən yaxın keçmiş tarixdəki təkrarını tamamlandı kimi qeyd et"""
+        if day not in WEEKDAYS:
+            self.commit_op({"op": "complete_session", "day": day, "index": index})
+            return self.schedule[day][index]
+        ordinal = weekday_ordinal(day, (today or date.today()).toordinal())
+        with self.lock:
+            occurrence = self.calendar.occurrence_of(ordinal, index)
+        return self.update_occurrence(occurrence["date"], occurrence["key"], completed=True)
+    
+    def calendar_range(self, start=None, days=7, include_cancelled=False):
+        """start tarixindən (GG.AA.İLİL, standart bu gün) days gün üzrə tarixli sessiyalar"""
+        first = deadline_ordinal(start) if start else date.today().toordinal()
+        if first is None:
+            raise ValueError(f"Yanlış tarix: {start}")
+        if days < 1:
+            raise ValueError(f"Gün sayı müsbət olmalıdır: {days}")
+        with self.lock:
+            return list(self.calendar.between(first, first + days - 1, include_cancelled))
+    
+    def update_occurrence(self, when, key, **fields):
+        """Bir tarixdəki təkrarı dəyiş: completed, cancelled və ya yeni start/end"""
+        ordinal = deadline_ordinal(when)
+        if ordinal is None:
+            raise ValueError(f"Yanlış tarix: {when}")
+        unknown = set(fields) - {"completed", "cancelled", "start", "end"}
+        if unknown:
+            raise ValueError(f"Naməlum sahələr: {', '.join(sorted(unknown))}")
+        with self.lock:
+            occurrence = self.calendar.find(ordinal, key)
+            if occurrence is None:
+                raise KeyError(f"Təkrar tapılmadı: {when} {key}")
+            if ("start" in fields or "end" in fields) and session_interval(
+                    dict(occurrence, **fields)) is None:
+                raise ValueError("Yanlış vaxt aralığı")
+        op = {"op": "set_occurrence", "date": format_ordinal(ordinal), "key": key,
+              "fields": fields}
+        if fields.get("completed") and occurrence["index"] is not None:
+            # Şablon sessiyasının tamamlanması session.completed hadisəsini də verir
+            op["day"], op["index"] = occurrence["day"], occurrence["index"]
+        self.commit_op(op)
+        with self.lock:
+            return self.calendar.find(ordinal, key)
+    
+    def add_one_off(self, when, session):
+        """Yalnız bir tarixə aid əlavə sessiya"""
+        ordinal = deadline_ordinal(when)
+        if ordinal is None:
+            raise ValueError(f"Yanlış tarix: {when}")
+        if not session.get("subject"):
+            raise ValueError("Fənn tələb olunur")
+        if session_interval(session) is None:
+            raise ValueError(f"Yanlış vaxt aralığı: {session.get('start')}-{session.get('end')}")
+        key = occurrence_key(session, "+")
+        fields = {field: session[field] for field in SESSION_COPY if field in session}
+        fields["one_off"] = True
+        self.commit_op({"op": "set_occurrence", "date": format_ordinal(ordinal), "key": key,
+                        "fields": fields})
+        with self.lock:
+            return self.calendar.find(ordinal, key)
+    
+    def due_on(self, when):
+        """Verilmiş tarixdə son tarixi olan gözləmədəki tapşırıqlar"""
+        # Keş dəyişiklik hadisələri ilə yenilənir, ona görə həmişə yaddaşdakı indeksdən
+        ordinal = deadline_ordinal(when)
+        return self.homeworks_due_between(ordinal, ordinal, PENDING) if ordinal else []
+    
+    def session_conflicts(self, day, start, end):
+        """Günün start-end (SS:DD) aralığı ilə üst-üstə düşən sessiyalar"""
+        interval = session_interval({"start": start, "end": end})
+        if interval is None:
+            raise ValueError(f"Yanlış vaxt aralığı: {start}-{end}")
+        return self.index.intervals.conflicts(day, *interval)
+    
+    def free_slots(self, minutes, limit=5, now=None):
+        """İndidən başlayaraq həftə boyu minutes dəqiqəyə sığan ən erkən boş vaxtlar"""
+        now = now or datetime.now()
+        slots = self.index.intervals.free_slots(minutes, start_day=WEEKDAYS[now.weekday()],
+                                                after=now.hour * 60 + now.minute, limit=limit)
+        return [(day, format_minutes(start), format_minutes(end)) for day, start, end in slots]
+    
+    @timed("study_plan")
+    def study_plan(self, now=None):
+        """Gözləmədə olan tapşırıqların son tarix və prioritetə görə avtomatik planı"""
+        now = now or datetime.now()
+        today = now.date().toordinal()
+        with self.lock:
+            tasks, skipped = plan_tasks(self.index)
+            self.planner.plan(tasks, self.index.intervals, today, now.hour * 60 + now.minute)
+            return self.planner.schedule(self.index.get, skipped, today)
+    
+    def ask_session_time(self, day):
+        """Başlama/bitmə vaxtını soruş, yanlış aralığı və toqquşmanı bildir"""
+        while True:
+            start = input("Başlama vaxtı (saat:dəqiqə, məs: 16:30): ").strip()
+            end = input("Bitmə vaxtı (saat:dəqiqə): ").strip()
+            try:
+                conflicts = self.session_conflicts(day, start, end)
+            except ValueError:
+                print("❌ Vaxt SS:DD formatında olmalı və bitmə başlamadan sonra olmalıdır!")
+                continue
+            if not conflicts:
+                return start, end
+            print("⚠️ Bu vaxt mövcud sessiyalarla üst-üstə düşür:")
+            for session in conflicts:
+                print(f"   • {session['start']} - {session['end']}: {session['subject']}")
+            if input("Yenə də əlavə edilsin? (b/x): ").strip().lower() == "b":
+                return start, end
     
     def add_homework(self):
         """Yeni ev tapşırığı əlavə et"""
@@ -110,6 +732,8 @@ class HomeworkTracker:
         description = input("Ətraflı təsvir: ").strip()
         
         deadline = input("Son tarix (GG.AA.İLİL): ").strip()
+        if deadline_ordinal(deadline) is None:
+            print("⚠️ Tarix tanınmadı - tapşırıq son tarix siyahılarında sonda göstəriləcək")
         
         print("\nPrioritet:")
         for i, priority in enumerate(Priority, 1):
@@ -119,22 +743,8 @@ class HomeworkTracker:
         
         estimated_time = input("Təxmini vaxt (saat): ").strip()
         
-        homework = {
-            "id": len(self.homeworks) + 1,
-            "title": title,
-            "subject": subject,
-            "description": description,
-            "deadline": deadline,
-            "priority": priority,
-            "estimated_time": estimated_time,
-            "status": "Gözləmədə",
-            "created_date": datetime.now().strftime("%d.%m.%Y"),
-            "completed_date": None,
-            "notes": []
-        }
-        
-        self.homeworks.append(homework)
-        self.save_data()
+        homework = self.create_homework(title, subject, description, deadline,
+                                        priority, estimated_time)
         
         print(f"\n✅ '{title}' tapşırığı uğurla əlavə edildi!")
         
@@ -146,22 +756,26 @@ class HomeworkTracker:
         print("\n📅 TƏDRİS CƏDVƏLİNƏ ƏLAVƏ ET")
         print("-"*40)
         
-        days = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+        slots = self.free_slots(estimated_minutes(homework["estimated_time"]))
+        selected = None
+        if slots:
+            print("💡 Təklif olunan boş vaxtlar:")
+            for i, (day, start, end) in enumerate(slots, 1):
+                print(f"{i}. {DAYS_TRANSLATION[day]} {start} - {end}")
+            choice = input("Təklifin nömrəsi (və ya özünüz seçmək üçün Enter): ").strip()
+            if choice.isdigit() and 1 <= int(choice) <= len(slots):
+                selected = slots[int(choice) - 1]
         
-        print("Həftənin günləri:")
-        for i, day in enumerate(["Bazar ertəsi", "Çərşənbə axşamı", "Çərşənbə", 
-                                "Cümə axşamı", "Cümə", "Şənbə", "Bazar"], 1):
-            print(f"{i}. {day}")
-        
-        day_choice = int(input("Gün seçin (1-7): ")) - 1
-        selected_day = days[day_choice]
-        
-        start_time = input("Başlama vaxtı (saat:dəqiqə, məs: 16:30): ").strip()
-        end_time = input("Bitmə vaxtı (saat:dəqiqə): ").strip()
-        
-       
-        if selected_day not in self.schedule:
-            self.schedule[selected_day] = []
+        if selected is None:
+            print("Həftənin günləri:")
+            for i, day in enumerate(DAYS_TRANSLATION.values(), 1):
+                print(f"{i}. {day}")
+            
+            day_choice = int(input("Gün seçin (1-7): ")) - 1
+            selected_day = WEEKDAYS[day_choice]
+            start_time, end_time = self.ask_session_time(selected_day)
+        else:
+            selected_day, start_time, end_time = selected
         
         session = {
             "subject": homework["subject"],
@@ -172,116 +786,204 @@ class HomeworkTracker:
             "completed": False
         }
         
-        self.schedule[selected_day].append(session)
-        self.save_schedule()
+        self.add_session(selected_day, session)
         
         print(f"\n✅ Tapşırıq {selected_day} günü {start_time}-{end_time} vaxtına planlaşdırıldı!")
     
-    def view_homeworks(self, filter_type="all"):
-        """Tapşırıqları göstər"""
-        print("\n" + "="*60)
-        print("EV TAPŞIRIQLARI SİYAHISI")
-        print("="*60)
+    def filtered_homeworks(self, filter_type="all", today=None):
+        """Süzgəcə uyğun tapşırıqlar və başlıq (today: vaxtı keçmiş və yaxın günlər üçün)"""
+        if filter_type == "pending":
+            return self.select_homeworks(status="Gözləmədə"), "📋 GÖZLƏMƏDƏ OLANLAR"
+        if filter_type == "completed":
+            # Arxivdəki köhnə tapşırıqlar yaddaşa yığılmadan axınla oxunur
+            return (itertools.chain(self.select_homeworks(status="Tamamlandı"),
+                                    self.archived_homeworks()), "✅ TAMAMLANMIŞLAR")
+        if filter_type == "urgent":
+            return self.select_homeworks(priority="Təcili"), "⚠️ TƏCİLİ OLANLAR"
+        if filter_type == "overdue":
+            return self.overdue_homeworks(today), "🔴 VAXTI KEÇMİŞLƏR"
+        if filter_type == "due_soon":
+            return self.due_soon(7, today), "📆 YAXIN 7 GÜNDƏ"
+        if filter_type == "by_deadline":
+            return self.homeworks_by_deadline(), "🗓️ SON TARİXƏ GÖRƏ"
+        return self.homeworks, "📚 BÜTÜN TAPŞIRIQLAR"
+    
+    def view_homeworks(self, filter_type="all", page_size=PAGE_SIZE, today=None):
+        """Tapşırıqları səhifə-səhifə göstər"""
+        header = "\n" + "="*60 + "\nEV TAPŞIRIQLARI SİYAHISI\n" + "="*60 + "\n"
         
-        if not self.homeworks:
-            print("❌ Heç bir tapşırıq tapılmadı.")
+        if not self.homeworks and not self.archive.exists():
+            sys.stdout.write(header + "❌ Heç bir tapşırıq tapılmadı.\n")
             return
         
-        filtered_homeworks = self.homeworks
+        filtered_homeworks, title = self.filtered_homeworks(filter_type, today)
+        invalid = self.index.deadlines.invalid
+        shown = show_pages(filtered_homeworks,
+                           lambda hw: format_homework(hw, hw["id"] in invalid),
+                           header + title + "\n" + "-"*60 + "\n", page_size)
+        METRICS.observe("view_homeworks.rows", shown)
+    
+    def search_dialog(self):
+        """Tapşırıqları mətnə görə axtar"""
+        query = input("\n🔍 Axtarış: ").strip()
+        if not query:
+            return
+        only_pending = input("Yalnız gözləmədə olanlar? (b/x): ").strip().lower() == "b"
+        results = self.search_homeworks(query, status=PENDING if only_pending else None,
+                                        limit=100)
+        header = f"\n🔍 '{query}' üçün {len(results)} nəticə\n" + "-"*60 + "\n"
+        if not results:
+            sys.stdout.write(header + "❌ Heç nə tapılmadı.\n")
+            return
+        invalid = self.index.deadlines.invalid
+        show_pages(results, lambda hw: format_homework(hw, hw["id"] in invalid), header)
+    
+    def view_deadline_calendar(self, days=14):
+        """Yaxın günlərin son tarix təqvimini göstər"""
+        print("\n" + "="*60)
+        print("🗓️ SON TARİX TƏQVİMİ")
+        print("="*60)
         
-        if filter_type == "pending":
-            filtered_homeworks = [h for h in self.homeworks if h["status"] == "Gözləmədə"]
-            print("📋 GÖZLƏMƏDƏ OLANLAR")
-        elif filter_type == "completed":
-            filtered_homeworks = [h for h in self.homeworks if h["status"] == "Tamamlandı"]
-            print("✅ TAMAMLANMIŞLAR")
-        elif filter_type == "urgent":
-            filtered_homeworks = [h for h in self.homeworks if h["priority"] == "Təcili"]
-            print("⚠️ TƏCİLİ OLANLAR")
-        else:
-            print("📚 BÜTÜN TAPŞIRIQLAR")
+        overdue = self.overdue_homeworks()
+        if overdue:
+            print(f"\n🔴 Vaxtı keçmiş: {len(overdue)} tapşırıq")
         
-        print("-"*60)
+        calendar = self.deadline_calendar(days)
+        if not calendar:
+            print(f"\n✅ Yaxın {days} gündə son tarixi olan tapşırıq yoxdur!")
+        for day, homeworks in calendar:
+            print(f"\n📅 {day}:")
+            for hw in homeworks:
+                icon = self.get_subject_icon(hw["subject"])
+                print(f"   {icon} {hw['title']} ({hw['subject']}) - {hw['priority']}")
         
-        for hw in filtered_homeworks:
-            status_icon = "✅" if hw["status"] == "Tamamlandı" else "⏳"
-            priority_icon = "⚠️" if hw["priority"] == "Təcili" else "🔄"
-            
-            print(f"\n{status_icon} ID: {hw['id']}")
-            print(f"   📌 {hw['title']}")
-            print(f"   📚 Fənn: {hw['subject']}")
-            print(f"   ⏰ Son tarix: {hw['deadline']}")
-            print(f"   {priority_icon} Prioritet: {hw['priority']}")
-            print(f"   🕒 Təxmini vaxt: {hw['estimated_time']} saat")
-            print(f"   📝 Status: {hw['status']}")
-            
-            if hw['notes']:
-                print(f"   📎 Qeydlər: {len(hw['notes'])} qeyd")
+        invalid = self.index.deadlines.invalid_ids(PENDING)
+        if invalid:
+            print(f"\n⚠️ Son tarixi tanınmayan: {len(invalid)} tapşırıq (ID: "
+                  f"{', '.join(map(str, invalid))})")
     
     def mark_completed(self):
         """Tapşırığı tamamlandı kimi qeyd et"""
         self.view_homeworks("pending")
         
-        if not any(hw["status"] == "Gözləmədə" for hw in self.homeworks):
+        if not self.index.count("status", "Gözləmədə"):
             return
         
         hw_id = int(input("\nTamamlanan tapşırığın ID-si: "))
         
-        for hw in self.homeworks:
-            if hw["id"] == hw_id:
-                hw["status"] = "Tamamlandı"
-                hw["completed_date"] = datetime.now().strftime("%d.%m.%Y")
-                
-                
-                for day in self.schedule.values():
-                    for session in day:
-                        if session.get("homework_id") == hw_id:
-                            session["completed"] = True
-                
-                print(f"\n✅ '{hw['title']}' tapşırığı tamamlandı kimi qeyd edildi!")
-                self.save_data()
-                self.save_schedule()
-                return
+        hw = self.complete_homework(hw_id)
+        if hw is None:
+            print("❌ Tapşırıq tapılmadı!")
+            return
         
-        print("❌ Tapşırıq tapılmadı!")
+        print(f"\n✅ '{hw['title']}' tapşırığı tamamlandı kimi qeyd edildi!")
+    
+    def remove_homework(self):
+        """Tapşırığı sil"""
+        self.view_homeworks("all")
+        
+        if not self.homeworks:
+            return
+        
+        hw_id = int(input("\nSilinəcək tapşırığın ID-si: "))
+        
+        hw = self.delete_homework(hw_id)
+        if hw is None:
+            print("❌ Tapşırıq tapılmadı!")
+            return
+        
+        print(f"\n🗑️ '{hw['title']}' tapşırığı silindi!")
     
     def view_schedule(self):
         """Tədris cədvəlini göstər"""
-        print("\n" + "="*60)
-        print("HƏFTƏLİK TƏDRİS CƏDVƏLİ")
-        print("="*60)
-        
-        days_translation = {
-            "monday": "Bazar ertəsi",
-            "tuesday": "Çərşənbə axşamı",
-            "wednesday": "Çərşənbə",
-            "thursday": "Cümə axşamı",
-            "friday": "Cümə",
-            "saturday": "Şənbə",
-            "sunday": "Bazar"
-        }
+        lines = ["\n" + "="*60, "HƏFTƏLİK TƏDRİS CƏDVƏLİ", "="*60]
         
-        for day_en, day_tr in days_translation.items():
-            print(f"\n📅 {day_tr.upper()}:")
-            print("-"*40)
+        for day_en, day_tr in DAYS_TRANSLATION.items():
+            lines.append(f"\n📅 {day_tr.upper()}:")
+            lines.append("-"*40)
             
             if day_en in self.schedule and self.schedule[day_en]:
-                sessions = sorted(self.schedule[day_en], key=lambda x: x["start"])
-                
-                for session in sessions:
-                    status_icon = "✅" if session.get("completed", False) else "⏳"
+                # Tamamlanma bu həftənin həmin günündəki təkrara görə göstərilir
+                ordinal = weekday_ordinal(day_en, date.today().toordinal())
+                for session in self.index.sorted_sessions(day_en, self.schedule[day_en]):
+                    done = self.calendar.completed_on(ordinal, day_en, session)
+                    status_icon = "✅" if done else "⏳"
                     subject_icon = self.get_subject_icon(session["subject"])
                     
-                    print(f"   {status_icon} {subject_icon} {session['start']} - {session['end']}")
-                    print(f"      Fənn: {session['subject']}")
+                    lines.append(f"   {status_icon} {subject_icon} {session['start']} - {session['end']}")
+                    lines.append(f"      Fənn: {session['subject']}")
                     
                     if "homework_title" in session:
-                        print(f"      Tapşırıq: {session['homework_title']}")
+                        lines.append(f"      Tapşırıq: {session['homework_title']}")
                     
-                    if session.get("completed", False):
-                        print(f"      🎉 Tamamlandı!")
+                    if done:
+                        lines.append(f"      🎉 Tamamlandı!")
             else:
-                print("   🎉 Bu gün tədbir yoxdur!")
+                lines.append("   🎉 Bu gün tədbir yoxdur!")
+        
+        sys.stdout.write("\n".join(lines) + "\n")
+    
+    def view_study_plan(self, days=7):
+        """Yaxın günlərin avtomatik tədris planını göstər"""
+        plan = self.study_plan()
+        lines = ["\n" + "="*60, "🧭 AVTOMATİK TƏDRİS PLANI", "="*60]
+        last = date.today().toordinal() + days - 1
+        current = None
+        for session in plan["sessions"]:
+            if deadline_ordinal(session["date"]) > last:
+                break
+            if session["date"] != current:
+                current = session["date"]
+                lines.append(f"\n📅 {DAYS_TRANSLATION[session['day']]}, {current}:")
+                lines.append("-"*40)
+            icon = self.get_subject_icon(session["subject"])
+            lines.append(f"   {icon} {session['start']} - {session['end']}  "
+                         f"{session['homework_title']} (ID: {session['homework_id']})")
+        if current is None:
+            lines.append(f"\n🎉 Yaxın {days} gündə planlaşdırılacaq tapşırıq yoxdur!")
+        
+        if plan["unscheduled"]:
+            lines.append("\n⚠️ SON TARİXƏ QƏDƏR SIĞMAYANLAR:")
+            for item in plan["unscheduled"]:
+                lines.append(f"   • {item['title']} (ID: {item['homework_id']}, son tarix: "
+                             f"{item['deadline']}) - {item['reason']}, çatışmayan: "
+                             f"{item['missing']} dəq")
+        sys.stdout.write("\n".join(lines) + "\n")
+    
+    def view_calendar(self, days=7):
+        """Yaxın günlərin tarixli sessiyalarını göstər"""
+        lines = ["\n" + "="*60, "📆 TƏQVİM", "="*60]
+        current = None
+        for occurrence in self.calendar_range(days=days, include_cancelled=True):
+            if occurrence["date"] != current:
+                current = occurrence["date"]
+                lines.append(f"\n📅 {DAYS_TRANSLATION[occurrence['day']]}, {current}:")
+                lines.append("-"*40)
+            if occurrence["cancelled"]:
+                status_icon = "🚫"
+            else:
+                status_icon = "✅" if occurrence["completed"] else "⏳"
+            extra = " (əlavə)" if occurrence["one_off"] else ""
+            lines.append(f"   {status_icon} {self.get_subject_icon(occurrence['subject'])} "
+                         f"{occurrence['start']} - {occurrence['end']}  "
+                         f"{occurrence['subject']}{extra}")
+        if current is None:
+            lines.append(f"\n🎉 Yaxın {days} gündə sessiya yoxdur!")
+        sys.stdout.write("\n".join(lines) + "\n")
+    
+    def export_view(self, what="homeworks", filter_type="all", fmt="jsonl", fp=None):
+        """Siyahını maşın üçün oxunaqlı formatda yaz (TTY olmayan çıxış üçün)"""
+        fp = fp or sys.stdout
+        if what == "plan":
+            return write_records(self.study_plan()["sessions"], fp, fmt, PLAN_FIELDS)
+        if what == "calendar":
+            return write_records(self.calendar_range(include_cancelled=True), fp, fmt,
+                                 CALENDAR_FIELDS)
+        if what == "schedule":
+            rows = schedule_rows(self.schedule,
+                                 lambda day: self.index.sorted_sessions(day, self.schedule[day]))
+            return write_records(rows, fp, fmt, SESSION_FIELDS)
+        return write_records(self.filtered_homeworks(filter_type)[0], fp, fmt)
     
     def get_subject_icon(self, subject):
         """Fənnə uyğun ikon qaytar"""
@@ -326,10 +1028,9 @@ class HomeworkTracker:
         
         if choice == "1":
             subject = input("Fənn: ").strip()
-            start = input("Başlama vaxtı: ").strip()
-            end = input("Bitmə vaxtı: ").strip()
+            start, end = self.ask_session_time(selected_day)
             
-            self.schedule[selected_day].append({
+            self.add_session(selected_day, {
                 "subject": subject,
                 "start": start,
                 "end": end,
@@ -340,75 +1041,53 @@ class HomeworkTracker:
         elif choice == "2":
             session_idx = int(input("Silinəcək sessiyanın nömrəsi: ")) - 1
             if 0 <= session_idx < len(self.schedule[selected_day]):
-                removed = self.schedule[selected_day].pop(session_idx)
+                removed = self.remove_session(selected_day, session_idx)
                 print(f"✅ '{removed['subject']}' sessiyası silindi!")
         
         elif choice == "3":
             session_idx = int(input("Tamamlanan sessiyanın nömrəsi: ")) - 1
             if 0 <= session_idx < len(self.schedule[selected_day]):
-                self.schedule[selected_day][session_idx]["completed"] = True
-                print("✅ Sessiya tamamlandı kimi qeyd edildi!")
-        
-        self.save_schedule()
+                occurrence = self.complete_session(selected_day, session_idx)
+                print(f"✅ Sessiya {occurrence['date']} tarixi üçün tamamlandı kimi qeyd edildi!")
     
     def start_reminders(self):
         """Xatırlatmaları başlat"""
-        self.stop_reminders = False
-        self.reminder_thread = threading.Thread(target=self.reminder_loop, daemon=True)
-        self.reminder_thread.start()
+        self.reminders.start()
         print("\n🔔 Xatırlatmalar aktiv edildi!")
     
+    def start_deferred(self):
+        """Menyu göstərildikdən sonra: xatırlatma axını və indekslərin fonda qurulması"""
+        self.reminders.start()
+        if not self.index.built:
+            threading.Thread(target=self.index.warm, name="index-warm", daemon=True).start()
+    
     def reminder_loop(self):
         """Xatırlatma dövrü"""
-        while not self.stop_reminders:
-            now = datetime.now()
-            current_time = now.strftime("%H:%M")
-            current_day = now.strftime("%A").lower()
-            
-            
-            day_translation = {
-                "monday": "monday",
-                "tuesday": "tuesday", 
-                "wednesday": "wednesday",
-                "thursday": "thursday",
-                "friday": "friday",
-                "saturday": "saturday",
-                "sunday": "sunday"
-            }
-            
-            
-            if current_day in day_translation and day_translation[current_day] in self.schedule:
-                sessions = self.schedule[day_translation[current_day]]
-                
-                for session in sessions:
-                    if session["start"] == current_time and not session.get("notified", False):
-                        print(f"\n" + "!"*60)
-                        print(f"🔔 XATIRLATMA!")
-                        print(f"Vaxtıdır: {session['subject']}")
-                        if "homework_title" in session:
-                            print(f"Tapşırıq: {session['homework_title']}")
-                        print(f"Vaxt: {session['start']} - {session['end']}")
-                        print("!"*60 + "\n")
-                        session["notified"] = True
-            
-           
-            time.sleep(60)
+        self.reminders.run()
+    
+    def notify_session(self, day, session, when):
+        """Sessiya xatırlatmasını bildiriş növbəsinə göndər; növbə doludursa False"""
+        if self.notifier is None:
+            self.notifier = Dispatcher([ConsoleSink()], workers=1)
+        return self.notifier.submit(reminder_event(day, session, when, self.tenant))
     
     def stop_reminder_service(self):
-        """Xatırlatmaları dayandır"""
-        self.stop_reminders = True
-        if self.reminder_thread:
-            self.reminder_thread.join()
+        """Xatırlatmaları dayandır, göndərilməmiş bildirişləri və yazıları ötür"""
+        self.reminders.stop()
+        if self.notifier is not None:
+            self.notifier.drain()
+        self.flush()
         print("\n🔕 Xatırlatmalar dayandırıldı!")
     
-    def progress_report(self):
+    def progress_report(self, verify=False):
         """Tərəqqi hesabatı"""
         print("\n" + "="*60)
         print("📊 TƏRƏQQİ HESABATI")
         print("="*60)
         
-        total_homeworks = len(self.homeworks)
-        completed_homeworks = len([h for h in self.homeworks if h["status"] == "Tamamlandı"])
+        report = self.history_stats()
+        total_homeworks = report["total"]
+        completed_homeworks = report["completed"]
         
         if total_homeworks > 0:
             completion_rate = (completed_homeworks / total_homeworks) * 100
@@ -421,16 +1100,7 @@ class HomeworkTracker:
         print("\n📚 FƏNNLƏRƏ GÖRƏ:")
         print("-"*40)
         
-        subjects = {}
-        for hw in self.homeworks:
-            subj = hw["subject"]
-            if subj not in subjects:
-                subjects[subj] = {"total": 0, "completed": 0}
-            subjects[subj]["total"] += 1
-            if hw["status"] == "Tamamlandı":
-                subjects[subj]["completed"] += 1
-        
-        for subj, stats in subjects.items():
+        for subj, stats in report["subjects"].items():
             rate = (stats["completed"] / stats["total"] * 100) if stats["total"] > 0 else 0
             icon = self.get_subject_icon(subj)
             print(f"   {icon} {subj}: {stats['completed']}/{stats['total']} ({rate:.1f}%)")
@@ -439,19 +1109,28 @@ class HomeworkTracker:
         print("\n⚠️ PRIORİTETLƏRƏ GÖRƏ:")
         print("-"*40)
         
-        priorities = {}
-        for hw in self.homeworks:
-            prio = hw["priority"]
-            if prio not in priorities:
-                priorities[prio] = {"total": 0, "completed": 0}
-            priorities[prio]["total"] += 1
-            if hw["status"] == "Tamamlandı":
-                priorities[prio]["completed"] += 1
-        
-        for prio, stats in priorities.items():
+        for prio, stats in report["priorities"].items():
             rate = (stats["completed"] / stats["total"] * 100) if stats["total"] > 0 else 0
             print(f"   {prio}: {stats['completed']}/{stats['total']} ({rate:.1f}%)")
         
+        if self.archive.exists():
+            segments = self.archive.manifest["segments"]
+            print("\n📦 ARXİV (aylar üzrə tamamlanan):")
+            print("-"*40)
+            for month in self.archive.months():
+                print(f"   {month}: {segments[month]['count']}")
+        
+        sys.stdout.write(format_analytics(self.analytics_report()))
+        
+        
+        if verify:
+            mismatches = self.verify_stats()
+            if mismatches:
+                print("\n❗ SAYĞAC UYĞUNSUZLUQLARI:")
+                for name, counted, expected in mismatches:
+                    print(f"   {name}: sayğac={counted}, hesablanmış={expected}")
+            else:
+                print("\n🧮 Sayğaclar tam hesablama ilə uyğundur.")
         
         print("\n💪 MOTİVASİYA:")
         print("-"*40)
@@ -464,58 +1143,45 @@ class HomeworkTracker:
         ]
         print(f"   {random.choice(messages)}")
     
-    def quick_check_in(self):
+    def check_in_status(self, now=None):
+        """Cari gün üçün son tarixli tapşırıqları, davam edən və növbəti sessiyanı qaytar"""
+        now = now or datetime.now()
+        # Bu gün görünüşü keşdədir: yalnız aid dəyişikliklər və ya gün dəyişməsi onu yeniləyir
+        with self.lock:
+            return self.calendar.check_in(now)
+    
+    def quick_check_in(self, now=None):
         """Cari statusu yoxla"""
         print("\n" + "="*60)
         print("🔍 CARI STATUS")
         print("="*60)
         
-        now = datetime.now()
-        current_time = now.strftime("%H:%M")
-        current_day = now.strftime("%A").lower()
+        status = self.check_in_status(now)
         
-        print(f"\n📅 Bugün: {now.strftime('%d.%m.%Y')}")
-        print(f"⏰ Cari vaxt: {current_time}")
+        print(f"\n📅 Bugün: {status['date']}")
+        print(f"⏰ Cari vaxt: {status['time']}")
         
-       
-        today_homeworks = [hw for hw in self.homeworks 
-                          if hw["status"] == "Gözləmədə" and hw["deadline"] == now.strftime("%d.%m.%Y")]
-        
-        if today_homeworks:
+        if status["due_today"]:
             print("\n⚠️ BUGÜN TAMAMLANMALI TAPŞIRIQLAR:")
-            for hw in today_homeworks:
+            for hw in status["due_today"]:
                 print(f"   • {hw['title']} ({hw['subject']}) - {hw['priority']} prioritet")
         else:
             print("\n✅ Bugün son tarixi olan tapşırıq yoxdur!")
         
+        if not status["has_sessions"]:
+            return
         
-        day_translation = {
-            "monday": "monday",
-            "tuesday": "tuesday",
-            "wednesday": "wednesday", 
-            "thursday": "thursday",
-            "friday": "friday",
-            "saturday": "saturday",
-            "sunday": "sunday"
-        }
-        
-        if current_day in day_translation and day_translation[current_day] in self.schedule:
-            sessions = self.schedule[day_translation[current_day]]
-            current_sessions = [s for s in sessions if s["start"] <= current_time <= s["end"]]
+        if status["current"]:
+            print("\n🎯 HAL-HAZIRDA DAVAM EDƏN:")
+            for session in status["current"]:
+                state = "✅ Tamamlandı" if session.get("completed") else "⏳ Davam edir"
+                print(f"   • {session['subject']} ({session['start']}-{session['end']}) - {state}")
+        else:
+            print("\n🕒 Hal-hazırda aktiv sessiya yoxdur")
             
-            if current_sessions:
-                print("\n🎯 HAL-HAZIRDA DAVAM EDƏN:")
-                for session in current_sessions:
-                    status = "✅ Tamamlandı" if session.get("completed") else "⏳ Davam edir"
-                    print(f"   • {session['subject']} ({session['start']}-{session['end']}) - {status}")
-            else:
-                print("\n🕒 Hal-hazırda aktiv sessiya yoxdur")
-                
-              
-                future_sessions = [s for s in sessions if s["start"] > current_time]
-                if future_sessions:
-                    next_session = min(future_sessions, key=lambda x: x["start"])
-                    print(f"\n⏭️ NÖVBƏTİ SESSİYA: {next_session['start']} - {next_session['subject']}")
+            next_session = status["next"]
+            if next_session:
+                print(f"\n⏭️ NÖVBƏTİ SESSİYA: {next_session['start']} - {next_session['subject']}")
     
     def run(self):
         """Əsas proqram dövrü"""
@@ -523,8 +1189,7 @@ class HomeworkTracker:
         print("🎓 EV TAPŞIRIĞI İDARƏ ETMƏ SİSTEMİ")
         print("="*60)
         
-        
-        self.start_reminders()
+        first_menu = True
         
         try:
             while True:
@@ -540,54 +1205,85 @@ class HomeworkTracker:
                 print("7. 📊 Tərəqqi hesabatı")
                 print("8. ⚙️ Xatırlatmaları idarə et")
                 print("9. 💾 Saxla və çıx")
+                print("10. 🗑️ Tapşırığı sil")
+                print("11. 🧭 Avtomatik tədris planı")
                 print("="*60)
                 
-                choice = input("Seçiminiz (1-9): ").strip()
+                if first_menu:
+                    first_menu = False
+                    METRICS.observe("time_to_first_menu", time.perf_counter() - STARTED,
+                                    "seconds")
+                    self.start_deferred()
+                    print("\n🔔 Xatırlatmalar aktiv edildi!")
                 
-                if choice == "1":
-                    self.add_homework()
-                elif choice == "2":
-                    print("\n1. Bütün tapşırıqlar")
-                    print("2. Gözləmədə olanlar")
-                    print("3. Tamamlanmışlar")
-                    print("4. Təcili olanlar")
-                    filter_choice = input("Seçim: ")
+                choice = input("Seçiminiz (1-11): ").strip()
+                
+                if choice == "m" and METRICS.enabled:
+                    print(METRICS.dump())
+                    continue
+                
+                with METRICS.timer(f"menu.{MENU_ACTIONS.get(choice, 'invalid')}"):
+                    if choice == "1":
+                        self.add_homework()
+                    elif choice == "2":
+                        print("\n1. Bütün tapşırıqlar")
+                        print("2. Gözləmədə olanlar")
+                        print("3. Tamamlanmışlar")
+                        print("4. Təcili olanlar")
+                        print("5. Vaxtı keçmişlər")
+                        print("6. Yaxın 7 gündə")
+                        print("7. Son tarixə görə sıralı")
+                        print("8. Son tarix təqvimi")
+                        print("9. 🔍 Axtarış")
+                        filter_choice = input("Seçim: ")
                     
-                    if filter_choice == "1":
-                        self.view_homeworks("all")
-                    elif filter_choice == "2":
-                        self.view_homeworks("pending")
-                    elif filter_choice == "3":
-                        self.view_homeworks("completed")
-                    elif filter_choice == "4":
-                        self.view_homeworks("urgent")
-                elif choice == "3":
-                    self.mark_completed()
-                elif choice == "4":
-                    self.view_schedule()
-                elif choice == "5":
-                    self.edit_schedule()
-                elif choice == "6":
-                    self.quick_check_in()
-                elif choice == "7":
-                    self.progress_report()
-                elif choice == "8":
-                    print("\n1. Xatırlatmaları aktiv et")
-                    print("2. Xatırlatmaları dayandır")
-                    reminder_choice = input("Seçim: ")
+                        if filter_choice == "1":
+                            self.view_homeworks("all")
+                        elif filter_choice == "2":
+                            self.view_homeworks("pending")
+                        elif filter_choice == "3":
+                            self.view_homeworks("completed")
+                        elif filter_choice == "4":
+                            self.view_homeworks("urgent")
+                        elif filter_choice == "5":
+                            self.view_homeworks("overdue")
+                        elif filter_choice == "6":
+                            self.view_homeworks("due_soon")
+                        elif filter_choice == "7":
+                            self.view_homeworks("by_deadline")
+                        elif filter_choice == "8":
+                            self.view_deadline_calendar()
+                        elif filter_choice == "9":
+                            self.search_dialog()
+                    elif choice == "3":
+                        self.mark_completed()
+                    elif choice == "4":
+                        self.view_schedule()
+                    elif choice == "5":
+                        self.edit_schedule()
+                    elif choice == "6":
+                        self.quick_check_in()
+                    elif choice == "7":
+                        self.progress_report()
+                    elif choice == "8":
+                        print("\n1. Xatırlatmaları aktiv et")
+                        print("2. Xatırlatmaları dayandır")
+                        reminder_choice = input("Seçim: ")
                     
-                    if reminder_choice == "1":
-                        self.start_reminders()
-                    elif reminder_choice == "2":
+                        if reminder_choice == "1":
+                            self.start_reminders()
+                        elif reminder_choice == "2":
+                            self.stop_reminder_service()
+                    elif choice == "9":
                         self.stop_reminder_service()
-                elif choice == "9":
-                    self.save_data()
-                    self.save_schedule()
-                    self.stop_reminder_service()
-                    print("\n✨ Məlumatlar saxlanıldı. Sağ olun!")
-                    break
-                else:
-                    print("\n❌ Yanlış seçim!")
+                        print("\n✨ Məlumatlar saxlanıldı. Sağ olun!")
+                        break
+                    elif choice == "10":
+                        self.remove_homework()
+                    elif choice == "11":
+                        self.view_study_plan()
+                    else:
+                        print("\n❌ Yanlış seçim!")
                 
                 input("\n↵ Davam etmək üçün Enter düyməsini basın...")
                 
@@ -596,6 +1292,171 @@ class HomeworkTracker:
             print("\n\n👋 Proqramdan çıxılır...")
 
 
-if __name__ == "__main__":
-    app = HomeworkTracker()
+def dump_metrics(path):
+    """Toplanmış ölçmələri fayla və ya standart xəta axınına yaz"""
+    if path == "-":
+        print(METRICS.dump(), file=sys.stderr)
+    else:
+        METRICS.write(path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ev tapşırığı idarə etmə sistemi")
+    parser.add_argument("--storage", choices=STORAGE_KINDS, default="json",
+                        help="Məlumatların saxlanma rejimi")
+    parser.add_argument("--compact-threshold", type=int, default=200,
+                        help="Jurnal neçə qeyddən sonra snapşota sıxılsın")
+    parser.add_argument("--data-dir", default=".",
+                        help="Şagirdin məlumat qovluğu")
+    parser.add_argument("--archive-after", type=int, metavar="DAYS",
+                        help="Başlanğıcda bu gündən köhnə tamamlanmışları arxivə köçür")
+    parser.add_argument("--migrate-to", choices=STORAGE_KINDS,
+                        help="Məlumatları başqa saxlama növünə köçür və çıx")
+    parser.add_argument("--write-behind", type=float, metavar="SECONDS",
+                        help="Dəyişiklikləri fon axınında bu pəncərə ilə birləşdirib yaz")
+    parser.add_argument("--notify", action="append", metavar="SPEC",
+                        help="Xatırlatma kanalı: console, file:PATH, webhook:URL, desktop "
+                             "(bir neçə dəfə verilə bilər; serve rejimində xatırlatmaları açır)")
+    parser.add_argument("--notify-workers", type=int, default=4,
+                        help="Bildirişləri göndərən işçi axınlarının sayı")
+    parser.add_argument("--metrics", nargs="?", const="-", metavar="PATH",
+                        help="Ölçmələri aktiv et və çıxışda fayla (.json - JSON) "
+                             "və ya standart xəta axınına yaz")
+    commands = parser.add_subparsers(dest="command")
+    import_parser = commands.add_parser("import", help="CSV/JSONL faylından toplu idxal")
+    import_parser.add_argument("path")
+    import_parser.add_argument("--format", choices=bulk.FORMATS)
+    export_parser = commands.add_parser("export", help="CSV/JSONL formatında ixrac")
+    export_parser.add_argument("path", help="Fayl yolu və ya standart çıxış üçün '-'")
+    export_parser.add_argument("--format", choices=bulk.FORMATS)
+    list_parser = commands.add_parser("list", help="Tapşırıqları və ya cədvəli çap et")
+    list_parser.add_argument("what", nargs="?",
+                             choices=("homeworks", "schedule", "plan", "calendar"),
+                             default="homeworks")
+    list_parser.add_argument("--filter", default="all",
+                             choices=("all", "pending", "completed", "urgent", "overdue",
+                                      "due_soon", "by_deadline"))
+    list_parser.add_argument("--format", choices=OUTPUT_FORMATS,
+                             help="Standart: terminalda text, əks halda jsonl")
+    archive_parser = commands.add_parser("archive",
+                                         help="Köhnə tamamlanmış tapşırıqları arxivə köçür")
+    archive_parser.add_argument("--older-than", type=int, default=30, metavar="DAYS",
+                                help="Neçə gündən əvvəl tamamlananlar arxivlənsin")
+    analytics_parser = commands.add_parser("analytics",
+                                           help="Tamamlama tarixçəsi üzrə analitika")
+    analytics_parser.add_argument("--period", choices=PERIODS, default="week")
+    analytics_parser.add_argument("--by", choices=GROUPS)
+    analytics_parser.add_argument("--window", type=int, default=4,
+                                  help="Sürüşən pəncərənin dövr sayı")
+    analytics_parser.add_argument("--periods", type=int, default=8,
+                                  help="Neçə son dövr göstərilsin")
+    analytics_parser.add_argument("--format", choices=("text", "json"),
+                                  help="Standart: terminalda text, əks halda json")
+    events_parser = commands.add_parser("events",
+                                        help="Dəyişiklik hadisələrini JSONL kimi çap et")
+    events_parser.add_argument("--since", type=int, default=0, metavar="SEQ",
+                               help="Bu nömrədən sonrakı hadisələr")
+    events_parser.add_argument("--follow", action="store_true",
+                               help="Yeni hadisələri gözlə və çap et")
+    serve_parser = commands.add_parser("serve", help="HTTP/JSON API serverini başlat")
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=8080)
+    serve_parser.add_argument("--max-tenants", type=int, default=64)
+    args = parser.parse_args(argv)
+    
+    if args.metrics:
+        METRICS.enable()
+        atexit.register(dump_metrics, args.metrics)
+    
+    notifier = None
+    if args.notify:
+        notifier = Dispatcher([open_sink(spec) for spec in args.notify],
+                              workers=args.notify_workers)
+    
+    if args.command == "events":
+        # İşləyən izləyicinin jurnalını yalnız oxuyur, məlumatları yükləmir
+        log = EventLog(os.path.join(args.data_dir, EVENTS_FILE))
+        events = (log.follow(args.since) if args.follow
+                  else iter(log.read(args.since)))
+        try:
+            for event in events:
+                print(json.dumps(event, ensure_ascii=False), flush=True)
+        except KeyboardInterrupt:
+            pass
+        return 0
+    
+    if args.command == "serve":
+        from server import serve
+        from tenants import TrackerManager
+        manager = TrackerManager(args.data_dir, storage=args.storage,
+                                 compaction_threshold=args.compact_threshold,
+                                 max_tenants=args.max_tenants,
+                                 archive_after_days=args.archive_after,
+                                 write_behind=args.write_behind, notifier=notifier)
+        print(f"🌐 Server http://{args.host}:{args.port}/students/<id>/ ünvanında işləyir")
+        try:
+            serve(manager, args.host, args.port)
+        finally:
+            if notifier is not None:
+                notifier.close()
+        return 0
+    
+    app = HomeworkTracker(storage=args.storage, compaction_threshold=args.compact_threshold,
+                          data_dir=args.data_dir, archive_after_days=args.archive_after,
+                          write_behind=args.write_behind, notifier=notifier)
+    # Hər alt əmrdən sonra fon yazıçısı dayandırılır və gözləyən dəyişikliklər yazılır
+    try:
+        return run_command(app, args)
+    finally:
+        app.close()
+        if notifier is not None:
+            notifier.close()
+
+
+def run_command(app, args):
+    """Alt əmri (və ya interaktiv menyunu) icra et, çıxış kodunu qaytar"""
+    if args.migrate_to:
+        app.migrate_storage(args.migrate_to)
+        print(f"✅ Məlumatlar '{args.storage}' rejimindən '{args.migrate_to}' rejiminə köçürüldü!")
+        return 0
+    if args.command == "import":
+        report = bulk.import_file(app, args.path, args.format)
+        print(report)
+        return 0 if report.ok else 1
+    if args.command == "export":
+        if args.path == "-":
+            bulk.write_export(app, sys.stdout, args.format or "jsonl")
+        else:
+            count = bulk.export_file(app, args.path, args.format)
+            print(f"✅ {count} qeyd ixrac edildi: {args.path}")
+        return 0
+    if args.command == "list":
+        fmt = args.format or ("text" if sys.stdout.isatty() else "jsonl")
+        if fmt != "text":
+            app.export_view(args.what, args.filter, fmt)
+        elif args.what == "schedule":
+            app.view_schedule()
+        elif args.what == "plan":
+            app.view_study_plan()
+        elif args.what == "calendar":
+            app.view_calendar()
+        else:
+            app.view_homeworks(args.filter)
+        return 0
+    if args.command == "analytics":
+        report = app.analytics_report(args.period, args.by, args.window, args.periods)
+        if (args.format or ("text" if sys.stdout.isatty() else "json")) == "json":
+            print(json.dumps(report, ensure_ascii=False, indent=2))
+        else:
+            sys.stdout.write(format_analytics(report))
+        return 0
+    if args.command == "archive":
+        count = app.archive_completed(args.older_than)
+        print(f"📦 {count} tapşırıq arxivə köçürüldü")
+        return 0
     app.run()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,231 @@
+import json
+import os
+import threading
+from datetime import datetime
+
+from metrics import METRICS
+from records import to_json
+
+EVENT_TYPES = {
+    "add_homework": "homework.added",
+    "complete_homework": "homework.completed",
+    "delete_homework": "homework.deleted",
+    "archive_homeworks": "homework.archived",
+    "add_session": "session.added",
+    "remove_session": "session.removed",
+    "complete_session": "session.completed",
+    "set_occurrence": "occurrence.updated",
+}
+EVENTS_FILE = "homework_events.jsonl"
+TAIL_BLOCK = 64 * 1024
+
+
+def change_event(op, schedule):
+    """Əməliyyatdan (növ, məlumat) hadisəsi; op tətbiq olunmazdan əvvəl çağırılmalıdır"""
+    kind = op["op"]
+    if kind == "add_homework":
+        data = {"homework": dict(op["homework"])}
+    elif kind == "complete_homework":
+        data = {"id": op["id"], "date": op["date"]}
+    elif kind == "delete_homework":
+        data = {"id": op["id"]}
+    elif kind == "archive_homeworks":
+        data = {"ids": list(op["ids"])}
+    elif kind == "add_session":
+        data = {"day": op["day"], "index": len(schedule.get(op["day"], ())),
+                "session": dict(op["session"])}
+    elif kind in ("remove_session", "complete_session"):
+        session = dict(schedule[op["day"]][op["index"]])
+        if kind == "complete_session":
+            session["completed"] = True
+        data = {"day": op["day"], "index": op["index"], "session": session}
+    elif kind == "set_occurrence":
+        data = {"date": op["date"], "key": op["key"], "fields": dict(op["fields"])}
+    else:
+        raise ValueError(f"Naməlum əməliyyat: {kind}")
+    return EVENT_TYPES[kind], data
+
+
+def change_events(op, schedule):
+    """Əməliyyatın bütün hadisələri; şablon sessiyasının tarixli tamamlanması
+    occurrence.updated ilə yanaşı session.completed da verir"""
+    changes = [change_event(op, schedule)]
+    if (op["op"] == "set_occurrence" and op.get("index") is not None
+            and op["fields"].get("completed")):
+        session = dict(schedule[op["day"]][op["index"]])
+        session["completed"] = True
+        changes.append(("session.completed", {"day": op["day"], "index": op["index"],
+                                              "session": session, "date": op["date"]}))
+    return changes
+
+
+class EventLog:
+    """Yalnız sonuna əlavə olunan hadisə jurnalı (JSONL): seq üzrə oxuma və izləmə"""
+
+    def __init__(self, path, sync=False):
+        self.path = path
+        self.sync = sync
+        self._fh = None
+
+    def recover(self):
+        """Yarımçıq son sətri kəs və son seq nömrəsini qaytar (yalnız yazan proses üçün)"""
+        try:
+            f = open(self.path, 'r+b')
+        except FileNotFoundError:
+            return 0
+        with f:
+            size = os.fstat(f.fileno()).st_size
+            end = size
+            while end > 0:
+                start = max(0, end - TAIL_BLOCK)
+                f.seek(start)
+                block = f.read(end - start)
+                cut = block.rfind(b"\n")
+                if cut != -1:
+                    end = start + cut + 1
+                    break
+                end = start
+            if end < size:
+                f.truncate(end)
+            if not end:
+                return 0
+            f.seek(max(0, end - TAIL_BLOCK))
+            lines = f.read().splitlines()
+        for line in reversed(lines):
+            try:
+                return json.loads(line.decode('utf-8'))["seq"]
+            except (ValueError, KeyError, TypeError):
+                continue
+        return 0
+
+    def append(self, events):
+        """Hadisələri bir yazı ilə jurnalın sonuna əlavə et"""
+        text = "".join(json.dumps(event, ensure_ascii=False, default=to_json) + "\n"
+                       for event in events)
+        if self._fh is None:
+            self._fh = open(self.path, 'a', encoding='utf-8')
+        self._fh.write(text)
+        self._fh.flush()
+        if self.sync:
+            os.fsync(self._fh.fileno())
+
+    def offset_after(self, f, since):
+        """seq-i since-dən böyük olan ilk sətrin ofseti (ikili axtarış)"""
+        # lo-dan əvvəl başlayan sətirlərin hamısı since-ə qədərdir; hi-dən sonrakı ilk
+        # sətir ya since-dən böyükdür, ya da faylın sonudur
+        lo, hi = 0, os.fstat(f.fileno()).st_size
+        while lo < hi:
+            mid = (lo + hi) // 2
+            f.seek(mid - 1 if mid else 0)
+            if mid:
+                f.readline()
+            start = f.tell()
+            line = f.readline()
+            if start >= hi or not line.endswith(b"\n") or self.parse(line)["seq"] > since:
+                hi = mid
+            else:
+                lo = start + len(line)
+        return lo
+
+    @staticmethod
+    def parse(line):
+        return json.loads(line.decode('utf-8'))
+
+    def read(self, since=0, limit=None):
+        """seq-i since-dən böyük olan (ən çox limit) hadisələr"""
+        events, _ = self.read_from(since, None, limit)
+        return events
+
+    def read_from(self, since, offset, limit=None):
+        """Hadisələr və növbəti oxunuşun ofseti; offset None-dırsa since ilə axtarılır"""
+        events = []
+        try:
+            f = open(self.path, 'rb')
+        except FileNotFoundError:
+            return events, offset
+        with f:
+            if offset is None or offset > os.fstat(f.fileno()).st_size:
+                offset = self.offset_after(f, since)
+            f.seek(offset)
+            for line in f:
+                # Yazılmaqda olan yarımçıq sətir növbəti oxunuşa qalır
+                if not line.endswith(b"\n") or (limit is not None and len(events) >= limit):
+                    break
+                offset += len(line)
+                event = self.parse(line)
+                if event["seq"] > since:
+                    events.append(event)
+        return events, offset
+
+    def follow(self, since=0, poll=0.5, stop=None):
+        """since-dən sonrakı hadisələri, sonra yeni yazılanları gözləyərək ver (tail -f)"""
+        stop = stop or threading.Event()
+        offset = None
+        while not stop.is_set():
+            events, offset = self.read_from(since, offset)
+            for event in events:
+                since = event["seq"]
+                yield event
+            if not events:
+                stop.wait(poll)
+
+    def close(self):
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+
+
+class ChangeFeed:
+    """Dəyişiklik hadisələri: ardıcıllıq nömrəsi, abunəçilər və (varsa) davamlı jurnal"""
+
+    def __init__(self, log=None):
+        self.log = log
+        self.seq = log.recover() if log is not None else 0
+        self.subscribers = []
+        self.lock = threading.RLock()
+
+    def subscribe(self, callback, since=None):
+        """callback(event) hər yeni hadisə üçün; since verilsə əvvəlcə jurnaldakı qalanlar"""
+        with self.lock:
+            if since is not None:
+                for event in self.since(since):
+                    callback(event)
+            self.subscribers.append(callback)
+        return lambda: self.unsubscribe(callback)
+
+    def unsubscribe(self, callback):
+        with self.lock:
+            if callback in self.subscribers:
+                self.subscribers.remove(callback)
+
+    def publish(self, changes, now=None):
+        """(növ, məlumat) cütlərinə seq ver, jurnala yaz və abunəçilərə çatdır"""
+        if not changes:
+            return []
+        stamp = (now or datetime.now()).isoformat(timespec="seconds")
+        with self.lock:
+            events = []
+            for kind, data in changes:
+                self.seq += 1
+                events.append({"seq": self.seq, "type": kind, "time": stamp, **data})
+            if self.log is not None:
+                with METRICS.timer("events.append"):
+                    self.log.append(events)
+            METRICS.count("events.published", len(events))
+            # Abunəçilər seq sırası ilə, izləyicinin kilidi altında çağırılır: uzun iş
+            # görməməli, lazım olduqda hadisəni öz növbəsinə qoymalıdır
+            for event in events:
+                for callback in list(self.subscribers):
+                    try:
+                        callback(event)
+                    except Exception:
+                        METRICS.count("events.subscriber_errors")
+        return events
+
+    def since(self, seq, limit=None):
+        """seq-dən sonrakı hadisələr jurnaldan"""
+        return self.log.read(seq, limit) if self.log is not None else []
+
+    def close(self):
+        if self.log is not None:
+            self.log.close()
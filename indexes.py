@@ -0,0 +1,253 @@
+import threading
+
+from analytics import Columns
+from deadlines import DeadlineIndex
+from intervals import IntervalIndex
+from models import COMPLETED
+from search import SearchIndex
+
+TEXT_FIELDS = ("title", "description", "notes")
+
+
+def compute_stats(homeworks):
+    """Tamamlama saylarını bütün tapşırıqları keçərək hesabla"""
+    stats = CompletionStats()
+    for hw in homeworks:
+        stats.add(hw)
+    return stats.snapshot()
+
+
+class CompletionStats:
+    """Əlavə, tamamlama və silmə ilə artımlı yenilənən tamamlama sayğacları"""
+
+    def __init__(self):
+        self.total = 0
+        self.completed = 0
+        self.groups = {"subjects": {}, "priorities": {}}
+
+    def add(self, hw, sign=1):
+        """Tapşırığı sayğaclara əlavə et (sign=-1 ilə çıxar)"""
+        done = sign if hw["status"] == COMPLETED else 0
+        self.total += sign
+        self.completed += done
+        for key, value in (("subjects", hw["subject"]), ("priorities", hw["priority"])):
+            bucket = self.groups[key].setdefault(value, {"total": 0, "completed": 0})
+            bucket["total"] += sign
+            bucket["completed"] += done
+
+    def remove(self, hw):
+        """Tapşırığı sayğaclardan çıxar"""
+        self.add(hw, sign=-1)
+        self.prune(hw)
+
+    def prune(self, hw):
+        """Tapşırığın boş qalmış qruplarını sil"""
+        for key, value in (("subjects", hw["subject"]), ("priorities", hw["priority"])):
+            bucket = self.groups[key].get(value)
+            if bucket is not None and not bucket["total"]:
+                del self.groups[key][value]
+
+    def snapshot(self):
+        """Hesabat üçün sayğacların surəti"""
+        return {
+            "total": self.total,
+            "completed": self.completed,
+            "subjects": {k: dict(v) for k, v in self.groups["subjects"].items()},
+            "priorities": {k: dict(v) for k, v in self.groups["priorities"].items()},
+        }
+
+
+class HomeworkIndex:
+    """Tapşırıqlar və sessiyalar üçün yaddaşda saxlanan ikinci dərəcəli indekslər"""
+
+    BUCKET_FIELDS = ("status", "priority", "subject")
+
+    # Təxirə salınmış qurulmada ilk müraciətə qədər olmayan atributlar
+    LAZY = ("by_id", "sessions_by_homework", "day_order", "intervals", "buckets", "stats",
+            "deadlines")
+
+    def __init__(self):
+        self._source = None
+        self._build_lock = threading.Lock()
+        self._text = None
+        self._columns = None
+        self._reset()
+
+    def _reset(self):
+        self.by_id = {}
+        self.sessions_by_homework = {}
+        self.day_order = {}
+        self.intervals = IntervalIndex()
+        self.buckets = {field: {} for field in self.BUCKET_FIELDS}
+        self.stats = CompletionStats()
+        self.deadlines = DeadlineIndex()
+
+    def rebuild(self, homeworks, schedule):
+        """İndeksləri bütöv məlumatdan ilk müraciətdə yenidən qur"""
+        self.__init__()
+        # Surət saxlanılır ki, qurulmadan əvvəl siyahıya əlavə olunanlar iki dəfə sayılmasın
+        self._source = (list(homeworks),
+                        {day: list(sessions) for day, sessions in schedule.items()})
+        for name in self.LAZY:
+            del self.__dict__[name]
+
+    def __getattr__(self, name):
+        # Yalnız olmayan atributlar üçün çağırılır, yəni qurulma hələ təxirə salınıbsa
+        if name not in self.LAZY:
+            raise AttributeError(name)
+        with self._build_lock:
+            if self._source is not None:
+                # Başqa axın yarımçıq indeksi görməsin deyə ayrıca obyektdə qurulur
+                fresh = HomeworkIndex()
+                homeworks, schedule = self._source
+                for hw in homeworks:
+                    fresh.add_homework(hw)
+                for day, sessions in schedule.items():
+                    for session in sessions:
+                        fresh.add_session(day, session)
+                self.__dict__.update((key, fresh.__dict__[key]) for key in self.LAZY)
+                self._source = None
+        return self.__dict__[name]
+
+    @property
+    def built(self):
+        return self._source is None
+
+    def warm(self):
+        """Təxirə salınmış qurulmanı indi apar (fon axını üçün)"""
+        return self.by_id
+
+    def add_homework(self, hw):
+        """Yeni tapşırığı bütün indekslərə əlavə et"""
+        self.by_id[hw["id"]] = hw
+        for field in self.BUCKET_FIELDS:
+            self.buckets[field].setdefault(hw[field], {})[hw["id"]] = hw
+        self.stats.add(hw)
+        self.deadlines.add(hw)
+        if self._text is not None:
+            self._text.add(hw)
+        if self._columns is not None:
+            self._columns.add(hw)
+
+    def remove_homework(self, hw):
+        """Tapşırığı bütün indekslərdən çıxar"""
+        del self.by_id[hw["id"]]
+        for field in self.BUCKET_FIELDS:
+            self._discard(field, hw[field], hw["id"])
+        self.stats.remove(hw)
+        self.deadlines.remove(hw)
+        if self._text is not None:
+            self._text.remove(hw["id"])
+        if self._columns is not None:
+            self._columns.remove(hw["id"])
+
+    def update_homework(self, hw, **changes):
+        """Tapşırığın sahələrini dəyiş və müvafiq qrupları yenilə"""
+        old = dict(hw)
+        self.stats.add(hw, sign=-1)
+        self.deadlines.remove(hw)
+        for field, value in changes.items():
+            if field in self.buckets:
+                self._discard(field, hw[field], hw["id"])
+                self.buckets[field].setdefault(value, {})[hw["id"]] = hw
+            hw[field] = value
+        self.stats.add(hw)
+        self.stats.prune(old)
+        self.deadlines.add(hw)
+        if self._text is not None and not changes.keys().isdisjoint(TEXT_FIELDS):
+            self._text.update(hw)
+        if self._columns is not None:
+            self._columns.update(hw)
+
+    def get(self, hw_id):
+        """ID-yə görə tapşırıq"""
+        return self.by_id.get(hw_id)
+
+    def select(self, status=None, priority=None, subject=None):
+        """Qrupların kəsişməsindən süzülmüş tapşırıqları ID sırası ilə qaytar"""
+        wanted = [(field, value) for field, value in
+                  (("status", status), ("priority", priority), ("subject", subject))
+                  if value is not None]
+        if not wanted:
+            candidates = self.by_id
+        else:
+            buckets = sorted((self.buckets[field].get(value, {}) for field, value in wanted),
+                             key=len)
+            candidates = buckets[0]
+            if len(buckets) > 1:
+                candidates = {hw_id: hw for hw_id, hw in candidates.items()
+                              if all(hw_id in other for other in buckets[1:])}
+        return [candidates[hw_id] for hw_id in sorted(candidates)]
+
+    @property
+    def text(self):
+        """Mətn axtarışı indeksi; ilk axtarışda qurulur, sonra artımlı yenilənir"""
+        if self._text is None:
+            self._text = SearchIndex()
+            for hw in self.by_id.values():
+                self._text.add(hw)
+        return self._text
+
+    @property
+    def columns(self):
+        """Analitika üçün sütunlu görünüş; ilk sorğuda qurulur, sonra artımlı yenilənir"""
+        if self._columns is None:
+            self._columns = Columns(self.by_id.values())
+        return self._columns
+
+    def search(self, query, status=None, priority=None, subject=None, limit=20):
+        """Mətn sorğusuna uyğun tapşırıqlar bala görə, süzgəclərlə birlikdə"""
+        allowed = None
+        for field, value in (("status", status), ("priority", priority), ("subject", subject)):
+            if value is None:
+                continue
+            bucket = self.buckets[field].get(value, {})
+            allowed = bucket.keys() if allowed is None else allowed & bucket.keys()
+        if allowed is not None and not allowed:
+            return []
+        return [self.by_id[hw_id] for hw_id, _ in self.text.search(query, limit, allowed)]
+
+    def count(self, field, value):
+        """Qrupdakı tapşırıqların sayı"""
+        return len(self.buckets[field].get(value, ()))
+
+    def add_session(self, day, session):
+        """Sessiyanı aralıq indeksinə, tapşırığa bağlıdırsa tapşırıq indeksinə əlavə et"""
+        self.day_order.pop(day, None)
+        self.intervals.add(day, session)
+        hw_id = session.get("homework_id")
+        if hw_id is not None:
+            self.sessions_by_homework.setdefault(hw_id, []).append((day, session))
+
+    def remove_session(self, day, session):
+        """Sessiyanı indeksdən çıxar"""
+        self.day_order.pop(day, None)
+        self.intervals.remove(day, session)
+        hw_id = session.get("homework_id")
+        sessions = self.sessions_by_homework.get(hw_id)
+        if not sessions:
+            return
+        for i, (_, other) in enumerate(sessions):
+            if other is session:
+                sessions.pop(i)
+                break
+        if not sessions:
+            del self.sessions_by_homework[hw_id]
+
+    def sorted_sessions(self, day, sessions):
+        """Günün sessiyaları başlama vaxtına görə; sıra gün dəyişənə qədər yadda qalır"""
+        order = self.day_order.get(day)
+        if order is None:
+            order = self.day_order[day] = sorted(sessions, key=lambda s: s["start"])
+        return order
+
+    def sessions_for(self, hw_id):
+        """Tapşırığa bağlı (gün, sessiya) cütləri"""
+        return list(self.sessions_by_homework.get(hw_id, ()))
+
+    def _discard(self, field, value, hw_id):
+        bucket = self.buckets[field].get(value)
+        if bucket is not None:
+            bucket.pop(hw_id, None)
+            if not bucket:
+                del self.buckets[field][value]
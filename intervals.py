@@ -0,0 +1,128 @@
+from bisect import bisect_left, bisect_right
+
+from scheduler import WEEKDAYS, parse_clock
+
+DAY_START = 8 * 60
+DAY_END = 22 * 60
+
+
+def clock_minutes(value):
+    """SS:DD vaxtını gün başlanğıcından dəqiqəyə çevir (səhvdirsə None)"""
+    clock = parse_clock(value)
+    return None if clock is None else clock[0] * 60 + clock[1]
+
+
+def format_minutes(minutes):
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def session_interval(session):
+    """Sessiyanın [başlanğıc, son) dəqiqə aralığı; vaxt səhvdirsə və ya son əvvəldirsə None"""
+    start = clock_minutes(session.get("start"))
+    end = clock_minutes(session.get("end"))
+    if start is None or end is None or end <= start:
+        return None
+    return start, end
+
+
+def estimated_minutes(value, default=60):
+    """Təxmini vaxtı (saat, məs. "1.5") dəqiqəyə çevir"""
+    try:
+        minutes = round(float(str(value).replace(",", ".")) * 60)
+    except (TypeError, ValueError):
+        return default
+    return minutes if minutes > 0 else default
+
+
+class DayIntervals:
+    """Bir günün sessiyaları başlanğıca görə sıralı aralıqlar kimi"""
+
+    def __init__(self):
+        self.starts = []
+        self.items = []
+        self.longest = 0
+
+    def add(self, start, end, session):
+        i = bisect_right(self.starts, start)
+        self.starts.insert(i, start)
+        self.items.insert(i, (start, end, session))
+        self.longest = max(self.longest, end - start)
+
+    def remove(self, session):
+        for i, (_, _, other) in enumerate(self.items):
+            if other is session:
+                del self.starts[i]
+                del self.items[i]
+                return
+
+    def overlapping(self, start, end):
+        """[start, end) ilə kəsişən aralıqlar"""
+        # Ən uzun aralıqdan daha əvvəl başlayanlar bu aralığa çata bilməz
+        lo = bisect_left(self.starts, start - self.longest)
+        hi = bisect_left(self.starts, end)
+        return [item for item in self.items[lo:hi] if item[1] > start]
+
+    def gaps(self, day_start=DAY_START, day_end=DAY_END):
+        """[day_start, day_end) daxilində boş aralıqlar"""
+        gaps = []
+        cursor = day_start
+        for start, end, _ in self.items:
+            if start >= day_end:
+                break
+            if start > cursor:
+                gaps.append((cursor, start))
+            cursor = max(cursor, end)
+        if cursor < day_end:
+            gaps.append((cursor, day_end))
+        return gaps
+
+
+class IntervalIndex:
+    """Həftə günləri üzrə sessiya aralıqları: toqquşmalar və boş vaxt axtarışı"""
+
+    def __init__(self):
+        self.days = {}
+        self.invalid = []
+        # Hər dəyişiklikdə artır; boş vaxtdan asılı keşlər bununla yoxlanılır
+        self.version = 0
+
+    def add(self, day, session):
+        self.version += 1
+        interval = session_interval(session)
+        if interval is None:
+            self.invalid.append((day, session))
+            return
+        self.days.setdefault(day, DayIntervals()).add(interval[0], interval[1], session)
+
+    def remove(self, day, session):
+        self.version += 1
+        for i, (_, other) in enumerate(self.invalid):
+            if other is session:
+                del self.invalid[i]
+                return
+        if day in self.days:
+            self.days[day].remove(session)
+
+    def conflicts(self, day, start, end):
+        """Günün [start, end) dəqiqə aralığı ilə üst-üstə düşən sessiyalar"""
+        intervals = self.days.get(day)
+        if intervals is None:
+            return []
+        return [session for _, _, session in intervals.overlapping(start, end)]
+
+    def free_slots(self, minutes, start_day=None, after=None, day_start=DAY_START,
+                   day_end=DAY_END, limit=5):
+        """Həftə boyu minutes dəqiqəyə sığan ən erkən boş aralıqlar: (gün, başlanğıc, son)"""
+        # Axtarış start_day-dən başlayır; həmin gündə after dəqiqəsindən əvvəlki vaxt keçilir
+        first = WEEKDAYS.index(start_day) if start_day in WEEKDAYS else 0
+        slots = []
+        for offset in range(len(WEEKDAYS)):
+            day = WEEKDAYS[(first + offset) % len(WEEKDAYS)]
+            lower = max(day_start, after) if offset == 0 and after is not None else day_start
+            intervals = self.days.get(day) or DayIntervals()
+            for gap_start, gap_end in intervals.gaps(lower, day_end):
+                if gap_end - gap_start >= minutes:
+                    slots.append((day, gap_start, gap_start + minutes))
+                    if len(slots) == limit:
+                        return slots
+        return slots
@@ -0,0 +1,173 @@
+import io
+import json
+import os
+
+from records import to_json
+
+
+class Journal:
+    """Yalnız əlavə olunan dəyişiklik jurnalı və sıxılmış snapşot"""
+
+    def __init__(self, path, snapshot_path, compaction_threshold=200, sync=True):
+        self.path = path
+        self.snapshot_path = snapshot_path
+        self.compaction_threshold = compaction_threshold
+        self.sync = sync
+        self.seq = 0
+        self.pending = 0
+        self.bytes_written = 0
+        self._fh = None
+        # Yazısı alınmamış əlavədən əvvəlki fayl ölçüsü: növbəti əlavə oradan başlayır
+        self.torn = None
+
+    def load(self):
+        """Snapşotu və ondan sonrakı jurnal qeydlərini oxu"""
+        snapshot = None
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, 'r', encoding='utf-8') as f:
+                snapshot = json.load(f)
+        base_seq = snapshot["seq"] if snapshot else 0
+
+        ops = []
+        last_seq = base_seq
+        if os.path.exists(self.path):
+            good_offset = 0
+            with open(self.path, 'rb') as f:
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break
+                    try:
+                        record = json.loads(line.decode('utf-8'))
+                    except ValueError:
+                        break
+                    good_offset += len(line)
+                    if record["seq"] <= base_seq:
+                        continue
+                    ops.append(record)
+                    last_seq = record["seq"]
+            if good_offset < os.path.getsize(self.path):
+                # Yarımçıq yazılmış son sətri kəs
+                with open(self.path, 'r+b') as f:
+                    f.truncate(good_offset)
+
+        self.seq = last_seq
+        self.pending = len(ops)
+        return snapshot, ops
+
+    def append(self, op):
+        """Dəyişikliyi jurnalın sonuna yaz"""
+        return self.append_many([op])[0]
+
+    def append_many(self, ops):
+        """Bir neçə dəyişikliyi bir yazı və bir fsync ilə əlavə et"""
+        records, text = self.encode(ops)
+        self.write(text, len(records))
+        return records
+
+    def encode(self, ops):
+        """Qeydlərə ardıcıllıq nömrəsi ver və jurnal sətirlərinə çevir"""
+        records = []
+        for op in ops:
+            self.seq += 1
+            records.append(dict(op, seq=self.seq))
+        return records, "".join(json.dumps(record, ensure_ascii=False, default=to_json) + "\n"
+                                for record in records)
+
+    def write(self, text, count):
+        """Hazırlanmış sətirləri jurnalın sonuna yaz; alınmasa yarımçıq sətirləri kəs"""
+        if self._fh is None:
+            # Buferi olmayan fayl: bağlananda yazılmamış qalıq sonradan diskə düşmür
+            self._fh = open(self.path, 'ab', buffering=0)
+        if self.torn is not None:
+            self._fh.truncate(self.torn)
+            self.torn = None
+        data = text.encode('utf-8')
+        start = os.fstat(self._fh.fileno()).st_size
+        try:
+            view = memoryview(data)
+            while view:
+                view = view[self._fh.write(view):]
+            if self.sync:
+                os.fsync(self._fh.fileno())
+        except BaseException:
+            # Yarımçıq sətir qalsa növbəti əlavə ona yapışar və yükləmə hər ikisini atardı
+            self.torn = start
+            try:
+                self._fh.truncate(start)
+                self.torn = None
+            except OSError:
+                pass
+            raise
+        self.bytes_written += len(data)
+        self.pending += count
+
+    def needs_compaction(self, extra=0):
+        """Jurnal (əlavə olunacaq extra qeydlə) sıxılma həddinə çatıbmı"""
+        return self.pending + extra >= self.compaction_threshold
+
+    def compact(self, homeworks, schedule, meta=None):
+        """Cari vəziyyəti atomik snapşota yaz və jurnalı təmizlə"""
+        self.install_snapshot(self.render_snapshot(homeworks, schedule, meta))
+
+    def render_snapshot(self, homeworks, schedule, meta=None):
+        """Cari vəziyyəti və son seq nömrəsini snapşot mətninə çevir"""
+        return render_json({"seq": self.seq, "homeworks": homeworks, "schedule": schedule,
+                            "meta": meta or {}})
+
+    def install_snapshot(self, text):
+        """Hazırlanmış snapşotu atomik yaz və jurnalı təmizlə"""
+        self.bytes_written += atomic_write_text(self.snapshot_path, text, sync=self.sync)
+
+        # Snapşot yerindədir; köhnə qeydlər seq ilə süzüldüyü üçün bu addım
+        # yarıda qalsa belə təkrar tətbiq olunmayacaq
+        self.close()
+        with open(self.path, 'w', encoding='utf-8') as f:
+            if self.sync:
+                os.fsync(f.fileno())
+        self.pending = 0
+
+    def close(self):
+        """Jurnal faylını bağla"""
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+
+
+def render_json(data, indent=None):
+    """Məlumatı (qeydlər daxil) JSON mətninə çevir"""
+    buffer = io.StringIO()
+    json.dump(data, buffer, ensure_ascii=False, indent=indent, default=to_json)
+    return buffer.getvalue()
+
+
+def atomic_write_text(path, text, sync=True):
+    """Mətni müvəqqəti fayla yaz, fsync et, atomik şəkildə əvəz et, baytları qaytar"""
+    return _atomic_write(path, text, 'w', sync)
+
+
+def atomic_write_bytes(path, data, sync=True):
+    """Baytları müvəqqəti fayla yaz, fsync et, atomik şəkildə əvəz et"""
+    return _atomic_write(path, data, 'wb', sync)
+
+
+def _atomic_write(path, data, mode, sync):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, mode, encoding=None if 'b' in mode else 'utf-8') as f:
+        f.write(data)
+        f.flush()
+        size = f.tell()
+        if sync:
+            os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    if sync and hasattr(os, "O_DIRECTORY"):
+        dir_fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+    return size
+
+
+def atomic_write_json(path, data, sync=True, indent=None):
+    """JSON-u müvəqqəti fayla yaz, atomik şəkildə əvəz et, yazılmış baytları qaytar"""
+    return atomic_write_text(path, render_json(data, indent), sync)
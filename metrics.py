@@ -0,0 +1,197 @@
+import functools
+import json
+import threading
+import time
+from bisect import bisect_left
+
+TIME_BOUNDS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0)
+SIZE_BOUNDS = tuple(4 ** i for i in range(16))
+
+
+class Histogram:
+    """Sabit sərhədli qutularla say, cəm, min və maks"""
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.buckets = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+
+    def observe(self, value):
+        """Dəyəri uyğun qutuya əlavə et"""
+        self.buckets[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def quantile(self, q):
+        """q kvantilinin yuxarı sərhədi (son qutu üçün maks)"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if n and seen >= rank:
+                return self.bounds[i] if i < len(self.bounds) else self.max
+        return self.max
+
+    def snapshot(self):
+        """JSON-a yazıla bilən surət"""
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "min": self.min,
+            "max": self.max,
+            "mean": self.total / self.count if self.count else None,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "buckets": {("+inf" if i == len(self.bounds) else str(self.bounds[i])): n
+                        for i, n in enumerate(self.buckets) if n},
+        }
+
+
+class NullTimer:
+    """Ölçmə söndürüləndə istifadə olunan boş kontekst"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+NULL_TIMER = NullTimer()
+
+
+class Timer:
+    """Blokun müddətini ölçüb reyestrə yazan kontekst"""
+
+    def __init__(self, metrics, name):
+        self.metrics = metrics
+        self.name = name
+        self.start = None
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.metrics.observe(self.name, time.perf_counter() - self.start, "seconds")
+        if exc_type is not None:
+            self.metrics.count(self.name + ".errors")
+        return False
+
+
+class Metrics:
+    """Müddət və say histoqramları, sayğaclar və qoşula bilən hook-lar"""
+
+    def __init__(self):
+        self.enabled = False
+        self.hooks = []
+        self.lock = threading.Lock()
+        self.histograms = {}
+        self.counters = {}
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def add_hook(self, hook):
+        """hook(name, value, unit) hər ölçmədə çağırılır; ölçməni aktiv edir"""
+        self.hooks.append(hook)
+        self.enabled = True
+        return hook
+
+    def remove_hook(self, hook):
+        self.hooks.remove(hook)
+
+    def timer(self, name):
+        """Blokun müddətini ölç; söndürüləndə heç nə etmir"""
+        if not self.enabled:
+            return NULL_TIMER
+        return Timer(self, name)
+
+    def observe(self, name, value, unit="count"):
+        """Dəyəri histoqrama yaz və hook-lara ötür"""
+        if not self.enabled:
+            return
+        with self.lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = Histogram(TIME_BOUNDS if unit == "seconds" else SIZE_BOUNDS)
+                self.histograms[name] = histogram
+            histogram.unit = unit
+            histogram.observe(value)
+        for hook in self.hooks:
+            hook(name, value, unit)
+
+    def count(self, name, n=1):
+        """Sayğacı artır"""
+        if not self.enabled:
+            return
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+        for hook in self.hooks:
+            hook(name, n, "increment")
+
+    def reset(self):
+        """Toplanmış ölçmələri sil"""
+        with self.lock:
+            self.histograms.clear()
+            self.counters.clear()
+
+    def snapshot(self):
+        """Bütün ölçmələrin JSON-a yazıla bilən surəti"""
+        with self.lock:
+            return {
+                "histograms": {name: dict(h.snapshot(), unit=h.unit)
+                               for name, h in sorted(self.histograms.items())},
+                "counters": dict(sorted(self.counters.items())),
+            }
+
+    def dump(self, fmt="text"):
+        """Ölçmələri mətn və ya JSON kimi qaytar"""
+        snapshot = self.snapshot()
+        if fmt == "json":
+            return json.dumps(snapshot, ensure_ascii=False, indent=2)
+        lines = ["📈 ÖLÇMƏLƏR"]
+        for name, h in snapshot["histograms"].items():
+            if h["unit"] == "seconds":
+                lines.append(f"{name:<32} n={h['count']:<6} orta={h['mean'] * 1000:9.2f} ms "
+                             f"p95≤{h['p95'] * 1000:9.2f} ms maks={h['max'] * 1000:9.2f} ms")
+            else:
+                lines.append(f"{name:<32} n={h['count']:<6} cəm={h['sum']:<12} "
+                             f"orta={h['mean']:.1f} maks={h['max']} ({h['unit']})")
+        for name, value in snapshot["counters"].items():
+            lines.append(f"{name:<32} {value}")
+        return "\n".join(lines)
+
+    def write(self, path):
+        """Ölçmələri fayla yaz; .json uzantısı JSON formatını seçir"""
+        fmt = "json" if path.endswith(".json") else "text"
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.dump(fmt) + "\n")
+
+
+METRICS = Metrics()
+
+
+def timed(name):
+    """Funksiya çağırışlarının müddətini METRICS-ə yazan dekorator"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not METRICS.enabled:
+                return func(*args, **kwargs)
+            with Timer(METRICS, name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
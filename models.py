@@ -0,0 +1,27 @@
+from enum import Enum
+
+PENDING = "Gözləmədə"
+COMPLETED = "Tamamlandı"
+STATUSES = (PENDING, COMPLETED)
+
+
+class Priority(Enum):
+    LOW = "Aşağı"
+    MEDIUM = "Orta"
+    HIGH = "Yüksək"
+    URGENT = "Təcili"
+
+class Subject(Enum):
+    MATH = "Riyaziyyat"
+    SCIENCE = "Elm"
+    HISTORY = "Tarix"
+    LANGUAGE = "Dil"
+    LITERATURE = "Ədəbiyyat"
+    PHYSICS = "Fizika"
+    CHEMISTRY = "Kimya"
+    BIOLOGY = "Biologiya"
+    GEOGRAPHY = "Coğrafiya"
+    ART = "İncəsənət"
+    MUSIC = "Musiqi"
+    SPORT = "İdman"
+    OTHER = "Digər"
@@ -0,0 +1,211 @@
+import json
+import queue
+import sys
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+from metrics import METRICS
+
+SINK_KINDS = ("console", "file", "webhook", "desktop")
+
+
+def reminder_event(day, session, when, tenant=None):
+    """Sessiya xatırlatması üçün hadisə; key eyni xatırlatmanın təkrarını tanıyır"""
+    event = {
+        "key": f"{tenant or ''}|{day}|{session.get('start')}|{session.get('subject')}|"
+               f"{when:%Y-%m-%d}",
+        "tenant": tenant,
+        "day": day,
+        "when": when.isoformat(timespec="minutes"),
+        "subject": session.get("subject"),
+        "start": session.get("start"),
+        "end": session.get("end"),
+    }
+    if "homework_title" in session:
+        event["homework_title"] = session["homework_title"]
+    return event
+
+
+def format_reminder(event, now=None):
+    """Konsol üçün xatırlatma bloku"""
+    lines = ["", "!" * 60, "🔔 XATIRLATMA!", f"Vaxtıdır: {event['subject']}"]
+    if event.get("homework_title"):
+        lines.append(f"Tapşırıq: {event['homework_title']}")
+    lines.append(f"Vaxt: {event['start']} - {event['end']}")
+    late = (now or datetime.now()) - datetime.fromisoformat(event["when"])
+    if late > timedelta(minutes=1):
+        lines.append(f"⌛ Gecikmiş xatırlatma ({int(late.total_seconds() // 60)} dəqiqə)")
+    lines.append("!" * 60 + "\n")
+    return "\n".join(lines)
+
+
+class ConsoleSink:
+    """Xatırlatmanı standart çıxışa bir yazı ilə çap et"""
+    name = "console"
+
+    def __init__(self, stream=None):
+        self.stream = stream
+        self.lock = threading.Lock()
+
+    def send(self, event):
+        stream = self.stream or sys.stdout
+        with self.lock:
+            stream.write(format_reminder(event) + "\n")
+            stream.flush()
+
+
+class FileSink:
+    """Hadisələri JSONL faylının sonuna əlavə et"""
+    name = "file"
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+
+    def send(self, event):
+        line = json.dumps(event, ensure_ascii=False) + "\n"
+        with self.lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(line)
+
+
+class WebhookSink:
+    """Hadisəni JSON kimi yerli HTTP ünvanına POST et"""
+    name = "webhook"
+
+    def __init__(self, url, timeout=5):
+        self.url = url
+        self.timeout = timeout
+
+    def send(self, event):
+        # urllib.request ağır modüldür; yalnız webhook istifadə olunanda yüklənir
+        import urllib.request
+        request = urllib.request.Request(
+            self.url, data=json.dumps(event, ensure_ascii=False).encode("utf-8"),
+            headers={"Content-Type": "application/json"}, method="POST")
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            response.read()
+
+
+class DesktopSink:
+    """Masaüstü bildirişinin əvəzedicisi: göndərilənləri yaddaşda saxlayır"""
+    name = "desktop"
+
+    def __init__(self, limit=100):
+        self.sent = []
+        self.limit = limit
+        self.lock = threading.Lock()
+
+    def send(self, event):
+        with self.lock:
+            self.sent.append((f"🔔 {event['subject']}", f"{event['start']} - {event['end']}"))
+            del self.sent[:-self.limit]
+
+
+def open_sink(spec):
+    """'console', 'file:PATH', 'webhook:URL' və ya 'desktop' spesifikasiyasından sink yarat"""
+    kind, _, arg = spec.partition(":")
+    if kind == "console":
+        return ConsoleSink()
+    if kind == "file" and arg:
+        return FileSink(arg)
+    if kind == "webhook" and arg:
+        return WebhookSink(arg)
+    if kind == "desktop":
+        return DesktopSink()
+    raise ValueError(f"Naməlum bildiriş kanalı: {spec}")
+
+
+class Dispatcher:
+    """Məhdud növbə və işçi axınları ilə hadisələri sinklərə paylayan göndərici"""
+
+    def __init__(self, sinks, workers=4, queue_size=1000, retries=3, backoff=0.5,
+                 dedupe_window=3600, dedupe_size=10000):
+        self.sinks = list(sinks)
+        self.queue = queue.Queue(queue_size)
+        self.retries = retries
+        self.backoff = backoff
+        self.dedupe_window = dedupe_window
+        self.dedupe_size = dedupe_size
+        self.recent = OrderedDict()
+        self.lock = threading.Lock()
+        self.stopping = threading.Event()
+        self.stats = {"submitted": 0, "duplicates": 0, "dropped": 0, "delivered": 0,
+                      "retried": 0, "failed": 0}
+        self.threads = [threading.Thread(target=self.work, name=f"notify-{i}", daemon=True)
+                        for i in range(workers)]
+        for thread in self.threads:
+            thread.start()
+
+    def _count(self, name):
+        with self.lock:
+            self.stats[name] += 1
+        METRICS.count(f"notifications.{name}")
+
+    def submit(self, event):
+        """Hadisəni növbəyə qoy; növbə dolu olub atılıbsa False (təkrar olunan hadisə qəbul sayılır)"""
+        now = time.time()
+        with self.lock:
+            seen = self.recent.get(event["key"])
+            if seen is not None and now - seen < self.dedupe_window:
+                self.stats["duplicates"] += 1
+                duplicate = True
+            else:
+                duplicate = False
+                self.recent[event["key"]] = now
+                self.recent.move_to_end(event["key"])
+                while len(self.recent) > self.dedupe_size:
+                    self.recent.popitem(last=False)
+        if duplicate:
+            METRICS.count("notifications.duplicates")
+            return True
+        try:
+            self.queue.put_nowait(dict(event, created=now))
+        except queue.Full:
+            with self.lock:
+                self.recent.pop(event["key"], None)
+            self._count("dropped")
+            return False
+        self._count("submitted")
+        return True
+
+    def work(self):
+        while True:
+            event = self.queue.get()
+            try:
+                if event is None:
+                    return
+                for sink in self.sinks:
+                    self.deliver(sink, event)
+            finally:
+                self.queue.task_done()
+
+    def deliver(self, sink, event):
+        """Sinkə göndər, uğursuzluqda eksponensial gözləmə ilə təkrarla"""
+        for attempt in range(self.retries + 1):
+            try:
+                with METRICS.timer(f"notifications.{sink.name}"):
+                    sink.send(event)
+                self._count("delivered")
+                return True
+            except Exception as exc:
+                if attempt == self.retries or self.stopping.is_set():
+                    self._count("failed")
+                    print(f"\n⚠️ Bildiriş göndərilmədi ({sink.name}): {exc}", file=sys.stderr)
+                    return False
+                self._count("retried")
+                self.stopping.wait(self.backoff * 2 ** attempt)
+
+    def drain(self):
+        """Növbədəki bütün hadisələr göndərilənə qədər gözlə"""
+        self.queue.join()
+
+    def close(self):
+        """Növbəni boşalt və işçi axınlarını dayandır"""
+        self.drain()
+        self.stopping.set()
+        for _ in self.threads:
+            self.queue.put(None)
+        for thread in self.threads:
+            thread.join()
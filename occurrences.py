@@ -0,0 +1,193 @@
+from bisect import bisect_right
+from collections import OrderedDict
+from datetime import date
+
+from deadlines import deadline_ordinal, format_ordinal
+from intervals import session_interval
+from metrics import METRICS
+from scheduler import WEEKDAYS
+
+# Təqvimə təsir edən hadisələr: şablon dəyişdikdə bütün günlər, tək təkrar dəyişdikdə
+# yalnız həmin gün yenidən açılır
+TEMPLATE_EVENTS = {"session.added", "session.removed", "session.completed",
+                   "homework.completed", "homework.deleted"}
+HOMEWORK_EVENTS = {"homework.added", "homework.completed", "homework.deleted",
+                   "homework.archived"}
+SESSION_COPY = ("subject", "start", "end", "homework_id", "homework_title")
+CALENDAR_FIELDS = ("date", "day", "start", "end", "subject", "key", "completed", "cancelled",
+                   "one_off", "homework_id", "homework_title")
+# Yaddaşda saxlanılan açılmış günlərin sayı (ən az istifadə olunan atılır)
+CACHE_DAYS = 120
+
+
+def occurrence_key(session, prefix=""):
+    """Təkrarın gün daxilində açarı: başlanğıc vaxtı və fənn"""
+    return f"{prefix}{session.get('start')}|{session.get('subject')}"
+
+
+def sort_key(occurrence):
+    # Vaxtı səhv olan təkrarlar sona düşür
+    interval = session_interval(occurrence)
+    return (interval is None, interval or ())
+
+
+def weekday_ordinal(day, today):
+    """day həftə gününün bu gün və ya ondan əvvəlki ən yaxın tarixi"""
+    d = date.fromordinal(today)
+    return today - (d.weekday() - WEEKDAYS.index(day)) % 7
+
+
+class Calendar:
+    """Həftəlik şablonu tarixli təkrarlara açan təqvim və keşlənmiş "bu gün" görünüşü"""
+
+    def __init__(self, get_schedule, get_overrides, due_on, max_days=CACHE_DAYS):
+        self.get_schedule = get_schedule
+        # get_overrides: {"GG.AA.İLİL": {açar: dəyişikliklər}} - tamamlama, ləğv, köçürmə
+        self.get_overrides = get_overrides
+        self.due_on = due_on
+        self.days = OrderedDict()
+        self.max_days = max_days
+        self.view = None
+
+    def invalidate(self, ordinal=None):
+        """Açılmış günləri (ordinal verilsə yalnız həmin günü) və bu gün görünüşünü at"""
+        if ordinal is None:
+            self.days.clear()
+            self.view = None
+            return
+        self.days.pop(ordinal, None)
+        if self.view is not None and self.view["ordinal"] == ordinal:
+            self.view = None
+
+    def on_change(self, kind, data):
+        """Dəyişiklik hadisəsinə görə yalnız təsirlənən keşləri at"""
+        if kind == "occurrence.updated" or (kind == "session.completed" and "date" in data):
+            # Tarixli tamamlama şablonu dəyişmir, yalnız həmin günə aiddir
+            self.invalidate(deadline_ordinal(data["date"]))
+        elif kind in TEMPLATE_EVENTS:
+            self.invalidate()
+        if kind in HOMEWORK_EVENTS and self.view is not None:
+            self.view["due"] = None
+
+    def day(self, ordinal):
+        """Günün təkrarları başlanğıca görə sıralı (ləğv edilənlər daxil)"""
+        occurrences = self.days.get(ordinal)
+        if occurrences is None:
+            occurrences = self.days[ordinal] = self.expand(ordinal)
+            if len(self.days) > self.max_days:
+                self.days.popitem(last=False)
+        else:
+            self.days.move_to_end(ordinal)
+        return occurrences
+
+    def expand(self, ordinal):
+        day = WEEKDAYS[date.fromordinal(ordinal).weekday()]
+        when = format_ordinal(ordinal)
+        overrides = self.get_overrides().get(when, {})
+        occurrences = []
+        seen = {}
+        for index, session in enumerate(self.get_schedule().get(day, ())):
+            key = occurrence_key(session)
+            # Eyni vaxtda eyni fənn təkrarlanırsa açarlar nömrələnir
+            seen[key] = seen.get(key, 0) + 1
+            if seen[key] > 1:
+                key = f"{key}#{seen[key]}"
+            occurrences.append(self.occurrence(when, day, key, index, session,
+                                               overrides.get(key, {})))
+        for key, override in overrides.items():
+            if override.get("one_off"):
+                occurrences.append(self.occurrence(when, day, key, None, override, override))
+        occurrences.sort(key=sort_key)
+        METRICS.count("calendar.days_expanded")
+        return occurrences
+
+    @staticmethod
+    def occurrence(when, day, key, index, session, override):
+        item = {"date": when, "day": day, "key": key, "index": index}
+        for field in SESSION_COPY:
+            if field in session:
+                item[field] = session[field]
+        for field in ("subject", "start", "end"):
+            if field in override:
+                item[field] = override[field]
+        # Şablondakı "completed" yalnız tapşırıq tamamlandıqda qalıcıdır
+        item["completed"] = bool(override.get("completed", session.get("completed", False)))
+        item["cancelled"] = bool(override.get("cancelled", False))
+        item["one_off"] = index is None
+        return item
+
+    def find(self, ordinal, key):
+        for occurrence in self.day(ordinal):
+            if occurrence["key"] == key:
+                return occurrence
+        return None
+
+    def occurrence_of(self, ordinal, index):
+        """Şablonun index-ci sessiyasının həmin tarixdəki təkrarı"""
+        for occurrence in self.day(ordinal):
+            if occurrence["index"] == index:
+                return occurrence
+        return None
+
+    def completed_on(self, ordinal, day, session):
+        """Şablon sessiyasının həmin tarixdəki təkrarı tamamlanıbmı"""
+        sessions = self.get_schedule().get(day, [])
+        for occurrence in self.day(ordinal):
+            index = occurrence["index"]
+            if index is not None and index < len(sessions) and sessions[index] is session:
+                return occurrence["completed"]
+        return bool(session.get("completed", False))
+
+    def between(self, start, end, include_cancelled=False):
+        """[start, end] tarixləri arasındakı təkrarlar (sıra nömrələri ilə), tarix sırası ilə"""
+        for ordinal in range(start, end + 1):
+            for occurrence in self.day(ordinal):
+                if include_cancelled or not occurrence["cancelled"]:
+                    yield occurrence
+
+    def today(self, now):
+        """Bu günün keşlənmiş görünüşü; gün dəyişdikdə və ya aid dəyişiklikdə yenilənir"""
+        ordinal = now.date().toordinal()
+        view = self.view
+        if view is None or view["ordinal"] != ordinal:
+            METRICS.count("calendar.today_rebuilds")
+            sessions = []
+            intervals = []
+            for occurrence in self.day(ordinal):
+                interval = session_interval(occurrence)
+                if not occurrence["cancelled"] and interval is not None:
+                    sessions.append(occurrence)
+                    intervals.append(interval)
+            view = self.view = {
+                "ordinal": ordinal,
+                "date": format_ordinal(ordinal),
+                "day": WEEKDAYS[now.weekday()],
+                "sessions": sessions,
+                "starts": [start for start, _ in intervals],
+                "ends": [end for _, end in intervals],
+                # Ən uzun sessiyadan daha əvvəl başlayanlar indi davam edə bilməz
+                "longest": max((end - start for start, end in intervals), default=0),
+                "due": None,
+            }
+        if view["due"] is None:
+            view["due"] = self.due_on(view["date"])
+        return view
+
+    def check_in(self, now):
+        """Bu gün son tarixli tapşırıqlar, davam edən və növbəti sessiyalar"""
+        view = self.today(now)
+        minute = now.hour * 60 + now.minute
+        starts = view["starts"]
+        hi = bisect_right(starts, minute)
+        lo = bisect_right(starts, minute - view["longest"] - 1)
+        current = [view["sessions"][i] for i in range(lo, hi) if view["ends"][i] >= minute]
+        upcoming = view["sessions"][hi] if hi < len(starts) and not current else None
+        return {
+            "date": view["date"],
+            "time": now.strftime("%H:%M"),
+            "day": view["day"],
+            "due_today": list(view["due"]),
+            "has_sessions": bool(view["sessions"]),
+            "current": current,
+            "next": upcoming,
+        }
@@ -0,0 +1,68 @@
+import sys
+import threading
+import time
+
+
+class WriteBehind:
+    """Dəyişiklikləri fon axınında, window saniyəlik pəncərədə birləşdirərək yazan köməkçi"""
+
+    def __init__(self, write, window=0.5):
+        self.write = write
+        self.window = window
+        self.cond = threading.Condition()
+        self.dirty = False
+        self.running = True
+        self.writes = 0
+        self.failures = 0
+        self.thread = threading.Thread(target=self.run, name="write-behind", daemon=True)
+        self.thread.start()
+
+    def mark(self):
+        """Yazılmamış dəyişiklik var; pəncərə bitəndə yazılacaq"""
+        with self.cond:
+            self.dirty = True
+            self.cond.notify()
+
+    def run(self):
+        while True:
+            with self.cond:
+                while self.running and not self.dirty:
+                    self.cond.wait()
+                if not self.running:
+                    return
+            # Pəncərə ərzində gələn dəyişikliklər eyni yazıya düşür
+            deadline = time.monotonic() + self.window
+            with self.cond:
+                while self.running and time.monotonic() < deadline:
+                    self.cond.wait(deadline - time.monotonic())
+                self.dirty = False
+            self.write_now()
+
+    def write_now(self):
+        try:
+            self.write()
+            self.writes += 1
+        except Exception as exc:
+            self.failures += 1
+            print(f"\n⚠️ Fon yazısı alınmadı: {exc}", file=sys.stderr)
+            # Yazılmamış dəyişikliklər növbəyə qaytarılıb; növbəti pəncərədə yenidən cəhd et
+            self.mark()
+
+    def flush(self):
+        """Gözləyən dəyişiklikləri çağıran axında dərhal yaz"""
+        with self.cond:
+            self.dirty = False
+        try:
+            self.write()
+        except Exception:
+            self.mark()
+            raise
+
+    def stop(self):
+        """Axını dayandır və qalan dəyişiklikləri yaz"""
+        with self.cond:
+            self.running = False
+            self.cond.notify()
+        if self.thread is not threading.current_thread():
+            self.thread.join()
+        self.flush()
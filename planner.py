@@ -0,0 +1,161 @@
+from datetime import date
+
+from deadlines import format_ordinal
+from intervals import DAY_END, DAY_START, estimated_minutes, format_minutes
+from models import PENDING, Priority
+from scheduler import WEEKDAYS
+
+PRIORITY_RANK = {Priority.URGENT.value: 3, Priority.HIGH.value: 2, Priority.MEDIUM.value: 1,
+                 Priority.LOW.value: 0}
+# Prioritet son tarixi bu qədər gün "yaxınlaşdırır" (EDF sırasında irəli çəkir)
+PRIORITY_LEAD = {Priority.URGENT.value: 2, Priority.HIGH.value: 1}
+MAX_CHUNK = 90
+MIN_CHUNK = 30
+HORIZON_DAYS = 28
+TIME_STEP = 15
+PLAN_FIELDS = ("date", "day", "start", "end", "subject", "homework_id", "homework_title")
+
+
+def plan_tasks(index):
+    """Planlaşdırılacaq tapşırıqlar (sıra açarı ilə) və plandan kənar qalanlar"""
+    tasks = []
+    skipped = []
+    for ordinal, hw_id in index.deadlines.by_status.get(PENDING, ()):
+        # Cədvəldə artıq sessiyası olan tapşırıq üçün vaxt ayrılıb
+        if index.sessions_by_homework.get(hw_id):
+            continue
+        hw = index.get(hw_id)
+        key = (ordinal - PRIORITY_LEAD.get(hw["priority"], 0),
+               -PRIORITY_RANK.get(hw["priority"], 0), ordinal, hw_id)
+        tasks.append((key, estimated_minutes(hw["estimated_time"])))
+    for hw_id in index.deadlines.invalid_ids(PENDING):
+        skipped.append((hw_id, "tanınmayan tarix"))
+    tasks.sort()
+    return tasks, skipped
+
+
+class StudyPlanner:
+    """Gözləmədə olan tapşırıqları prioritet çəkili EDF ilə boş vaxtlara bölən planlayıcı"""
+
+    def __init__(self, max_chunk=MAX_CHUNK, min_chunk=MIN_CHUNK, horizon_days=HORIZON_DAYS):
+        self.max_chunk = max_chunk
+        self.min_chunk = min_chunk
+        self.horizon_days = horizon_days
+        self.source = None
+        self.slots_key = None
+        self.slots = []
+        self.tasks = []
+        # states[i] i-ci tapşırıqdan əvvəl hər boş aralığın dolu olduğu dəqiqədir
+        self.states = [[]]
+        self.placed = []
+        self.replanned = 0
+
+    def build_slots(self, intervals, today, after):
+        """Bu gündən üfüqə qədər (sıra nömrəsi, başlanğıc, son) boş aralıqları"""
+        gaps = {}
+        slots = []
+        for ordinal in range(today, today + self.horizon_days):
+            day = WEEKDAYS[date.fromordinal(ordinal).weekday()]
+            if ordinal == today:
+                lower = max(DAY_START, after)
+                day_intervals = intervals.days.get(day)
+                day_gaps = day_intervals.gaps(lower, DAY_END) if day_intervals else (
+                    [(lower, DAY_END)] if lower < DAY_END else [])
+            else:
+                if day not in gaps:
+                    day_intervals = intervals.days.get(day)
+                    gaps[day] = (day_intervals.gaps() if day_intervals
+                                 else [(DAY_START, DAY_END)])
+                day_gaps = gaps[day]
+            slots.extend((ordinal, start, end) for start, end in day_gaps)
+        return slots
+
+    def plan(self, tasks, intervals, today, minute):
+        """tasks üçün planı yenilə; yalnız ilk dəyişmiş tapşırıqdan sonrası yenidən qurulur"""
+        after = -(-minute // TIME_STEP) * TIME_STEP
+        slots_key = (today, after, intervals.version)
+        if intervals is not self.source or slots_key != self.slots_key:
+            self.source = intervals
+            self.slots_key = slots_key
+            self.slots = self.build_slots(intervals, today, after)
+            self.tasks = []
+            self.states = [[start for _, start, _ in self.slots]]
+            self.placed = []
+
+        first = 0
+        limit = min(len(tasks), len(self.tasks))
+        while first < limit and tasks[first] == self.tasks[first]:
+            first += 1
+        del self.tasks[first:], self.states[first + 1:], self.placed[first:]
+
+        used = self.states[first]
+        for task in tasks[first:]:
+            chunks, used = self.place(task, used)
+            self.tasks.append(task)
+            self.placed.append(chunks)
+            self.states.append(used)
+        self.replanned = len(tasks) - first
+        return self.placed
+
+    def place(self, task, used):
+        """Tapşırığı son tarixdən əvvəlki ən erkən boş vaxta yerləşdir"""
+        (_, _, deadline, _), minutes = task
+        trial = list(used)
+        chunks = {}
+        remaining = minutes
+        # Əvvəlcə hər günə ən çox max_chunk düşür; sığmasa məhdudiyyətsiz təkrar cəhd
+        for cap in (self.max_chunk, None):
+            per_day = {}
+            for i, (ordinal, start, end) in enumerate(self.slots):
+                if ordinal >= deadline or not remaining:
+                    break
+                begin = trial[i]
+                size = min(remaining, end - begin)
+                if cap is not None:
+                    size = min(size, cap - per_day.get(ordinal, 0))
+                if size <= 0 or size < min(self.min_chunk, remaining):
+                    continue
+                chunks[i] = (chunks[i][0] if i in chunks else begin, begin + size)
+                trial[i] = begin + size
+                per_day[ordinal] = per_day.get(ordinal, 0) + size
+                remaining -= size
+            if not remaining:
+                return [(self.slots[i][0],) + chunks[i] for i in sorted(chunks)], trial
+        # Sığmayan tapşırıq boş vaxt tutmur, çatışmayan dəqiqələr qaytarılır
+        return remaining, used
+
+    def schedule(self, homework, skipped=(), today=None):
+        """Plan: tarix sırası ilə sessiyalar və sığmayan tapşırıqlar"""
+        sessions = []
+        unscheduled = []
+        for ((_, _, deadline, hw_id), minutes), chunks in zip(self.tasks, self.placed):
+            hw = homework(hw_id)
+            if isinstance(chunks, int):
+                if today is not None and deadline < today:
+                    reason = "son tarix keçib"
+                elif today is not None and deadline == today:
+                    reason = "son tarix bu gündür"
+                else:
+                    reason = "vaxt çatmır"
+                unscheduled.append({"homework_id": hw_id, "title": hw["title"],
+                                    "deadline": hw["deadline"], "minutes": minutes,
+                                    "missing": chunks, "reason": reason})
+                continue
+            for ordinal, start, end in chunks:
+                sessions.append((ordinal, start, hw_id, end, hw))
+        for hw_id, reason in skipped:
+            hw = homework(hw_id)
+            minutes = estimated_minutes(hw["estimated_time"])
+            unscheduled.append({"homework_id": hw_id, "title": hw["title"],
+                                "deadline": hw["deadline"], "minutes": minutes,
+                                "missing": minutes, "reason": reason})
+        sessions.sort(key=lambda item: item[:3])
+        return {
+            "sessions": [{"date": format_ordinal(ordinal),
+                          "day": WEEKDAYS[date.fromordinal(ordinal).weekday()],
+                          "start": format_minutes(start), "end": format_minutes(end),
+                          "homework_id": hw_id, "homework_title": hw["title"],
+                          "subject": hw["subject"]}
+                         for ordinal, start, hw_id, end, hw in sessions],
+            "unscheduled": unscheduled,
+        }
@@ -0,0 +1,305 @@
+from collections.abc import MutableMapping
+from datetime import date
+from functools import lru_cache
+from operator import attrgetter
+
+from models import STATUSES, Priority, Subject
+
+SUBJECTS = tuple(s.value for s in Subject)
+PRIORITIES = tuple(p.value for p in Priority)
+SUBJECT_CODES = {value: code for code, value in enumerate(SUBJECTS)}
+PRIORITY_CODES = {value: code for code, value in enumerate(PRIORITIES)}
+STATUS_CODES = {value: code for code, value in enumerate(STATUSES)}
+
+MISSING = object()
+NO_NOTES = object()
+
+
+def pack_label(value, codes):
+    """Məlum etiketi kiçik tam ədədə çevir, naməlum mətni olduğu kimi saxla"""
+    if isinstance(value, str):
+        return codes.get(value, value)
+    # Kodla qarışmasın deyə mətn olmayan dəyərlər (saxlanmış tam ədəd də) qablaşdırılır
+    return value if value is None else (value,)
+
+
+def unpack_label(value, labels):
+    if type(value) is int:
+        return labels[value]
+    return value[0] if type(value) is tuple else value
+
+
+def pack_subject(value):
+    return pack_label(value, SUBJECT_CODES)
+
+
+def pack_priority(value):
+    return pack_label(value, PRIORITY_CODES)
+
+
+def pack_status(value):
+    return pack_label(value, STATUS_CODES)
+
+
+def unpack_subject(value):
+    return unpack_label(value, SUBJECTS)
+
+
+def unpack_priority(value):
+    return unpack_label(value, PRIORITIES)
+
+
+def unpack_status(value):
+    return unpack_label(value, STATUSES)
+
+
+@lru_cache(maxsize=8192)
+def _parse_date(value):
+    if (len(value) != 10 or value[2] != "." or value[5] != "." or not value.isascii()
+            or not (value[:2] + value[3:5] + value[6:]).isdigit() or value[6] == "0"):
+        return value
+    try:
+        return date(int(value[6:]), int(value[3:5]), int(value[:2])).toordinal()
+    except ValueError:
+        return value
+
+
+def pack_date(value):
+    """GG.AA.İLİL tarixini sıra nömrəsinə çevir; itkisiz deyilsə mətni saxla"""
+    if type(value) is str:
+        return _parse_date(value)
+    # Sıra nömrəsi ilə qarışmasın deyə mətn olmayan dəyərlər qablaşdırılır
+    return value if value is None else (value,)
+
+
+@lru_cache(maxsize=8192)
+def _format_date(ordinal):
+    d = date.fromordinal(ordinal)
+    return f"{d.day:02d}.{d.month:02d}.{d.year}"
+
+
+def unpack_date(value):
+    if type(value) is int:
+        return _format_date(value)
+    return value[0] if type(value) is tuple else value
+
+
+def pack_notes(notes):
+    """Boş qeyd siyahısını hər tapşırıqda ayrıca list saxlamamaq üçün işarə ilə əvəz et"""
+    return NO_NOTES if type(notes) is list and not notes else notes
+
+
+def unpack_notes(value):
+    return [] if value is NO_NOTES else value
+
+
+class Record(MutableMapping):
+    """Sahələri slotlarda sıxılmış şəkildə saxlayan, dict kimi işləyən qeyd"""
+    __slots__ = ("_extra",)
+
+    FIELDS = ()
+    CODECS = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.ATTRS = {key: "_" + key for key in cls.FIELDS}
+        cls.DECODERS = {key: cls.CODECS[key][1] for key in cls.FIELDS if key in cls.CODECS}
+        cls.ENCODERS = {key: cls.CODECS[key][0] for key in cls.FIELDS if key in cls.CODECS}
+        cls.LAYOUT = tuple((key, cls.DECODERS.get(key)) for key in cls.FIELDS)
+        cls.read_all = staticmethod(attrgetter(*cls.ATTRS.values())) if cls.FIELDS else None
+
+    def __getitem__(self, key):
+        attr = self.ATTRS.get(key)
+        if attr is not None:
+            value = getattr(self, attr)
+            if value is not MISSING:
+                decode = self.DECODERS.get(key)
+                return value if decode is None else decode(value)
+        elif self._extra is not None and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        attr = self.ATTRS.get(key)
+        if attr is not None:
+            encode = self.ENCODERS.get(key)
+            setattr(self, attr, value if encode is None else encode(value))
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+    def __delitem__(self, key):
+        attr = self.ATTRS.get(key)
+        if attr is not None and getattr(self, attr) is not MISSING:
+            setattr(self, attr, MISSING)
+        elif self._extra is not None and key in self._extra:
+            del self._extra[key]
+        else:
+            raise KeyError(key)
+
+    def __iter__(self):
+        for key, value in zip(self.FIELDS, self.read_all(self)):
+            if value is not MISSING:
+                yield key
+        if self._extra:
+            yield from self._extra
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __contains__(self, key):
+        attr = self.ATTRS.get(key)
+        if attr is not None:
+            return getattr(self, attr) is not MISSING
+        return self._extra is not None and key in self._extra
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+    @classmethod
+    def from_dict(cls, data):
+        """JSON lüğətindən qeyd yarat (artıq qeyddirsə olduğu kimi qaytar)"""
+        if isinstance(data, cls):
+            return data
+        record = cls.__new__(cls)
+        encoders = cls.ENCODERS
+        for key, attr in cls.ATTRS.items():
+            value = data.get(key, MISSING)
+            if value is not MISSING and key in encoders:
+                value = encoders[key](value)
+            setattr(record, attr, value)
+        record._extra = None
+        if len(data) > len(cls.FIELDS) or any(key not in cls.ATTRS for key in data):
+            record._extra = {key: value for key, value in data.items()
+                             if key not in cls.ATTRS}
+        return record
+
+    def to_dict(self):
+        """Əvvəlki JSON formatında lüğət"""
+        data = {}
+        for (key, decode), value in zip(self.LAYOUT, self.read_all(self)):
+            if value is not MISSING:
+                data[key] = value if decode is None else decode(value)
+        if self._extra:
+            data.update(self._extra)
+        return data
+
+
+class HomeworkRecord(Record):
+    """Ev tapşırığı: fənn, prioritet və status kod kimi, tarixlər sıra nömrəsi kimi"""
+    __slots__ = ("_id", "_title", "_subject", "_description", "_deadline", "_priority",
+                 "_estimated_time", "_status", "_created_date", "_completed_date", "_notes")
+
+    FIELDS = ("id", "title", "subject", "description", "deadline", "priority",
+              "estimated_time", "status", "created_date", "completed_date", "notes")
+    CODECS = {
+        "subject": (pack_subject, unpack_subject),
+        "priority": (pack_priority, unpack_priority),
+        "status": (pack_status, unpack_status),
+        "deadline": (pack_date, unpack_date),
+        "created_date": (pack_date, unpack_date),
+        "completed_date": (pack_date, unpack_date),
+        "notes": (pack_notes, unpack_notes),
+    }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Tam sahəli tapşırıqlar üçün sürətli yol, qalanları ümumi yolla"""
+        if type(data) is cls:
+            return data
+        if (type(data) is not dict or len(data) != len(cls.FIELDS)
+                or not data.keys() <= cls.ATTRS.keys()):
+            return super().from_dict(data)
+        record = cls.__new__(cls)
+        record._id = data["id"]
+        record._title = data["title"]
+        record._subject = pack_subject(data["subject"])
+        record._description = data["description"]
+        record._deadline = pack_date(data["deadline"])
+        record._priority = pack_priority(data["priority"])
+        record._estimated_time = data["estimated_time"]
+        record._status = pack_status(data["status"])
+        record._created_date = pack_date(data["created_date"])
+        record._completed_date = pack_date(data["completed_date"])
+        record._notes = pack_notes(data["notes"])
+        record._extra = None
+        return record
+
+    @classmethod
+    def to_columns(cls, records):
+        """from_columns-un tərsi; əlavə və ya əskik sahəli qeyd varsa None"""
+        if any(type(record) is not cls or record._extra for record in records):
+            return None
+        columns = list(zip(*map(cls.read_all, records))) or [() for _ in cls.FIELDS]
+        if any(MISSING in column for column in columns):
+            return None
+        return [column if decode is None else list(map(decode, column))
+                for (_, decode), column in zip(cls.LAYOUT, columns)]
+
+    @classmethod
+    def from_columns(cls, columns):
+        """FIELDS sırası ilə verilmiş sahə sütunlarından qeydlər yarat (snapşotdan yükləmə)"""
+        (ids, titles, subjects, descriptions, deadlines, priorities, times, statuses,
+         created, completed, notes) = columns
+        rows = zip(ids, titles, map(pack_subject, subjects), descriptions,
+                   map(pack_date, deadlines), map(pack_priority, priorities),
+                   times, map(pack_status, statuses), map(pack_date, created),
+                   map(pack_date, completed), map(pack_notes, notes))
+        new = cls.__new__
+        records = []
+        for values in rows:
+            record = new(cls)
+            (record._id, record._title, record._subject, record._description, record._deadline,
+             record._priority, record._estimated_time, record._status, record._created_date,
+             record._completed_date, record._notes) = values
+            record._extra = None
+            records.append(record)
+        return records
+
+    def to_dict(self):
+        """Əvvəlki JSON formatında lüğət"""
+        if self._extra is not None or MISSING in self.read_all(self):
+            return super().to_dict()
+        return {
+            "id": self._id,
+            "title": self._title,
+            "subject": unpack_subject(self._subject),
+            "description": self._description,
+            "deadline": unpack_date(self._deadline),
+            "priority": unpack_priority(self._priority),
+            "estimated_time": self._estimated_time,
+            "status": unpack_status(self._status),
+            "created_date": unpack_date(self._created_date),
+            "completed_date": unpack_date(self._completed_date),
+            "notes": unpack_notes(self._notes),
+        }
+
+    @property
+    def deadline_ordinal(self):
+        """Son tarix artıq sıra nömrəsi kimi saxlanılıbsa onu qaytar"""
+        return self._deadline if type(self._deadline) is int else None
+
+    def packed_ordinal(self, key):
+        """Tarix sahəsi (deadline, created_date, completed_date) sıra nömrəsi kimi saxlanılıbsa"""
+        value = getattr(self, self.ATTRS[key])
+        return value if type(value) is int else None
+
+
+class SessionRecord(Record):
+    """Cədvəl sessiyası; fənn məlum etiketdirsə kod kimi saxlanılır"""
+    __slots__ = ("_subject", "_start", "_end", "_homework_id", "_homework_title",
+                 "_completed", "_notified")
+
+    FIELDS = ("subject", "start", "end", "homework_id", "homework_title", "completed",
+              "notified")
+    CODECS = {
+        "subject": (pack_subject, unpack_subject),
+    }
+
+
+def to_json(value):
+    """json.dump(default=...) üçün: qeydləri lüğətə çevir"""
+    if isinstance(value, Record):
+        return value.to_dict()
+    raise TypeError(f"{type(value).__name__} JSON-a çevrilə bilməz")
@@ -0,0 +1,185 @@
+import csv
+import json
+import sys
+
+from bulk import HOMEWORK_FIELDS
+from records import to_json
+
+PAGE_SIZE = 20
+OUTPUT_FORMATS = ("text", "jsonl", "csv")
+
+
+class Pages:
+    """İterasiyanı tələb olunduqca səhifələrə böl; yalnız görünən səhifə hesablanır"""
+
+    def __init__(self, items, page_size=PAGE_SIZE, keep=True):
+        self.source = iter(items)
+        self.page_size = page_size
+        self.keep = keep
+        self.loaded = []
+        self.offset = 0
+        self.exhausted = False
+
+    @property
+    def seen(self):
+        """İndiyə qədər mənbədən oxunmuş elementlərin sayı"""
+        return self.offset + len(self.loaded)
+
+    def _load_until(self, count):
+        while not self.exhausted and self.seen < count:
+            try:
+                self.loaded.append(next(self.source))
+            except StopIteration:
+                self.exhausted = True
+
+    def page(self, number):
+        """number-ci səhifənin elementləri (0-dan)"""
+        start = number * self.page_size
+        self._load_until(start + self.page_size + 1)
+        if start < self.offset:
+            raise IndexError("Səhifə artıq buraxılıb")
+        items = self.loaded[start - self.offset:start - self.offset + self.page_size]
+        if not self.keep:
+            # Geri qayıtmaq lazım deyilsə oxunmuş səhifələri yaddaşda saxlama
+            drop = min(start + len(items), self.seen) - self.offset
+            del self.loaded[:drop]
+            self.offset += drop
+        return items
+
+    def has_next(self, number):
+        self._load_until((number + 1) * self.page_size + 1)
+        return self.seen > (number + 1) * self.page_size
+
+    def known_pages(self):
+        """Səhifələrin sayı; mənbə sona çatmayıbsa None"""
+        if not self.exhausted:
+            return None
+        return max(1, -(-self.seen // self.page_size))
+
+
+def render_page(items, format_item, header=""):
+    """Səhifəni bir mətn buferinə yığ"""
+    parts = [header] if header else []
+    parts.extend(format_item(item) for item in items)
+    return "".join(parts)
+
+
+def show_pages(items, format_item, header="", page_size=PAGE_SIZE, out=None,
+               interactive=None):
+    """Elementləri səhifə-səhifə bir yazı ilə göstər, terminalda naviqasiya təklif et"""
+    out = out or sys.stdout
+    if interactive is None:
+        interactive = sys.stdin.isatty() and out.isatty()
+    pages = Pages(items, page_size, keep=interactive)
+
+    if not interactive:
+        number = 0
+        while True:
+            out.write(render_page(pages.page(number), format_item, header if not number else ""))
+            if not pages.has_next(number):
+                break
+            number += 1
+        out.flush()
+        return pages.seen
+
+    number = 0
+    while True:
+        text = render_page(pages.page(number), format_item, header)
+        has_next = pages.has_next(number)
+        if number or has_next:
+            total = pages.known_pages()
+            text += (f"\n📄 Səhifə {number + 1}" + (f"/{total}" if total else "") +
+                     "  [n] növbəti  [p] əvvəlki  [nömrə] keçid  [Enter] çıxış\n")
+        out.write(text)
+        out.flush()
+        if not (number or has_next):
+            return pages.seen
+        choice = input("Səhifə: ").strip().lower()
+        if choice == "n" and has_next:
+            number += 1
+        elif choice == "p" and number:
+            number -= 1
+        elif choice.isdigit() and int(choice) >= 1:
+            target = int(choice) - 1
+            if target <= number or pages.has_next(target - 1):
+                number = target
+        elif choice == "":
+            return pages.seen
+
+
+def format_homework(hw, invalid_deadline=False):
+    """Tapşırığın mətn blokunu qaytar"""
+    status_icon = "✅" if hw["status"] == "Tamamlandı" else "⏳"
+    priority_icon = "⚠️" if hw["priority"] == "Təcili" else "🔄"
+    deadline = hw["deadline"] + (" ⚠️ (tanınmayan tarix)" if invalid_deadline else "")
+    text = (f"\n{status_icon} ID: {hw['id']}\n"
+            f"   📌 {hw['title']}\n"
+            f"   📚 Fənn: {hw['subject']}\n"
+            f"   ⏰ Son tarix: {deadline}\n"
+            f"   {priority_icon} Prioritet: {hw['priority']}\n"
+            f"   🕒 Təxmini vaxt: {hw['estimated_time']} saat\n"
+            f"   📝 Status: {hw['status']}\n")
+    if hw["notes"]:
+        text += f"   📎 Qeydlər: {len(hw['notes'])} qeyd\n"
+    return text
+
+
+def write_records(records, fp, fmt="jsonl", fields=HOMEWORK_FIELDS):
+    """Qeydləri maşın üçün oxunaqlı formatda yaz, sayını qaytar"""
+    count = 0
+    if fmt == "csv":
+        writer = csv.DictWriter(fp, fieldnames=fields, extrasaction='ignore')
+        writer.writeheader()
+        for record in records:
+            row = dict(record)
+            if "notes" in row:
+                row["notes"] = json.dumps(row["notes"], ensure_ascii=False)
+            writer.writerow(row)
+            count += 1
+        return count
+    for record in records:
+        fp.write(json.dumps(record, ensure_ascii=False, default=to_json) + "\n")
+        count += 1
+    return count
+
+
+def schedule_rows(schedule, sorted_sessions):
+    """Cədvəli gün sırası ilə düz (gün daxil) qeydlərə çevir"""
+    for day in schedule:
+        for session in sorted_sessions(day):
+            yield dict(session, day=day)
+
+
+def format_analytics(report):
+    """Analitika hesabatını mətn bloku kimi qaytar"""
+    names = {"day": "GÜNLƏR", "week": "HƏFTƏLƏR", "month": "AYLAR"}
+    lines = [f"\n📈 {names[report['period']]} ÜZRƏ TAMAMLAMA (son tarixə görə):", "-"*40]
+    for row in report["rates"]:
+        group = f" {row['group']}" if row["group"] else ""
+        lines.append(f"   {row['period']}{group}: {row['completed']}/{row['total']} "
+                     f"({row['rate']:.1f}%), vaxtında {row['on_time_rate']:.1f}%")
+    if not report["rates"]:
+        lines.append("   Bu dövrlərdə son tarixi olan tapşırıq yoxdur")
+
+    if report["rolling"]:
+        lines.append(f"\n📉 SÜRÜŞƏN PƏNCƏRƏ (son {report['window']} dövr):")
+        lines.append("-"*40)
+        for row in report["rolling"]:
+            group = f" {row['group']}" if row["group"] else ""
+            lines.append(f"   {row['period']}{group}: {row['rate']:.1f}%")
+
+    lines.append("\n⏱️ GECİKMƏ:")
+    lines.append("-"*40)
+    for summary in report["lateness"]:
+        prefix = f"   {summary['group']}: " if summary["group"] else "   "
+        lines.append(f"{prefix}{summary['on_time']}/{summary['count']} vaxtında "
+                     f"({summary['on_time_rate']:.1f}%), orta gecikmə "
+                     f"{summary['average_days_late']:.1f} gün, ən çox {summary['max_days_late']} gün")
+        lines.append("      " + ", ".join(f"{item['bucket']}: {item['count']}"
+                                          for item in summary["distribution"]))
+    if not report["lateness"]:
+        lines.append("   Tamamlanmış tapşırıq yoxdur")
+
+    streaks = report["streaks"]
+    lines.append(f"\n🔥 Seriya: {streaks['current']} gün (ən uzun: {streaks['longest']} gün)")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,181 @@
+import heapq
+import itertools
+import threading
+from datetime import datetime, timedelta
+
+from metrics import METRICS
+
+WEEKDAYS = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+
+
+def parse_clock(value):
+    """SS:DD formatlı vaxtı (saat, dəqiqə) cütünə çevir"""
+    try:
+        hour, minute = value.strip().split(":")
+        hour, minute = int(hour), int(minute)
+    except (AttributeError, ValueError):
+        return None
+    if not (0 <= hour < 24 and 0 <= minute < 60):
+        return None
+    return hour, minute
+
+
+class ReminderScheduler:
+    """Növbəti sessiya başlanğıcına qədər yatan prioritet növbəli xatırladıcı"""
+
+    def __init__(self, get_schedule, on_due, clock=datetime.now, max_catch_up_days=1,
+                 max_sleep=300, lock=None, get_occurrences=None, retry_delay=5):
+        self.get_schedule = get_schedule
+        # get_occurrences(ordinal) verilsə tarixli təkrarlar (ləğv və köçürmələr nəzərə
+        # alınmaqla) şablonun əvəzinə oxunur
+        self.get_occurrences = get_occurrences
+        # Cədvəli dəyişən axınla paylaşılan kilid; oxuma və bayraq yazıları onun altında
+        self.lock = lock or threading.RLock()
+        # on_due False qaytarsa (məs. bildiriş növbəsi doludur) xatırlatma retry_delay
+        # saniyədən sonra yenidən göndərilir
+        self.on_due = on_due
+        self.retry_delay = retry_delay
+        self.retries = []
+        self.clock = clock
+        self.max_catch_up_days = max_catch_up_days
+        self.max_sleep = max_sleep
+        self.cond = threading.Condition()
+        self.heap = []
+        self.counter = itertools.count()
+        self.dirty = True
+        self.stopped = True
+        self.thread = None
+        self.last_check = None
+        self.fired = set()
+        self.fired_date = None
+
+    def start(self):
+        """Fon axınını başlat"""
+        with self.cond:
+            if self.thread is not None:
+                return
+            self.stopped = False
+            self.dirty = True
+            self.last_check = self.clock().replace(second=0, microsecond=0)
+            self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Axını dərhal oyandır və dayandır"""
+        with self.cond:
+            self.stopped = True
+            self.cond.notify_all()
+            thread, self.thread = self.thread, None
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+    @property
+    def running(self):
+        return self.thread is not None
+
+    def reschedule(self):
+        """Cədvəl dəyişdi; növbəni yenidən qur"""
+        with self.cond:
+            self.dirty = True
+            self.cond.notify_all()
+
+    def run(self):
+        """Axının əsas dövrü"""
+        while True:
+            with self.cond:
+                if self.stopped:
+                    return
+                with METRICS.timer("reminder_tick"):
+                    due, timeout = self.tick(self.clock())
+                if not due:
+                    self.cond.wait(timeout)
+                    continue
+            for when, day, session in due:
+                self.fire(when, day, session)
+
+    def tick(self, now):
+        """Vaxtı çatmış sessiyaları və növbəti oyanmaya qədər saniyələri qaytar"""
+        if self.dirty or now.date() != self.last_check.date():
+            self.rebuild(now)
+
+        due = []
+        while self.heap and self.heap[0][0] <= now:
+            when, _, day, session = heapq.heappop(self.heap)
+            if session is None:
+                self.dirty = True
+                continue
+            due.append((when, day, session))
+        if self.retries:
+            horizon = now - timedelta(days=self.max_catch_up_days)
+            waiting = []
+            for item in self.retries:
+                if item[0] <= now:
+                    if item[1] >= horizon:
+                        due.append(item[1:])
+                else:
+                    waiting.append(item)
+            self.retries = waiting
+        if self.dirty and not due:
+            return self.tick(now)
+
+        self.last_check = now
+        # Monoton saat yuxu rejimində dayanır; divar saatını vaxtaşırı yoxla
+        wake = min([self.heap[0][0]] + [item[0] for item in self.retries])
+        timeout = min((wake - now).total_seconds(), self.max_sleep)
+        return due, timeout
+
+    def rebuild(self, now):
+        """Son yoxlamadan bu günün sonuna qədər başlanğıcları növbəyə yığ"""
+        start = max(self.last_check, now - timedelta(days=self.max_catch_up_days))
+        with self.lock:
+            days = {}
+            date = start.date()
+            while date <= now.date():
+                days[date] = self.sessions_on(date)
+                date += timedelta(days=1)
+        heap = []
+        for date, sessions in days.items():
+            for session in sessions:
+                clock = parse_clock(session.get("start"))
+                if clock is None:
+                    continue
+                when = datetime(date.year, date.month, date.day, clock[0], clock[1])
+                if when >= start:
+                    heap.append((when, next(self.counter), WEEKDAYS[date.weekday()], session))
+
+        midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+        heap.append((midnight, next(self.counter), None, None))
+        heapq.heapify(heap)
+        self.heap = heap
+        self.dirty = False
+
+    def sessions_on(self, date):
+        """Tarixdə xatırladılacaq sessiyalar"""
+        if self.get_occurrences is not None:
+            return [occurrence for occurrence in self.get_occurrences(date.toordinal())
+                    if not occurrence["cancelled"] and not occurrence["completed"]]
+        return list(self.get_schedule().get(WEEKDAYS[date.weekday()], []))
+
+    def fire(self, when, day, session):
+        """Xatırlatmanı bir dəfə göndər; göndərilənlər geri baxış müddəti qədər saxlanılır"""
+        # Növbə yenidən qurulduqda eyni başlanğıc təkrar düşə bilər
+        key = (when, session.get("subject"), session.get("key"))
+        with self.lock:
+            if self.fired_date != when.date():
+                horizon = when - timedelta(days=self.max_catch_up_days + 1)
+                self.fired = {item for item in self.fired if item[0] >= horizon}
+                self.fired_date = when.date()
+            if key in self.fired:
+                return
+            self.fired.add(key)
+        # Göndərmə kilidsiz: on_due yalnız hadisəni növbəyə qoyur
+        if self.on_due(day, session, when) is False:
+            # Qəbul olunmadı: göndərilmiş sayma, bir qədər sonra yenidən cəhd et
+            with self.lock:
+                self.fired.discard(key)
+            with self.cond:
+                retry_at = self.clock() + timedelta(seconds=self.retry_delay)
+                self.retries.append((retry_at, when, day, session))
+            METRICS.count("reminders_deferred")
+            return
+        METRICS.count("reminders_fired")
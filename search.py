@@ -0,0 +1,162 @@
+import heapq
+import math
+import re
+import unicodedata
+from bisect import bisect_left
+
+FIELD_WEIGHTS = (("title", 3), ("description", 1), ("notes", 1))
+FOLD_TABLE = str.maketrans({"ə": "e", "ş": "s", "ç": "c", "ğ": "g", "ı": "i", "ö": "o",
+                            "ü": "u", "\u0307": None})
+TOKEN = re.compile(r"\w+")
+
+
+def fold(text):
+    """Azərbaycan hərflərini nəzərə alaraq kiçilt və diakritikləri at (İ→i, I→ı→i, ə→e...)"""
+    text = unicodedata.normalize("NFC", text).replace("I", "ı").replace("İ", "i")
+    return text.lower().translate(FOLD_TABLE)
+
+
+def tokenize(text):
+    """Mətni qatlanmış sözlərə böl"""
+    return TOKEN.findall(fold(text))
+
+
+def note_text(note):
+    """Qeyd mətn və ya lüğət ola bilər"""
+    if isinstance(note, str):
+        return note
+    if isinstance(note, dict):
+        return " ".join(str(value) for value in note.values() if isinstance(value, str))
+    return str(note)
+
+
+def homework_terms(hw):
+    """Tapşırığın sözləri və sahə çəkiləri ilə tezlikləri"""
+    terms = {}
+    for field, weight in FIELD_WEIGHTS:
+        value = hw.get(field)
+        if not value:
+            continue
+        text = " ".join(map(note_text, value)) if field == "notes" else str(value)
+        for token in tokenize(text):
+            terms[token] = terms.get(token, 0) + weight
+    return terms
+
+
+class SearchIndex:
+    """Başlıq, təsvir və qeydlər üzrə artımlı tərs indeks"""
+
+    def __init__(self):
+        # söz -> {çəki: {id: None}}: eyni çəkili id-lər əlavə olunma sırası ilə
+        self.postings = {}
+        self.doc_terms = {}
+        self._vocabulary = None
+
+    def __len__(self):
+        return len(self.doc_terms)
+
+    def add(self, hw):
+        """Tapşırığı indeksə əlavə et"""
+        terms = homework_terms(hw)
+        self.doc_terms[hw["id"]] = tuple(terms.items())
+        for token, weight in terms.items():
+            levels = self.postings.get(token)
+            if levels is None:
+                levels = self.postings[token] = {}
+                self._vocabulary = None
+            levels.setdefault(weight, {})[hw["id"]] = None
+
+    def remove(self, hw_id):
+        """Tapşırığı indeksdən çıxar"""
+        for token, weight in self.doc_terms.pop(hw_id, ()):
+            levels = self.postings[token]
+            level = levels[weight]
+            del level[hw_id]
+            if not level:
+                del levels[weight]
+                if not levels:
+                    del self.postings[token]
+                    self._vocabulary = None
+
+    def update(self, hw):
+        """Mətni dəyişmiş tapşırığı yenidən indekslə"""
+        self.remove(hw["id"])
+        self.add(hw)
+
+    def vocabulary(self):
+        """Sözlərin sıralı siyahısı (prefiks axtarışı üçün, lazım olanda qurulur)"""
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self.postings)
+        return self._vocabulary
+
+    def matches(self, token, prefix=False):
+        """Sözə (prefix=True olduqda həm də onunla başlayan sözlərə) uyğun postinglər"""
+        if not prefix:
+            levels = self.postings.get(token)
+            return [levels] if levels else []
+        vocabulary = self.vocabulary()
+        found = []
+        for i in range(bisect_left(vocabulary, token), len(vocabulary)):
+            if not vocabulary[i].startswith(token):
+                break
+            found.append(self.postings[vocabulary[i]])
+        return found
+
+    def search(self, query, limit=20, allowed=None, prefix=True):
+        """Bütün sözləri ehtiva edən tapşırıqların (id, bal) cütləri, bala görə azalan"""
+        # Sonuncu söz hələ yazılmaqda ola bilər, ona görə prefiks kimi də uyğunlaşdırılır
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if not tokens or limit <= 0:
+            return []
+        total = len(self.doc_terms)
+        groups = []
+        for i, token in enumerate(tokens):
+            postings = self.matches(token, prefix and i == len(tokens) - 1)
+            if not postings:
+                return []
+            merged = {}
+            for levels in postings:
+                for weight, ids in levels.items():
+                    merged.setdefault(weight, []).append(ids)
+            size = sum(len(ids) for level in merged.values() for ids in level)
+            groups.append((size, math.log(1 + total / size), sorted(merged.items(), reverse=True)))
+        groups.sort(key=lambda group: group[0])
+
+        if len(groups) == 1:
+            return self._top_levels(groups[0], limit, allowed)
+
+        # Kəsişmə və çəkilər C səviyyəsində (çoxluq/dict əməliyyatları) hesablanır, Python
+        # dövrü yalnız bütün sözlərə uyğun gələn tapşırıqları gəzir
+        candidates = None
+        weights = []
+        for _, idf, levels in groups:
+            found = {}
+            # Artan çəki sırası: prefiks sözlərindən ən yüksək çəki qalib gəlir
+            for weight, level in reversed(levels):
+                for ids in level:
+                    found.update(dict.fromkeys(
+                        ids if candidates is None else candidates & ids.keys(), weight))
+            if not found:
+                return []
+            candidates = found.keys()
+            weights.append((idf, found))
+        scored = [(hw_id, sum(idf * found[hw_id] for idf, found in weights))
+                  for hw_id in candidates if allowed is None or hw_id in allowed]
+        return heapq.nlargest(limit, scored, key=lambda item: (item[1], -item[0]))
+
+    @staticmethod
+    def _top_levels(group, limit, allowed):
+        """Tək söz: çəki səviyyələrini azalan sıra ilə gəz, limit dolan kimi dayan"""
+        _, idf, levels = group
+        results = []
+        seen = set()
+        for weight, level in levels:
+            for ids in level:
+                for hw_id in ids:
+                    if hw_id in seen or (allowed is not None and hw_id not in allowed):
+                        continue
+                    seen.add(hw_id)
+                    results.append((hw_id, weight * idf))
+                    if len(results) == limit:
+                        return results
+        return results
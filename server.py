@@ -0,0 +1,406 @@
+import asyncio
+import json
+import re
+import traceback
+import weakref
+from urllib.parse import parse_qs, urlsplit
+
+import bulk
+from metrics import METRICS
+from models import PENDING
+from records import to_json
+
+MAX_BODY = 1 << 20
+MAX_CALENDAR_DAYS = 366
+REASONS = {200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found",
+           405: "Method Not Allowed", 409: "Conflict", 413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+def content_length(headers):
+    """Content-Length başlığı; yoxdursa 0, yanlış və ya mənfidirsə None"""
+    value = headers.get("content-length") or "0"
+    if not (value.isascii() and value.isdigit()):
+        return None
+    return int(value)
+
+
+class ApiError(Exception):
+    """HTTP status kodu ilə API xətası"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def route(method, pattern, mutates=False):
+    """Metodu marşrut kimi qeyd et"""
+    def decorator(func):
+        func.route = (method, re.compile(f"^/students/(?P<student>[^/]+){pattern}$"), mutates)
+        return func
+    return decorator
+
+
+class ApiServer:
+    """HomeworkTracker əməliyyatlarını HTTP/JSON ilə təqdim edən asyncio serveri"""
+
+    def __init__(self, manager, host="127.0.0.1", port=8080):
+        self.manager = manager
+        self.host = host
+        self.port = port
+        self.locks = weakref.WeakKeyDictionary()
+        self.server = None
+        self.routes = [getattr(self, name).route + (getattr(self, name),)
+                       for name in dir(self) if hasattr(getattr(self, name), "route")]
+
+    async def start(self):
+        """Serveri başlat; port=0 olduqda seçilmiş portu yadda saxla"""
+        self.server = await asyncio.start_server(self.handle_connection, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self
+
+    async def serve_forever(self):
+        if self.server is None:
+            await self.start()
+        async with self.server:
+            await self.server.serve_forever()
+
+    async def close(self):
+        """Serveri dayandır"""
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+            self.server = None
+
+    async def handle_connection(self, reader, writer):
+        """Bir əlaqə üzərində keep-alive sorğularını emal et"""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    await self.write_response(writer, 400, {"error": "Yanlış sorğu sətri"}, False)
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                length = content_length(headers)
+                if length is None:
+                    await self.write_response(writer, 400, {"error": "Yanlış Content-Length"},
+                                              False)
+                    break
+                if length > MAX_BODY:
+                    await self.write_response(writer, 413, {"error": "Sorğu çox böyükdür"}, False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+
+                keep_alive = (headers.get("connection", "").lower() != "close"
+                              and version.upper() == "HTTP/1.1")
+                status, payload = await self.dispatch(method.upper(), target, body)
+                await self.write_response(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except asyncio.CancelledError:
+            # Server dayandırılarkən boş keep-alive əlaqələri ləğv olunur
+            pass
+        finally:
+            writer.close()
+
+    async def write_response(self, writer, status, payload, keep_alive):
+        data = json.dumps(payload, ensure_ascii=False, default=to_json).encode("utf-8")
+        head = (f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+                f"Content-Type: application/json; charset=utf-8\r\n"
+                f"Content-Length: {len(data)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(head.encode("latin-1") + data)
+        await writer.drain()
+
+    async def dispatch(self, method, target, body=b""):
+        """Sorğunu uyğun marşruta yönləndir, (status, cavab) qaytar"""
+        url = urlsplit(target)
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        if url.path == "/metrics" and method == "GET":
+            return 200, METRICS.snapshot()
+        allowed = False
+        for route_method, pattern, mutates, handler in self.routes:
+            match = pattern.match(url.path)
+            if not match:
+                continue
+            allowed = True
+            if route_method != method:
+                continue
+            try:
+                with METRICS.timer(f"api.{handler.__name__}"):
+                    params = match.groupdict()
+                    data = json.loads(body.decode("utf-8")) if body else {}
+                    if not isinstance(data, dict):
+                        raise ApiError(400, "Sorğu gövdəsi JSON obyekti olmalıdır")
+                    student = params.pop("student")
+                    if not mutates:
+                        tracker = await self.tracker_for(student, self.manager.get)
+                        return handler(tracker, params, query, data)
+                    tracker = await self.tracker_for(student, self.manager.acquire)
+                    try:
+                        return await self.mutate(tracker, handler, params, query, data)
+                    finally:
+                        if self.manager.release(student):
+                            loop = asyncio.get_running_loop()
+                            await loop.run_in_executor(None, self.manager.enforce_limits)
+            except ApiError as e:
+                return e.status, {"error": str(e)}
+            except ValueError as e:
+                # Yoxlama xətaları (JSON, tarix, enum və s.) müştəri xətasıdır
+                return 400, {"error": str(e)}
+            except Exception as e:
+                traceback.print_exc()
+                return 500, {"error": f"{type(e).__name__}: {e}"}
+        if allowed:
+            return 405, {"error": "Metoda icazə verilmir"}
+        return 404, {"error": "Marşrut tapılmadı"}
+
+    async def tracker_for(self, student_id, getter):
+        """Keşdəki izləyicini dərhal, qalanları icraçıda yükləyərək qaytar"""
+        tracker = getter(student_id, load=False)
+        if tracker is not None:
+            return tracker
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, getter, student_id)
+
+    async def mutate(self, tracker, handler, params, query, data):
+        """Dəyişikliyi izləyici üzrə ardıcıl tətbiq et, diski icraçıda yaz"""
+        lock = self.locks.get(tracker)
+        if lock is None:
+            lock = self.locks[tracker] = asyncio.Lock()
+        async with lock:
+            tracker.begin_batch()
+            try:
+                return handler(tracker, params, query, data)
+            finally:
+                # İşləyici xəta ilə bitsə də artıq tətbiq olunmuş dəyişikliklər yazılır
+                ops = tracker.end_batch()
+                if ops:
+                    loop = asyncio.get_running_loop()
+                    await loop.run_in_executor(None, tracker.persist_ops, ops)
+
+    @route("GET", "/homeworks")
+    def list_homeworks(self, tracker, params, query, data):
+        homeworks = tracker.select_homeworks(status=query.get("status"),
+                                             priority=query.get("priority"),
+                                             subject=query.get("subject"),
+                                             deadline=query.get("deadline"))
+        return 200, homeworks
+
+    @route("POST", "/homeworks", mutates=True)
+    def add_homework(self, tracker, params, query, data):
+        fields = bulk.validate_homework(dict(data, status=PENDING))
+        return 201, tracker.create_homework(**fields)
+
+    @route("GET", "/homeworks/search")
+    def search(self, tracker, params, query, data):
+        if not query.get("q"):
+            raise ApiError(400, "q parametri tələb olunur")
+        return 200, tracker.search_homeworks(query["q"], status=query.get("status"),
+                                             priority=query.get("priority"),
+                                             subject=query.get("subject"),
+                                             limit=int(query.get("limit", 20)))
+
+    @route("GET", "/homeworks/overdue")
+    def overdue(self, tracker, params, query, data):
+        return 200, tracker.overdue_homeworks()
+
+    @route("GET", "/homeworks/due-soon")
+    def due_soon(self, tracker, params, query, data):
+        return 200, tracker.due_soon(int(query.get("days", 7)))
+
+    @route("GET", "/homeworks/by-deadline")
+    def by_deadline(self, tracker, params, query, data):
+        return 200, tracker.homeworks_by_deadline(query.get("status"))
+
+    @route("GET", r"/homeworks/(?P<hw_id>\d+)")
+    def get_homework(self, tracker, params, query, data):
+        return 200, self.require_homework(tracker, params)
+
+    @route("POST", r"/homeworks/(?P<hw_id>\d+)/complete", mutates=True)
+    def complete_homework(self, tracker, params, query, data):
+        self.require_homework(tracker, params)
+        return 200, tracker.complete_homework(int(params["hw_id"]))
+
+    @route("DELETE", r"/homeworks/(?P<hw_id>\d+)", mutates=True)
+    def delete_homework(self, tracker, params, query, data):
+        self.require_homework(tracker, params)
+        return 200, tracker.delete_homework(int(params["hw_id"]))
+
+    @route("GET", "/schedule")
+    def view_schedule(self, tracker, params, query, data):
+        return 200, tracker.schedule
+
+    @route("GET", "/schedule/free-slots")
+    def free_slots(self, tracker, params, query, data):
+        slots = tracker.free_slots(int(query.get("minutes", 60)), limit=int(query.get("limit", 5)))
+        return 200, [{"day": day, "start": start, "end": end} for day, start, end in slots]
+
+    @route("POST", r"/schedule/(?P<day>\w+)", mutates=True)
+    def add_session(self, tracker, params, query, data):
+        day, session = bulk.validate_session(dict(data, day=params["day"]), {}, tracker)
+        if query.get("force") not in ("1", "true"):
+            conflicts = tracker.session_conflicts(day, session["start"], session["end"])
+            if conflicts:
+                raise ApiError(409, "Sessiya mövcud sessiyalarla üst-üstə düşür: " + ", ".join(
+                    f"{other['start']}-{other['end']} {other['subject']}" for other in conflicts))
+        return 201, tracker.add_session(day, session)
+
+    @route("DELETE", r"/schedule/(?P<day>\w+)/(?P<index>\d+)", mutates=True)
+    def remove_session(self, tracker, params, query, data):
+        day, index = self.require_session(tracker, params)
+        return 200, tracker.remove_session(day, index)
+
+    @route("POST", r"/schedule/(?P<day>\w+)/(?P<index>\d+)/complete", mutates=True)
+    def complete_session(self, tracker, params, query, data):
+        day, index = self.require_session(tracker, params)
+        return 200, tracker.complete_session(day, index)
+
+    @route("GET", "/calendar")
+    def calendar(self, tracker, params, query, data):
+        days = int(query.get("days", 7))
+        if not 1 <= days <= MAX_CALENDAR_DAYS:
+            raise ApiError(400, f"days 1 ilə {MAX_CALENDAR_DAYS} arasında olmalıdır")
+        return 200, tracker.calendar_range(query.get("start"), days,
+                                           query.get("cancelled") in ("1", "true"))
+
+    @route("POST", r"/calendar/(?P<date>[\d.]+)", mutates=True)
+    def add_one_off(self, tracker, params, query, data):
+        return 201, tracker.add_one_off(params["date"], data)
+
+    @route("POST", r"/calendar/(?P<date>[\d.]+)/(?P<action>complete|cancel|move)",
+           mutates=True)
+    def update_occurrence(self, tracker, params, query, data):
+        if not data.get("key"):
+            raise ApiError(400, "key sahəsi tələb olunur")
+        if params["action"] == "move":
+            fields = {"start": data.get("start"), "end": data.get("end")}
+        else:
+            fields = {"completed" if params["action"] == "complete" else "cancelled": True}
+        try:
+            return 200, tracker.update_occurrence(params["date"], data["key"], **fields)
+        except KeyError as e:
+            raise ApiError(404, "Təkrar tapılmadı") from e
+
+    @route("GET", "/plan")
+    def study_plan(self, tracker, params, query, data):
+        return 200, tracker.study_plan()
+
+    @route("GET", "/analytics")
+    def analytics(self, tracker, params, query, data):
+        return 200, tracker.analytics_report(query.get("period", "week"), query.get("by"),
+                                             int(query.get("window", 4)),
+                                             int(query.get("periods", 8)))
+
+    @route("GET", "/events")
+    def events(self, tracker, params, query, data):
+        limit = query.get("limit")
+        return 200, tracker.changes_since(int(query.get("since", 0)),
+                                          int(limit) if limit else None)
+
+    @route("GET", "/check-in")
+    def check_in(self, tracker, params, query, data):
+        return 200, tracker.check_in_status()
+
+    @route("GET", "/report")
+    def report(self, tracker, params, query, data):
+        stats = tracker.history_stats()
+        stats["completion_rate"] = (stats["completed"] / stats["total"] * 100
+                                    if stats["total"] else 0.0)
+        return 200, stats
+
+    @staticmethod
+    def require_homework(tracker, params):
+        hw = tracker.find_homework(int(params["hw_id"]))
+        if hw is None:
+            raise ApiError(404, "Tapşırıq tapılmadı")
+        return hw
+
+    @staticmethod
+    def require_session(tracker, params):
+        day, index = params["day"], int(params["index"])
+        if not 0 <= index < len(tracker.schedule.get(day, [])):
+            raise ApiError(404, "Sessiya tapılmadı")
+        return day, index
+
+
+class ApiClient:
+    """Testlər və skriptlər üçün proses daxili keep-alive HTTP müştərisi"""
+
+    def __init__(self, host="127.0.0.1", port=8080):
+        self.host = host
+        self.port = port
+        self.reader = None
+        self.writer = None
+
+    async def request(self, method, path, body=None):
+        """Sorğu göndər, (status, JSON cavab) qaytar"""
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        data = json.dumps(body, ensure_ascii=False).encode("utf-8") if body is not None else b""
+        head = (f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\n"
+                f"Content-Type: application/json\r\nContent-Length: {len(data)}\r\n\r\n")
+        self.writer.write(head.encode("latin-1") + data)
+        await self.writer.drain()
+
+        status = int((await self.reader.readline()).split()[1])
+        headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        length = content_length(headers)
+        if length is None:
+            await self.close()
+            raise ConnectionError("Cavabda yanlış Content-Length")
+        payload = await self.reader.readexactly(length)
+        if headers.get("connection") == "close":
+            await self.close()
+        return status, json.loads(payload.decode("utf-8"))
+
+    async def get(self, path):
+        return await self.request("GET", path)
+
+    async def post(self, path, body=None):
+        return await self.request("POST", path, body if body is not None else {})
+
+    async def delete(self, path):
+        return await self.request("DELETE", path)
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            await self.writer.wait_closed()
+            self.reader = self.writer = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+
+def serve(manager, host="127.0.0.1", port=8080):
+    """Serveri dayandırılana qədər işlət"""
+    server = ApiServer(manager, host, port)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        manager.close()
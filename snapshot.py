@@ -0,0 +1,121 @@
+import json
+import os
+import struct
+import sys
+from array import array
+
+from journal import atomic_write_bytes
+from records import HomeworkRecord, to_json
+
+MAGIC = b"TBSNAP01"
+# Başlıq: mənbə fayllarının (ölçü, mtime_ns, inode) möhürləri, tapşırıq sayı, bölmə sayı
+HEADER = struct.Struct("<8s9qII")
+SECTION = struct.Struct("<QQ")
+FIELDS = HomeworkRecord.FIELDS
+SEPARATOR = "\0"
+
+
+def file_stamps(paths):
+    """Faylların dəyişib-dəyişmədiyini yoxlamaq üçün (ölçü, mtime_ns, inode) möhürləri"""
+    stamps = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+        except OSError:
+            stamps.extend((-1, -1, -1))
+            continue
+        stamps.extend((st.st_size, st.st_mtime_ns, st.st_ino))
+    return tuple(stamps)
+
+
+class BinarySnapshot:
+    """JSON fayllarının yanında saxlanılan sütunlu ikili keş: ofset cədvəli və int32 sütunlar"""
+
+    def __init__(self, path):
+        self.path = path
+
+    def write(self, homeworks, schedule, meta, stamps):
+        """Vəziyyəti keşə yaz; keşə sığmayan qeyd varsa köhnə keşi sil və False qaytar"""
+        fields = HomeworkRecord.to_columns([HomeworkRecord.from_dict(hw) for hw in homeworks])
+        if fields is None:
+            self.discard()
+            return False
+        strings = {}
+        values = []
+        columns = []
+        for field in fields:
+            column = array("i")
+            append = column.append
+            for value in field:
+                if type(value) is str:
+                    append(strings.setdefault(value, len(strings)))
+                else:
+                    # Sətir olmayan dəyərlər (None, siyahılar) paylaşılmır: hər biri ayrıca.
+                    # Cədvəldə tərs sıra ilə sətirlərdən sonra gəlir, mənfi indekslə seçilir
+                    values.append(value)
+                    append(-len(values))
+            columns.append(column)
+        blob = SEPARATOR.join(strings)
+        if blob.count(SEPARATOR) != max(len(strings) - 1, 0):
+            # Ayırıcı simvolu olan mətn cədvəli poza bilər
+            self.discard()
+            return False
+        if sys.byteorder == "big":
+            for column in columns:
+                column.byteswap()
+
+        sections = [blob.encode("utf-8"),
+                    json.dumps(values[::-1], ensure_ascii=False, default=to_json).encode("utf-8")]
+        sections.extend(column.tobytes() for column in columns)
+        sections.append(json.dumps({"schedule": schedule, "meta": meta}, ensure_ascii=False,
+                                   default=to_json).encode("utf-8"))
+
+        position = HEADER.size + SECTION.size * len(sections)
+        table = []
+        for section in sections:
+            table.append(SECTION.pack(position, len(section)))
+            position += len(section)
+        header = HEADER.pack(MAGIC, *stamps, len(homeworks), len(sections))
+        atomic_write_bytes(self.path, b"".join([header] + table + sections))
+        return True
+
+    def load(self, stamps):
+        """Möhürlər uyğundursa (tapşırıqlar, cədvəl, meta), əks halda None"""
+        try:
+            with open(self.path, "rb") as f:
+                data = f.read()
+            magic, *saved, count, section_count = HEADER.unpack_from(data)
+            if magic != MAGIC or tuple(saved) != stamps:
+                return None
+            sections = [SECTION.unpack_from(data, HEADER.size + SECTION.size * i)
+                        for i in range(section_count)]
+            view = memoryview(data)
+
+            def section(i):
+                offset, length = sections[i]
+                return view[offset:offset + length]
+
+            table = bytes(section(0)).decode("utf-8").split(SEPARATOR)
+            table.extend(json.loads(bytes(section(1))))
+            columns = []
+            for i in range(len(FIELDS)):
+                column = array("i")
+                column.frombytes(section(2 + i))
+                if sys.byteorder == "big":
+                    column.byteswap()
+                if len(column) != count:
+                    return None
+                columns.append(list(map(table.__getitem__, column)))
+            rest = json.loads(bytes(section(2 + len(FIELDS))))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, IndexError, struct.error):
+            # Zədələnmiş keş: JSON-dan yüklənəcək və keş yenidən yazılacaq
+            return None
+        return HomeworkRecord.from_columns(columns), rest["schedule"], rest["meta"]
+
+    def discard(self):
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
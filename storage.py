@@ -0,0 +1,465 @@
+import json
+import os
+import sqlite3
+import threading
+
+from deadlines import deadline_ordinal
+from journal import Journal, atomic_write_text, render_json
+from snapshot import BinarySnapshot, file_stamps
+
+HOMEWORK_OPS = {"add_homework", "complete_homework", "delete_homework", "archive_homeworks"}
+SCHEDULE_OPS = {"complete_homework", "delete_homework", "add_session", "remove_session",
+                "complete_session"}
+# Tarixli təkrarların dəyişiklikləri meta içində saxlanılır
+CALENDAR_OPS = {"set_occurrence"}
+
+
+class JsonStorage:
+    """Standart JSON faylları ilə saxlama"""
+    kind = "json"
+    supports_queries = False
+
+    def __init__(self, data_file="homework_data.json", schedule_file="study_schedule.json",
+                 meta_file="homework_meta.json", cache_file=None):
+        self.data_file = data_file
+        self.schedule_file = schedule_file
+        self.meta_file = meta_file
+        self.cache = BinarySnapshot(cache_file) if cache_file else None
+        self.cache_fresh = False
+        self.bytes_written = 0
+
+    def stamps(self):
+        return file_stamps((self.data_file, self.schedule_file, self.meta_file))
+
+    def load(self):
+        """Tapşırıqları, cədvəli, meta məlumatı və tətbiq ediləcək qeydləri qaytar"""
+        # JSON faylları keş yazılandan bəri dəyişməyibsə ikili keşdən oxu
+        cached = self.cache.load(self.stamps()) if self.cache is not None else None
+        self.cache_fresh = cached is not None
+        if cached is not None:
+            homeworks, schedule, meta = cached
+            return homeworks, schedule, meta, []
+        homeworks = []
+        schedule = None
+        meta = {}
+        if os.path.exists(self.data_file):
+            with open(self.data_file, 'r', encoding='utf-8') as f:
+                homeworks = json.load(f)
+        if os.path.exists(self.schedule_file):
+            with open(self.schedule_file, 'r', encoding='utf-8') as f:
+                schedule = json.load(f)
+        if os.path.exists(self.meta_file):
+            with open(self.meta_file, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+        return homeworks, schedule, meta, []
+
+    def record(self, op, homeworks, schedule, meta):
+        """Dəyişikliyi saxla"""
+        self.record_many([op], homeworks, schedule, meta)
+
+    def record_many(self, ops, homeworks, schedule, meta):
+        """Bir neçə dəyişikliyi hər fayla bir dəfə yazmaqla saxla"""
+        self.prepare_many(ops, homeworks, schedule, meta)()
+
+    def save(self, homeworks, schedule, meta, parts=("homeworks", "schedule")):
+        """Seçilmiş hissələri tam yaz"""
+        self.prepare_save(homeworks, schedule, meta, parts)()
+
+    def prepare_many(self, ops, homeworks, schedule, meta, compact=True):
+        """Dəyişikliklərin toxunduğu faylları indi hazırla, yazan funksiyanı qaytar"""
+        parts = []
+        if any(op["op"] in HOMEWORK_OPS for op in ops):
+            parts.append("homeworks")
+        if any(op["op"] in SCHEDULE_OPS for op in ops):
+            parts.append("schedule")
+        if "homeworks" not in parts and any(op["op"] in CALENDAR_OPS for op in ops):
+            parts.append("meta")
+        return self.prepare_save(homeworks, schedule, meta, parts)
+
+    def prepare_save(self, homeworks, schedule, meta, parts=("homeworks", "schedule")):
+        """Seçilmiş hissələri mətnə çevir; qaytarılan funksiya onları atomik yazır"""
+        files = []
+        if "homeworks" in parts:
+            files.append((self.data_file, render_json(homeworks, indent=2)))
+        if "homeworks" in parts or "meta" in parts:
+            files.append((self.meta_file, render_json(meta)))
+        if "schedule" in parts:
+            files.append((self.schedule_file, render_json(schedule, indent=2)))
+
+        def write():
+            self.cache_fresh = False
+            for path, text in files:
+                self.bytes_written += atomic_write_text(path, text)
+        return write
+
+    def checkpoint(self, homeworks, schedule, meta):
+        """Keş köhnəlibsə diskdəki JSON-a uyğun vəziyyəti ikili keşə yaz"""
+        if self.cache is not None and not self.cache_fresh:
+            self.cache_fresh = self.cache.write(homeworks, schedule, meta, self.stamps())
+
+    def close(self):
+        """Resursları burax"""
+
+
+class JournalStorage:
+    """Jurnal və snapşot ilə saxlama"""
+    kind = "journal"
+    supports_queries = False
+
+    def __init__(self, journal_file="homework_journal.jsonl",
+                 snapshot_file="homework_snapshot.json", compaction_threshold=200,
+                 legacy=None):
+        self.journal = Journal(journal_file, snapshot_file, compaction_threshold)
+        self.legacy = legacy or JsonStorage()
+
+    def load(self):
+        """Snapşotu (yoxdursa köhnə JSON fayllarını) və jurnal qeydlərini qaytar"""
+        snapshot, ops = self.journal.load()
+        if snapshot is None:
+            homeworks, schedule, meta, _ = self.legacy.load()
+        else:
+            homeworks, schedule = snapshot["homeworks"], snapshot["schedule"]
+            meta = snapshot.get("meta", {})
+        return homeworks, schedule, meta, ops
+
+    def record(self, op, homeworks, schedule, meta):
+        """Dəyişikliyi jurnala əlavə et, lazım olduqda sıx"""
+        self.record_many([op], homeworks, schedule, meta)
+
+    def record_many(self, ops, homeworks, schedule, meta):
+        """Dəyişiklikləri bir yazı ilə jurnala əlavə et"""
+        self.prepare_many(ops, homeworks, schedule, meta)()
+
+    def save(self, homeworks, schedule, meta, parts=("homeworks", "schedule")):
+        """Vəziyyəti snapşota sıx"""
+        self.prepare_save(homeworks, schedule, meta, parts)()
+
+    def prepare_many(self, ops, homeworks, schedule, meta, compact=True):
+        """Jurnal sətirlərini (lazım olduqda və compact olduqda snapşotu da) indi hazırla"""
+        if not ops:
+            return lambda: None
+        records, text = self.journal.encode(ops)
+        snapshot = None
+        # Vəziyyətdə hələ jurnala verilməmiş dəyişikliklər varsa (compact=False) snapşot
+        # onları da ehtiva edər, sonra daha böyük seq ilə təkrar tətbiq olunardılar
+        if compact and self.journal.needs_compaction(len(records)):
+            snapshot = self.journal.render_snapshot(homeworks, schedule, meta)
+
+        def write():
+            self.journal.write(text, len(records))
+            if snapshot is not None:
+                self.journal.install_snapshot(snapshot)
+        return write
+
+    def prepare_save(self, homeworks, schedule, meta, parts=("homeworks", "schedule")):
+        """Snapşotu indi hazırla, qaytarılan funksiya onu yazır"""
+        snapshot = self.journal.render_snapshot(homeworks, schedule, meta)
+        return lambda: self.journal.install_snapshot(snapshot)
+
+    def checkpoint(self, homeworks, schedule, meta):
+        """Snapşot jurnalın özündədir; ayrıca keş yoxdur"""
+
+    @property
+    def bytes_written(self):
+        return self.journal.bytes_written
+
+    def close(self):
+        """Jurnal faylını bağla"""
+        self.journal.close()
+
+
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS homeworks (
+    id INTEGER PRIMARY KEY,
+    title TEXT,
+    subject TEXT,
+    description TEXT,
+    deadline TEXT,
+    deadline_ord INTEGER,
+    priority TEXT,
+    estimated_time TEXT,
+    status TEXT,
+    created_date TEXT,
+    completed_date TEXT,
+    notes TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_homeworks_status ON homeworks(status);
+CREATE INDEX IF NOT EXISTS idx_homeworks_priority ON homeworks(priority);
+CREATE INDEX IF NOT EXISTS idx_homeworks_subject ON homeworks(subject);
+CREATE INDEX IF NOT EXISTS idx_homeworks_deadline ON homeworks(deadline_ord);
+
+CREATE TABLE IF NOT EXISTS schedule_days (
+    day TEXT PRIMARY KEY,
+    pos INTEGER
+);
+CREATE TABLE IF NOT EXISTS sessions (
+    day TEXT,
+    pos INTEGER,
+    subject TEXT,
+    start TEXT,
+    "end" TEXT,
+    homework_id INTEGER,
+    homework_title TEXT,
+    completed INTEGER,
+    notified INTEGER,
+    PRIMARY KEY (day, pos)
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_homework ON sessions(homework_id);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+HOMEWORK_COLUMNS = ("id", "title", "subject", "description", "deadline", "priority",
+                    "estimated_time", "status", "created_date", "completed_date", "notes")
+SESSION_KEYS = ("subject", "start", "end", "homework_id", "homework_title",
+                "completed", "notified")
+
+
+class SqliteStorage:
+    """İndekslənmiş sorğularla SQLite saxlama"""
+    kind = "sqlite"
+    supports_queries = True
+
+    def __init__(self, path="homework_data.db"):
+        self.path = path
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.executescript(SQLITE_SCHEMA)
+
+    @property
+    def rows_written(self):
+        """Açıldıqdan bəri dəyişdirilmiş sətirlər (SQLite bayt sayını vermir)"""
+        return self.conn.total_changes
+
+    def load(self):
+        """Bütün məlumatları bazadan oxu"""
+        with self.lock:
+            homeworks = [self._homework_from_row(row) for row in self.conn.execute(
+                f"SELECT {', '.join(HOMEWORK_COLUMNS)} FROM homeworks ORDER BY id")]
+            days = [row[0] for row in self.conn.execute(
+                "SELECT day FROM schedule_days ORDER BY pos")]
+            meta = {key: json.loads(value) for key, value in
+                    self.conn.execute("SELECT key, value FROM meta")}
+            if not days:
+                return homeworks, None, meta, []
+            schedule = {day: [] for day in days}
+            for row in self.conn.execute(
+                    'SELECT day, subject, start, "end", homework_id, homework_title, '
+                    'completed, notified FROM sessions ORDER BY day, pos'):
+                schedule.setdefault(row[0], []).append(self._session_from_row(row[1:]))
+        return homeworks, schedule, meta, []
+
+    def record(self, op, homeworks, schedule, meta):
+        """Dəyişikliyi sətir səviyyəsində yaz"""
+        self.record_many([op], homeworks, schedule, meta)
+
+    def record_many(self, ops, homeworks, schedule, meta):
+        """Dəyişiklikləri bir tranzaksiyada yaz"""
+        with self.lock, self.conn:
+            for op in ops:
+                self._record(op, meta)
+
+    def prepare_many(self, ops, homeworks, schedule, meta, compact=True):
+        """Qeydlər vəziyyətdən asılı deyil; yalnız meta surətini götür"""
+        ops, meta = list(ops), dict(meta)
+        return lambda: self.record_many(ops, None, None, meta)
+
+    def _record(self, op, meta):
+        kind = op["op"]
+        if kind == "add_homework":
+            self._insert_homeworks([op["homework"]])
+            self._save_meta(meta)
+        elif kind == "delete_homework":
+            self.conn.execute("DELETE FROM homeworks WHERE id = ?", (op["id"],))
+            days = [row[0] for row in self.conn.execute(
+                "SELECT DISTINCT day FROM sessions WHERE homework_id = ?", (op["id"],))]
+            self.conn.execute("DELETE FROM sessions WHERE homework_id = ?", (op["id"],))
+            for day in days:
+                self._renumber_day(day)
+        elif kind == "archive_homeworks":
+            self.conn.executemany("DELETE FROM homeworks WHERE id = ?",
+                                  [(hw_id,) for hw_id in op["ids"]])
+        elif kind == "complete_homework":
+            self.conn.execute(
+                "UPDATE homeworks SET status = ?, completed_date = ? WHERE id = ?",
+                ("Tamamlandı", op["date"], op["id"]))
+            self.conn.execute(
+                "UPDATE sessions SET completed = 1 WHERE homework_id = ?", (op["id"],))
+        elif kind == "add_session":
+            self._ensure_day(op["day"])
+            pos = self.conn.execute(
+                "SELECT COALESCE(MAX(pos) + 1, 0) FROM sessions WHERE day = ?",
+                (op["day"],)).fetchone()[0]
+            self._insert_session(op["day"], pos, op["session"])
+        elif kind == "remove_session":
+            self.conn.execute("DELETE FROM sessions WHERE day = ? AND pos = ?",
+                              (op["day"], op["index"]))
+            self._renumber_day(op["day"])
+        elif kind == "complete_session":
+            self.conn.execute(
+                "UPDATE sessions SET completed = 1 WHERE day = ? AND pos = ?",
+                (op["day"], op["index"]))
+        elif kind in CALENDAR_OPS:
+            self._save_meta(meta)
+
+    def save(self, homeworks, schedule, meta, parts=("homeworks", "schedule")):
+        """Seçilmiş hissələri tam yenidən yaz"""
+        self.prepare_save(homeworks, schedule, meta, parts)()
+
+    def prepare_save(self, homeworks, schedule, meta, parts=("homeworks", "schedule")):
+        """Sətirləri indi hazırla, qaytarılan funksiya onları bir tranzaksiyada yazır"""
+        homework_rows = self._homework_rows(homeworks) if "homeworks" in parts else None
+        meta = dict(meta) if "homeworks" in parts or "meta" in parts else None
+        days = None
+        if "schedule" in parts:
+            days = [(day, [tuple(session.get(key) for key in SESSION_KEYS)
+                           for session in sessions])
+                    for day, sessions in schedule.items()]
+
+        def write():
+            with self.lock, self.conn:
+                if homework_rows is not None:
+                    self.conn.execute("DELETE FROM homeworks")
+                    self._insert_rows(homework_rows)
+                if meta is not None:
+                    self._save_meta(meta)
+                if days is not None:
+                    self.conn.execute("DELETE FROM sessions")
+                    self.conn.execute("DELETE FROM schedule_days")
+                    for day, rows in days:
+                        self._ensure_day(day)
+                        self.conn.executemany(
+                            'INSERT INTO sessions (day, pos, subject, start, "end", '
+                            'homework_id, homework_title, completed, notified) '
+                            'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                            [(day, pos) + row for pos, row in enumerate(rows)])
+        return write
+
+    def select_homeworks(self, status=None, priority=None, subject=None, deadline=None,
+                         hw_id=None):
+        """Süzgəclərə uyğun tapşırıqları indekslər üzrə seç"""
+        clauses, params = [], []
+        for column, value in (("status", status), ("priority", priority),
+                              ("subject", subject), ("id", hw_id)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if deadline is not None:
+            clauses.append("deadline_ord = ?")
+            params.append(deadline_ordinal(deadline))
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self.lock:
+            rows = self.conn.execute(
+                f"SELECT {', '.join(HOMEWORK_COLUMNS)} FROM homeworks{where} ORDER BY id",
+                params).fetchall()
+        return [self._homework_from_row(row) for row in rows]
+
+    def homework_stats(self):
+        """Ümumi, fənn və prioritet üzrə tamamlama saylarını hesabla"""
+        stats = {"total": 0, "completed": 0, "subjects": {}, "priorities": {}}
+        with self.lock:
+            for column, key in (("subject", "subjects"), ("priority", "priorities")):
+                for value, total, completed in self.conn.execute(
+                        f"SELECT {column}, COUNT(*), "
+                        f"SUM(status = 'Tamamlandı') FROM homeworks "
+                        f"GROUP BY {column} ORDER BY MIN(id)"):
+                    stats[key][value] = {"total": total, "completed": completed}
+            total, completed = self.conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(status = 'Tamamlandı'), 0) "
+                "FROM homeworks").fetchone()
+        stats["total"] = total
+        stats["completed"] = completed
+        return stats
+
+    def checkpoint(self, homeworks, schedule, meta):
+        """Baza özü indekslidir; ayrıca keş yoxdur"""
+
+    def close(self):
+        """Bazanı bağla"""
+        with self.lock:
+            self.conn.close()
+
+    def _insert_homeworks(self, homeworks):
+        self._insert_rows(self._homework_rows(homeworks))
+
+    def _insert_rows(self, rows):
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO homeworks (id, title, subject, description, deadline, "
+            "deadline_ord, priority, estimated_time, status, created_date, completed_date, "
+            "notes) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+
+    @staticmethod
+    def _homework_rows(homeworks):
+        return [(hw["id"], hw["title"], hw["subject"], hw["description"], hw["deadline"],
+                 deadline_ordinal(hw["deadline"]), hw["priority"], hw["estimated_time"],
+                 hw["status"], hw["created_date"], hw["completed_date"],
+                 json.dumps(hw["notes"], ensure_ascii=False))
+                for hw in homeworks]
+
+    def _save_meta(self, meta):
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+            [(key, json.dumps(value)) for key, value in meta.items()])
+
+    def _renumber_day(self, day):
+        rowids = [row[0] for row in self.conn.execute(
+            "SELECT rowid FROM sessions WHERE day = ? ORDER BY pos", (day,))]
+        self.conn.executemany("UPDATE sessions SET pos = ? WHERE rowid = ?",
+                              list(enumerate(rowids)))
+
+    def _ensure_day(self, day):
+        self.conn.execute(
+            "INSERT OR IGNORE INTO schedule_days (day, pos) "
+            "SELECT ?, COALESCE(MAX(pos) + 1, 0) FROM schedule_days", (day,))
+
+    def _insert_session(self, day, pos, session):
+        self.conn.execute(
+            'INSERT INTO sessions (day, pos, subject, start, "end", homework_id, '
+            'homework_title, completed, notified) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            (day, pos) + tuple(session.get(key) for key in SESSION_KEYS))
+
+    @staticmethod
+    def _homework_from_row(row):
+        homework = dict(zip(HOMEWORK_COLUMNS, row))
+        homework["notes"] = json.loads(homework["notes"]) if homework["notes"] else []
+        return homework
+
+    @staticmethod
+    def _session_from_row(row):
+        session = {}
+        for key, value in zip(SESSION_KEYS, row):
+            if value is None:
+                continue
+            if key in ("completed", "notified"):
+                value = bool(value)
+            session[key] = value
+        return session
+
+
+def write_counters(store):
+    """Saxlamanın yazı sayğacları: JSON/jurnal üçün bayt, SQLite üçün sətir"""
+    if hasattr(store, "bytes_written"):
+        return {"bytes": store.bytes_written}
+    return {"rows": store.rows_written}
+
+
+STORAGE_KINDS = ("json", "journal", "sqlite")
+
+
+def open_storage(kind="json", compaction_threshold=200, data_dir="."):
+    """Adına görə saxlama növünü yarat"""
+    def path(name):
+        return os.path.join(data_dir, name)
+
+    if kind == "json":
+        return JsonStorage(path("homework_data.json"), path("study_schedule.json"),
+                           path("homework_meta.json"), path("homework_cache.bin"))
+    if kind == "journal":
+        return JournalStorage(path("homework_journal.jsonl"), path("homework_snapshot.json"),
+                              compaction_threshold, legacy=open_storage("json", data_dir=data_dir))
+    if kind == "sqlite":
+        return SqliteStorage(path("homework_data.db"))
+    raise ValueError(f"Naməlum saxlama növü: {kind}")
@@ -0,0 +1,227 @@
+import os
+import re
+import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+
+from dt import HomeworkTracker
+
+STUDENT_ID = re.compile(r"^[\w-][\w.-]*$")
+SIZE_SAMPLE = 32
+
+
+def estimate_size(tracker):
+    """İzləyicinin yaddaşdakı təxmini ölçüsü (bayt), nümunə əsasında"""
+    def record_size(record):
+        return sys.getsizeof(record) + sum(sys.getsizeof(v) for v in record.values())
+
+    def sampled(records):
+        if not records:
+            return 0
+        step = max(1, len(records) // SIZE_SAMPLE)
+        sample = records[::step]
+        return sum(record_size(r) for r in sample) * len(records) // len(sample)
+
+    size = sys.getsizeof(tracker.homeworks) + sampled(tracker.homeworks)
+    for sessions in tracker.schedule.values():
+        size += sys.getsizeof(sessions) + sampled(sessions)
+    return size
+
+
+class TrackerManager:
+    """Hər şagird üçün ayrı qovluq və yüklənmiş izləyicilərin LRU keşi"""
+
+    def __init__(self, root, storage="json", compaction_threshold=200,
+                 max_tenants=64, max_bytes=None, archive_after_days=None,
+                 write_behind=None, notifier=None):
+        self.root = root
+        self.storage = storage
+        self.compaction_threshold = compaction_threshold
+        self.max_tenants = max_tenants
+        self.max_bytes = max_bytes
+        self.archive_after_days = archive_after_days
+        self.write_behind = write_behind
+        # Verilərsə bütün yüklənmiş şagirdlərin xatırlatmaları bu göndəricidən keçir
+        self.notifier = notifier
+        self.lock = threading.RLock()
+        self.cache = OrderedDict()
+        # Yüklənən və ya bağlanan şagirdlər: student_id -> Future
+        self.loading = {}
+        self.pins = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        os.makedirs(root, exist_ok=True)
+
+    def data_dir(self, student_id):
+        """Şagirdin məlumat qovluğu"""
+        if not STUDENT_ID.match(student_id):
+            raise ValueError(f"Yanlış şagird identifikatoru: {student_id!r}")
+        return os.path.join(self.root, student_id)
+
+    def get(self, student_id, load=True):
+        """Şagirdin izləyicisini qaytar, lazım olduqda diskdən yüklə (load=False - None)"""
+        while True:
+            with self.lock:
+                tracker = self.cache.get(student_id)
+                if tracker is not None:
+                    self.cache.move_to_end(student_id)
+                    self.hits += 1
+                    return tracker
+                if not load:
+                    return None
+                pending = self.loading.get(student_id)
+                if pending is None:
+                    data_dir = self.data_dir(student_id)
+                    pending = self.loading[student_id] = Future()
+                    self.misses += 1
+                    break
+            # Başqa axın bu şagirdi yükləyir və ya bağlayır; bağlanma bitdikdə yenidən yoxla
+            tracker = pending.result()
+            if tracker is not None:
+                return tracker
+
+        # Disk oxunuşu kilidsiz gedir ki, yüklənmiş şagirdlərə müraciət gözləməsin
+        try:
+            os.makedirs(data_dir, exist_ok=True)
+            tracker = HomeworkTracker(storage=self.storage,
+                                      compaction_threshold=self.compaction_threshold,
+                                      data_dir=data_dir,
+                                      archive_after_days=self.archive_after_days,
+                                      write_behind=self.write_behind,
+                                      notifier=self.notifier)
+            if self.notifier is not None:
+                tracker.reminders.start()
+        except BaseException as exc:
+            with self.lock:
+                del self.loading[student_id]
+            pending.set_exception(exc)
+            raise
+        with self.lock:
+            self.cache[student_id] = tracker
+            del self.loading[student_id]
+            evicted = self._select_evictions(keep=student_id)
+        pending.set_result(tracker)
+        self._close_evicted(evicted)
+        return tracker
+
+    __getitem__ = get
+
+    def acquire(self, student_id, load=True):
+        """İzləyicini qaytar və buraxılana qədər keşdən çıxarılmasını qadağan et"""
+        while True:
+            tracker = self.get(student_id, load)
+            if tracker is None:
+                return None
+            with self.lock:
+                # get() ilə sancaq arasında çıxarılıbsa yenidən yüklə
+                if self.cache.get(student_id) is tracker:
+                    self.pins[student_id] = self.pins.get(student_id, 0) + 1
+                    return tracker
+
+    def release(self, student_id):
+        """acquire() ilə bağlanmış izləyicini burax; həddlər aşılıbsa True qaytarır"""
+        # Çıxarma diskə yazır, ona görə burada edilmir: True olduqda çağıran
+        # enforce_limits()-i öz axınında (serverdə icraçıda) çağırır
+        with self.lock:
+            count = self.pins.pop(student_id) - 1
+            if count:
+                self.pins[student_id] = count
+            return self.over_limits()
+
+    def __contains__(self, student_id):
+        return student_id in self.cache
+
+    def __len__(self):
+        return len(self.cache)
+
+    def students(self):
+        """Diskdə qovluğu olan bütün şagirdlər"""
+        return sorted(name for name in os.listdir(self.root)
+                      if STUDENT_ID.match(name) and os.path.isdir(os.path.join(self.root, name)))
+
+    def cached_bytes(self):
+        """Keşdəki izləyicilərin təxmini ümumi ölçüsü"""
+        return sum(estimate_size(tracker) for tracker in self.cache.values())
+
+    def over_limits(self):
+        """Say və ya yaddaş həddi aşılıbmı"""
+        with self.lock:
+            if len(self.cache) > self.max_tenants:
+                return True
+            return self.max_bytes is not None and self.cached_bytes() > self.max_bytes
+
+    def enforce_limits(self, keep=None):
+        """Say və ya yaddaş həddi aşıldıqca ən köhnə izləyiciləri çıxar"""
+        with self.lock:
+            evicted = self._select_evictions(keep)
+        self._close_evicted(evicted)
+
+    def evict(self, student_id):
+        """İzləyicini keşdən çıxar, dəyişiklikləri diskə yaz"""
+        with self.lock:
+            evicted = [self._pop(student_id)] if student_id in self.cache else []
+        self._close_evicted(evicted)
+
+    def flush_all(self):
+        """Bütün yüklənmiş izləyicilərin dəyişikliklərini yaz"""
+        with self.lock:
+            trackers = list(self.cache.values())
+        for tracker in trackers:
+            tracker.flush()
+
+    def close(self):
+        """Bütün izləyiciləri bağla"""
+        with self.lock:
+            evicted = [self._pop(student_id) for student_id in list(self.cache)]
+        self._close_evicted(evicted)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _select_evictions(self, keep):
+        # Kilid altında çağırılır: yalnız keşdən çıxarır, bağlama _close_evicted-dədir
+        evicted = []
+        while len(self.cache) > self.max_tenants:
+            if not self._pop_oldest(keep, evicted):
+                return evicted
+        if self.max_bytes is None:
+            return evicted
+        while self.cached_bytes() > self.max_bytes:
+            if not self._pop_oldest(keep, evicted):
+                break
+        return evicted
+
+    def _pop_oldest(self, keep, evicted):
+        for student_id in self.cache:
+            if student_id != keep and student_id not in self.pins:
+                evicted.append(self._pop(student_id))
+                return True
+        return False
+
+    def _pop(self, student_id):
+        # Bağlanma bitənə qədər eyni şagirdin yenidən yüklənməsi gözləyir
+        tracker = self.cache.pop(student_id)
+        closing = self.loading[student_id] = Future()
+        self.evictions += 1
+        return student_id, tracker, closing
+
+    def _close_evicted(self, evicted):
+        """Çıxarılmış izləyiciləri kilidsiz bağla; ilk xəta hamısı bağlandıqdan sonra atılır"""
+        error = None
+        for student_id, tracker, closing in evicted:
+            try:
+                tracker.close()
+            except Exception as exc:
+                error = error or exc
+            finally:
+                with self.lock:
+                    if self.loading.get(student_id) is closing:
+                        del self.loading[student_id]
+                closing.set_result(None)
+        if error is not None:
+            raise error
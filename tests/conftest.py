@@ -0,0 +1,29 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dt import HomeworkTracker  # noqa: E402
+from models import Priority, Subject  # noqa: E402
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    return str(tmp_path)
+
+
+@pytest.fixture
+def open_tracker(data_dir):
+    """Müvəqqəti qovluqda izləyici açan funksiya"""
+    def open_tracker(storage="json", **kwargs):
+        kwargs.setdefault("data_dir", data_dir)
+        return HomeworkTracker(storage=storage, **kwargs)
+    return open_tracker
+
+
+def add_homework(tracker, title="Tapşırıq", deadline="01.06.2030"):
+    """Test üçün sadə tapşırıq əlavə et"""
+    return tracker.create_homework(title, Subject.MATH.value, "", deadline,
+                                   Priority.MEDIUM.value, "1")
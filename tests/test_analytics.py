@@ -0,0 +1,102 @@
+from datetime import date
+
+from analytics import Analytics, Columns
+from models import COMPLETED, PENDING, Subject
+
+TODAY = date(2030, 1, 16)
+
+
+class NoArchive:
+    def iter_homeworks(self):
+        return iter(())
+
+
+def homework(hw_id, deadline, completed=None, subject=Subject.PHYSICS.value):
+    return {"id": hw_id, "title": f"T{hw_id}", "subject": subject, "priority": "Orta",
+            "deadline": deadline, "created_date": "01.01.2030",
+            "status": COMPLETED if completed else PENDING, "completed_date": completed}
+
+
+HOMEWORKS = [
+    homework(1, "07.01.2030", "06.01.2030 18:00"),
+    homework(2, "08.01.2030", "08.01.2030"),
+    homework(3, "09.01.2030", "11.01.2030", Subject.CHEMISTRY.value),
+    homework(4, "15.01.2030", subject=Subject.MATH.value),
+    homework(5, "14.01.2030", "15.01.2030", Subject.MATH.value),
+    homework(6, "bilinmir"),
+]
+
+
+def analytics(homeworks=HOMEWORKS):
+    columns = Columns(homeworks)
+    return Analytics(lambda: columns, NoArchive())
+
+
+def rows(table):
+    return [tuple(getattr(table, name)[row] for name, _ in Columns.TYPES)
+            for row in range(len(table))]
+
+
+def test_weekly_rates_by_deadline():
+    rates = analytics().rates("week", periods=2, today=TODAY)
+    assert [(r["period"], r["total"], r["completed"], r["on_time"], r["rate"])
+            for r in rates] == [("07.01.2030", 3, 3, 2, 100.0), ("14.01.2030", 2, 1, 0, 50.0)]
+
+
+def test_rates_grouped_by_subject():
+    rates = analytics().rates("month", by="subject", periods=1, today=TODAY)
+    assert {r["group"]: (r["total"], r["completed"]) for r in rates} == {
+        Subject.PHYSICS.value: (2, 2), Subject.CHEMISTRY.value: (1, 1),
+        Subject.MATH.value: (2, 1)}
+
+
+def test_rolling_window_sums_previous_periods():
+    rolling = analytics().rolling("week", window=2, periods=2, today=TODAY)
+    assert [(r["period"], r["total"], r["completed"], r["on_time"], r["rate"])
+            for r in rolling] == [("07.01.2030", 3, 3, 2, 100.0),
+                                  ("14.01.2030", 5, 4, 2, 80.0)]
+
+
+def test_lateness_distribution():
+    (summary,) = analytics().lateness()
+    assert (summary["count"], summary["on_time"], summary["late"]) == (4, 2, 2)
+    assert summary["average_days_late"] == 1.5 and summary["max_days_late"] == 2
+    assert {b["bucket"]: b["count"] for b in summary["distribution"]} == {
+        "erkən": 1, "vaxtında": 1, "1 gün": 1, "2-3 gün": 1, "4-7 gün": 0, "8+ gün": 0}
+
+
+def test_streaks():
+    assert analytics().streaks(TODAY) == {"current": 1, "longest": 1, "active_days": 4,
+                                          "last_day": "15.01.2030"}
+    daily = [homework(10 + i, "20.01.2030", f"{day:02d}.01.2030")
+             for i, day in enumerate((3, 4, 5, 9, 10, 16, 16))]
+    assert analytics(daily).streaks(TODAY) == {"current": 1, "longest": 3,
+                                               "active_days": 6, "last_day": "16.01.2030"}
+    assert analytics(daily).streaks(date(2030, 1, 11))["current"] == 2
+
+
+def test_swap_delete_keeps_rows_consistent():
+    columns = Columns(HOMEWORKS)
+    columns.remove(1)
+    columns.remove(6)
+    columns.remove(42)
+    columns.update(homework(5, "14.01.2030", "14.01.2030", Subject.MATH.value))
+    columns.add(homework(7, "20.01.2030"))
+    expected = [hw for hw in HOMEWORKS if hw["id"] not in (1, 5, 6)]
+    expected += [homework(5, "14.01.2030", "14.01.2030", Subject.MATH.value),
+                 homework(7, "20.01.2030")]
+    assert sorted(rows(columns)) == sorted(rows(Columns(expected)))
+    assert {hw_id: columns.id[row] for hw_id, row in columns.rows.items()} == {
+        hw_id: hw_id for hw_id in (2, 3, 4, 5, 7)}
+
+
+def test_tracker_columns_follow_changes(open_tracker):
+    tracker = open_tracker()
+    for hw in HOMEWORKS[:3]:
+        tracker.commit_op({"op": "add_homework", "homework": dict(hw, notes=[])})
+    report = tracker.analytics_report("week", periods=2, today=TODAY)
+    assert report["rows"] == 3 and report["rates"][0]["completed"] == 3
+    tracker.delete_homework(2)
+    report = tracker.analytics_report("week", periods=2, today=TODAY)
+    assert report["rows"] == 2 and report["lateness"][0]["count"] == 2
+    tracker.close()
@@ -0,0 +1,31 @@
+from datetime import date
+
+from conftest import add_homework
+from models import COMPLETED, Priority, Subject
+
+
+def add_completed(tracker, title, completed_date):
+    return tracker.create_homework(title, Subject.HISTORY.value, "", "01.01.2020",
+                                   Priority.LOW.value, "1", status=COMPLETED,
+                                   completed_date=completed_date)
+
+
+def test_archive_is_durable_before_manifest_commit(open_tracker):
+    tracker = open_tracker(write_behind=60)
+    add_homework(tracker, "Aktiv")
+    add_completed(tracker, "Köhnə 1", "05.01.2020")
+    add_completed(tracker, "Köhnə 2", "20.02.2020")
+    assert tracker.archive_completed(30, today=date(2020, 6, 1)) == 2
+    assert tracker.archive.pending() == []
+
+    # Birinci izləyici bağlanmadan (qəza kimi) diskdəki vəziyyət oxunur
+    reopened = open_tracker()
+    try:
+        assert [hw["title"] for hw in reopened.homeworks] == ["Aktiv"]
+        report = reopened.history_stats()
+        assert (report["total"], report["completed"]) == (3, 2)
+        assert sorted(hw["title"] for hw in reopened.archived_homeworks()) == ["Köhnə 1",
+                                                                                "Köhnə 2"]
+    finally:
+        reopened.close()
+        tracker.close()
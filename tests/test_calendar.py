@@ -0,0 +1,31 @@
+from datetime import date
+
+from occurrences import deadline_ordinal
+
+SESSION = {"start": "10:00", "end": "11:00", "subject": "Riyaziyyat"}
+
+
+def test_day_cache_is_bounded(open_tracker):
+    tracker = open_tracker()
+    tracker.calendar.max_days = 10
+    tracker.add_session("monday", dict(SESSION))
+    assert len(tracker.calendar_range("01.01.2030", 60)) > 0
+    assert len(tracker.calendar.days) == 10
+    tracker.close()
+
+
+def test_completed_occurrence_still_emits_session_completed(open_tracker):
+    tracker = open_tracker()
+    tracker.add_session("monday", dict(SESSION))
+    received = []
+    tracker.subscribe(received.append)
+    monday = date(2030, 1, 7)
+    tracker.complete_session("monday", 0, today=monday)
+    assert [event["type"] for event in received] == ["occurrence.updated", "session.completed"]
+    assert received[1]["date"] == "07.01.2030" and received[1]["index"] == 0
+    key = received[0]["key"]
+    assert [occ["completed"] for occ in tracker.calendar_range("07.01.2030", 8)
+            if occ["key"] == key] == [True, False]
+    assert not tracker.schedule["monday"][0].get("completed")
+    assert deadline_ordinal(received[0]["date"]) == monday.toordinal()
+    tracker.close()
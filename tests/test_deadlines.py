@@ -0,0 +1,58 @@
+from datetime import date
+
+from deadlines import DeadlineIndex, deadline_ordinal, format_ordinal
+from models import COMPLETED, PENDING
+
+DAY = date(2030, 6, 1).toordinal()
+
+
+def homework(hw_id, deadline, status=PENDING):
+    return {"id": hw_id, "deadline": deadline, "status": status}
+
+
+def test_formats_and_unparseable_deadlines():
+    for text in ("01.06.2030", "01/06/2030", "01-06-2030", "2030-06-01", " 01.06.2030 "):
+        assert deadline_ordinal(text) == DAY
+    for text in ("", "sabah", "31.02.2030", None, 20300601):
+        assert deadline_ordinal(text) is None
+    assert format_ordinal(DAY) == "01.06.2030"
+
+
+def test_between_includes_both_ends():
+    index = DeadlineIndex()
+    for hw_id, offset in ((1, -1), (2, 0), (3, 0), (4, 1), (5, 2)):
+        index.add(homework(hw_id, format_ordinal(DAY + offset)))
+    index.add(homework(6, format_ordinal(DAY), COMPLETED))
+    assert index.between(DAY, DAY, PENDING) == [2, 3]
+    assert index.between(DAY, DAY + 1, PENDING) == [2, 3, 4]
+    assert index.between(end=DAY - 1) == [1]
+    assert index.between(start=DAY + 2) == [5]
+    assert index.between(DAY + 3, DAY + 9) == []
+    assert index.between(DAY, DAY) == [2, 3, 6]
+
+
+def test_unparseable_deadlines_are_kept_apart():
+    index = DeadlineIndex()
+    index.add(homework(1, "bilinmir"))
+    index.add(homework(2, "", COMPLETED))
+    index.add(homework(3, "01.06.2030"))
+    assert index.between() == [3]
+    assert index.invalid_ids() == [1, 2] and index.invalid_ids(PENDING) == [1]
+    assert index.ordinal(1) is None and index.ordinal(3) == DAY
+    index.remove(homework(1, "bilinmir"))
+    index.remove(homework(3, "01.06.2030"))
+    assert index.invalid_ids() == [2] and index.between() == []
+
+
+def test_tracker_views(open_tracker):
+    tracker = open_tracker()
+    today = date(2030, 6, 1)
+    for title, deadline in (("Keçmiş", "31.05.2030"), ("Bu gün", "01.06.2030"),
+                            ("Həftə", "08.06.2030"), ("Sonra", "09.06.2030"),
+                            ("Səhv", "iyun")):
+        tracker.create_homework(title, "Fizika", "", deadline, "Orta", "1")
+    assert [hw["title"] for hw in tracker.overdue_homeworks(today)] == ["Keçmiş"]
+    assert [hw["title"] for hw in tracker.due_soon(7, today)] == ["Bu gün", "Həftə"]
+    assert [hw["title"] for hw in tracker.homeworks_by_deadline()][-1] == "Səhv"
+    assert [hw["title"] for hw in tracker.select_homeworks(deadline="1.6.2030")] == ["Bu gün"]
+    tracker.close()
@@ -0,0 +1,65 @@
+import json
+import os
+
+import pytest
+
+from conftest import add_homework
+from events import EVENTS_FILE, ChangeFeed, EventLog
+
+
+def test_seq_is_recovered_after_torn_write(data_dir):
+    path = os.path.join(data_dir, EVENTS_FILE)
+    feed = ChangeFeed(EventLog(path))
+    feed.publish([("homework.added", {"id": 1}), ("homework.deleted", {"id": 1})])
+    feed.close()
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"seq": 3, "type": "homework.ad')
+
+    feed = ChangeFeed(EventLog(path))
+    assert feed.seq == 2
+    assert [event["seq"] for event in feed.publish([("homework.added", {"id": 2})])] == [3]
+    feed.close()
+    with open(path, encoding="utf-8") as f:
+        assert [json.loads(line)["seq"] for line in f] == [1, 2, 3]
+    assert [event["id"] for event in EventLog(path).read(since=1)] == [1, 2]
+
+
+def test_events_wait_for_background_write(open_tracker):
+    tracker = open_tracker(write_behind=60)
+    received = []
+    tracker.subscribe(received.append)
+    add_homework(tracker, "A")
+    assert received == []
+    assert tracker.changes_since(0)["events"] == []
+
+    tracker.writer.flush()
+    assert [event["type"] for event in received] == ["homework.added"]
+    assert tracker.changes_since(0)["last_seq"] == 1
+    tracker.close()
+
+
+def test_failed_write_publishes_nothing(open_tracker, monkeypatch):
+    tracker = open_tracker()
+    received = []
+    tracker.subscribe(received.append)
+
+    def broken(*args, **kwargs):
+        def write():
+            raise OSError("disk dolu")
+        return write
+
+    with monkeypatch.context() as patch:
+        patch.setattr(tracker.store, "prepare_many", broken)
+        with pytest.raises(OSError):
+            add_homework(tracker, "A")
+    assert received == []
+
+    # Bağlanışdakı tam yazı dəyişikliyi saxlayır və hadisəni yalnız indi yayımlayır
+    tracker.close()
+    assert [event["homework"]["title"] for event in received] == ["A"]
+    reopened = open_tracker()
+    try:
+        assert [hw["title"] for hw in reopened.homeworks] == ["A"]
+        assert reopened.changes_since(0)["last_seq"] == 1
+    finally:
+        reopened.close()
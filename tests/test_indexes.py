@@ -0,0 +1,34 @@
+import pytest
+
+from conftest import add_homework
+from models import COMPLETED, PENDING, Subject
+
+
+@pytest.mark.parametrize("storage", ["json", "journal", "sqlite"])
+def test_ids_never_move_backwards(open_tracker, storage):
+    tracker = open_tracker(storage)
+    for title in ("A", "B", "C"):
+        add_homework(tracker, title)
+    tracker.delete_homework(3)
+    tracker.delete_homework(2)
+    assert add_homework(tracker, "D")["id"] == 4
+    tracker.delete_homework(4)
+    tracker.close()
+
+    tracker = open_tracker(storage)
+    assert [hw["id"] for hw in tracker.homeworks] == [1]
+    assert add_homework(tracker, "E")["id"] == 5
+    tracker.close()
+
+
+def test_buckets_follow_changes(open_tracker):
+    tracker = open_tracker()
+    for title in ("A", "B", "C"):
+        add_homework(tracker, title)
+    tracker.complete_homework(2)
+    tracker.delete_homework(3)
+    assert [hw["id"] for hw in tracker.select_homeworks(status=PENDING)] == [1]
+    assert [hw["id"] for hw in tracker.select_homeworks(status=COMPLETED)] == [2]
+    assert tracker.index.count("subject", Subject.MATH.value) == 2
+    assert tracker.find_homework(3) is None and tracker.find_homework(2)["status"] == COMPLETED
+    tracker.close()
@@ -0,0 +1,57 @@
+from intervals import DAY_END, DAY_START, IntervalIndex, session_interval
+
+
+def session(start, end, subject="Fizika"):
+    return {"subject": subject, "start": start, "end": end}
+
+
+def build(*sessions, day="monday"):
+    index = IntervalIndex()
+    for item in sessions:
+        index.add(day, item)
+    return index
+
+
+def test_session_interval():
+    assert session_interval(session("16:30", "18:00")) == (990, 1080)
+    assert session_interval(session("18:00", "18:00")) is None
+    assert session_interval(session("25:00", "26:00")) is None
+
+
+def test_overlap_uses_half_open_intervals():
+    long = session("08:00", "12:00", "Uzun")
+    short = session("13:00", "13:30", "Qısa")
+    index = build(short, long, session("15:00", "16:00"))
+    assert index.conflicts("monday", 660, 780) == [long]
+    assert index.conflicts("monday", 720, 780) == []
+    assert index.conflicts("monday", 700, 800) == [long, short]
+    # Uzun sessiya çox əvvəl başlasa da ortadakı aralıqla kəsişir
+    assert index.conflicts("monday", 600, 610) == [long]
+    assert index.conflicts("tuesday", 0, 24 * 60) == []
+
+
+def test_free_slots_walk_gaps_from_now():
+    index = build(session("08:00", "09:00"), session("09:30", "12:00"),
+                  session("11:00", "13:00"))
+    assert index.free_slots(30, start_day="monday", limit=3) == [
+        ("monday", 540, 570), ("monday", 780, 810), ("tuesday", DAY_START, DAY_START + 30)]
+    assert index.free_slots(60, start_day="monday", after=600, limit=2) == [
+        ("monday", 780, 840), ("tuesday", DAY_START, DAY_START + 60)]
+    # Bazar günü keçibsə axtarış həftənin əvvəlinə dövr vurur
+    slots = index.free_slots(DAY_END - 780, start_day="sunday", after=DAY_END, limit=7)
+    assert slots[0] == ("monday", 780, DAY_END)
+    assert [day for day, _, _ in slots] == ["monday", "tuesday", "wednesday", "thursday",
+                                            "friday", "saturday"]
+
+
+def test_version_changes_on_every_edit():
+    first = session("10:00", "11:00")
+    broken = session("11:00", "10:00")
+    index = build(first)
+    version = index.version
+    index.add("monday", broken)
+    assert index.invalid == [("monday", broken)] and index.version == version + 1
+    index.remove("monday", broken)
+    index.remove("monday", first)
+    assert index.version == version + 3
+    assert index.invalid == [] and index.conflicts("monday", 600, 660) == []
@@ -0,0 +1,125 @@
+import os
+
+from conftest import add_homework
+from journal import Journal
+from models import COMPLETED
+
+
+def journal_paths(data_dir):
+    return (os.path.join(data_dir, "homework_journal.jsonl"),
+            os.path.join(data_dir, "homework_snapshot.json"))
+
+
+def test_torn_tail_is_truncated(data_dir):
+    path, snapshot = journal_paths(data_dir)
+    journal = Journal(path, snapshot)
+    journal.append_many([{"op": "delete_homework", "id": 1},
+                         {"op": "delete_homework", "id": 2}])
+    journal.close()
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"op": "delete_homework", "id": 3, "se')
+
+    journal = Journal(path, snapshot)
+    _, ops = journal.load()
+    assert [op["id"] for op in ops] == [1, 2]
+    assert journal.append({"op": "delete_homework", "id": 4})["seq"] == 3
+    journal.close()
+    _, ops = Journal(path, snapshot).load()
+    assert [(op["id"], op["seq"]) for op in ops] == [(1, 1), (2, 2), (4, 3)]
+
+
+def test_records_covered_by_snapshot_are_skipped(data_dir):
+    path, snapshot = journal_paths(data_dir)
+    journal = Journal(path, snapshot)
+    journal.append_many([{"op": "delete_homework", "id": 1}])
+    stale = open(path, encoding="utf-8").read()
+    journal.compact([], {})
+    journal.append({"op": "delete_homework", "id": 2})
+    journal.close()
+    # Sıxılmadan sonra jurnalın təmizlənməsi yarıda qalıbsa köhnə sətirlər qalır
+    with open(path, encoding="utf-8") as f:
+        tail = f.read()
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(stale + tail)
+
+    state, ops = Journal(path, snapshot).load()
+    assert state["seq"] == 1
+    assert [op["id"] for op in ops] == [2]
+
+
+def test_tracker_reload_after_compaction(open_tracker):
+    tracker = open_tracker("journal", compaction_threshold=3)
+    for i in range(7):
+        add_homework(tracker, f"Tapşırıq {i}")
+    tracker.complete_homework(2)
+    tracker.delete_homework(5)
+    tracker.store.close()
+
+    tracker = open_tracker("journal", compaction_threshold=3)
+    try:
+        assert [hw["id"] for hw in tracker.homeworks] == [1, 2, 3, 4, 6, 7]
+        assert tracker.find_homework(2)["status"] == COMPLETED
+        assert tracker.meta["next_id"] == 8
+    finally:
+        tracker.close()
+
+
+class FailingFile:
+    """Jurnal faylı: növbəti yazının yalnız yarısını diskə verib xəta atır"""
+
+    def __init__(self, fh):
+        self.fh = fh
+        self.fail = True
+
+    def write(self, data):
+        if not self.fail:
+            return self.fh.write(data)
+        self.fail = False
+        self.fh.write(bytes(data[:len(data) // 2]))
+        raise OSError(28, "No space left on device")
+
+    def __getattr__(self, name):
+        return getattr(self.fh, name)
+
+
+def test_failed_append_does_not_corrupt_later_records(data_dir):
+    path, snapshot = journal_paths(data_dir)
+    journal = Journal(path, snapshot)
+    journal.append({"op": "delete_homework", "id": 1})
+    journal._fh = FailingFile(journal._fh)
+    try:
+        journal.append({"op": "delete_homework", "id": 2})
+    except OSError:
+        pass
+    else:
+        raise AssertionError("yazı xətası gözlənilirdi")
+    journal.append({"op": "delete_homework", "id": 3})
+    journal.append({"op": "delete_homework", "id": 4})
+    journal.close()
+
+    _, ops = Journal(path, snapshot).load()
+    assert [op["id"] for op in ops] == [1, 3, 4]
+
+
+def test_migration_to_journal_ignores_stale_records(open_tracker, data_dir):
+    tracker = open_tracker("journal")
+    add_homework(tracker, "Köhnə")
+    tracker.close()
+    path, snapshot = journal_paths(data_dir)
+    os.remove(snapshot)
+    with open(path, encoding="utf-8") as f:
+        stale = f.read()
+
+    tracker = open_tracker("json")
+    add_homework(tracker, "Yeni")
+    tracker.migrate_storage("journal")
+    tracker.close()
+    # Snapşot yazılıb, jurnalın təmizlənməsi isə qəza ilə yarıda qalıb
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(stale)
+
+    tracker = open_tracker("journal")
+    try:
+        assert [hw["title"] for hw in tracker.homeworks] == ["Yeni"]
+    finally:
+        tracker.close()
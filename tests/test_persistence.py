@@ -0,0 +1,137 @@
+import os
+import time
+
+import pytest
+
+import dt
+from conftest import add_homework
+from storage import open_storage
+
+IMPORT_LINES = [
+    '{"type": "homework", "title": "A", "subject": "Riyaziyyat", "priority": "Orta"}',
+    '{"type": "homework", "title": "B", "subject": "Fizika", "priority": "Orta"}',
+]
+
+
+def stored_titles(storage, data_dir):
+    """Diskdəki vəziyyət (jurnal qeydləri tətbiq olunmaqla) izləyicini bağlamadan"""
+    store = open_storage(storage, data_dir=data_dir)
+    try:
+        homeworks, _, _, ops = store.load()
+    finally:
+        store.close()
+    titles = [hw["title"] for hw in homeworks]
+    titles += [op["homework"]["title"] for op in ops if op["op"] == "add_homework"]
+    return titles
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "gözləmə vaxtı bitdi"
+        time.sleep(0.01)
+
+
+@pytest.mark.parametrize("storage", ["json", "journal", "sqlite"])
+def test_write_behind_subcommand_is_flushed(data_dir, storage, capsys):
+    path = os.path.join(data_dir, "hw.jsonl")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(IMPORT_LINES) + "\n")
+    assert dt.main(["--storage", storage, "--data-dir", data_dir, "--write-behind", "60",
+                    "import", path]) == 0
+    assert stored_titles(storage, data_dir) == ["A", "B"]
+
+
+def test_compaction_skipped_while_batch_is_open(open_tracker, data_dir):
+    tracker = open_tracker("journal", compaction_threshold=3, write_behind=60)
+    for title in ("1", "2", "3"):
+        add_homework(tracker, title)
+    tracker.begin_batch()
+    add_homework(tracker, "4")
+    add_homework(tracker, "5")
+    # Fon yazısı açıq toplunun dəyişikliklərini snapşota salmamalıdır
+    tracker.writer.flush()
+    tracker.persist_ops(tracker.end_batch())
+    tracker.writer.flush()
+    tracker.store.close()
+
+    reopened = open_tracker("journal", compaction_threshold=3)
+    try:
+        assert [hw["id"] for hw in reopened.homeworks] == [1, 2, 3, 4, 5]
+    finally:
+        reopened.close()
+        tracker.writer.stop()
+
+
+def test_compaction_skipped_between_end_batch_and_persist(open_tracker):
+    tracker = open_tracker("journal", compaction_threshold=2)
+    add_homework(tracker, "1")
+    tracker.begin_batch()
+    add_homework(tracker, "2")
+    ops = tracker.end_batch()
+    add_homework(tracker, "3")
+    tracker.persist_ops(ops)
+    tracker.store.close()
+
+    reopened = open_tracker("journal", compaction_threshold=2)
+    try:
+        assert sorted(hw["id"] for hw in reopened.homeworks) == [1, 2, 3]
+    finally:
+        reopened.close()
+
+
+def test_failed_background_write_is_retried(open_tracker, data_dir, monkeypatch, capsys):
+    tracker = open_tracker(write_behind=0.01)
+    prepare_many = tracker.store.prepare_many
+    failures = [OSError("disk dolu")]
+
+    def flaky(*args, **kwargs):
+        write = prepare_many(*args, **kwargs)
+
+        def run():
+            if failures:
+                raise failures.pop()
+            write()
+        return run
+
+    monkeypatch.setattr(tracker.store, "prepare_many", flaky)
+    add_homework(tracker, "A")
+    wait_for(lambda: tracker.writer.writes)
+    assert tracker.writer.failures == 1
+    assert stored_titles("json", data_dir) == ["A"]
+    assert "Fon yazısı alınmadı" in capsys.readouterr().err
+    tracker.close()
+
+
+def test_sqlite_queries_see_unwritten_changes(open_tracker):
+    tracker = open_tracker("sqlite")
+    add_homework(tracker, "Yazılmış")
+    assert tracker.disk_current()
+    assert len(tracker.select_homeworks(status=dt.PENDING)) == 1
+
+    with tracker.batch():
+        add_homework(tracker, "Toplu")
+        assert not tracker.disk_current()
+        assert [hw["title"] for hw in tracker.select_homeworks(status=dt.PENDING)] == [
+            "Yazılmış", "Toplu"]
+        assert tracker.recompute_stats()["total"] == 2
+
+    tracker.begin_batch()
+    add_homework(tracker, "Gözləyən")
+    ops = tracker.end_batch()
+    # Server end_batch ilə persist_ops arasında da yaddaşdakı vəziyyəti oxumalıdır
+    assert len(tracker.select_homeworks(status=dt.PENDING)) == 3
+    assert tracker.verify_stats() == []
+    tracker.persist_ops(ops)
+    assert tracker.disk_current()
+    assert len(tracker.select_homeworks(status=dt.PENDING)) == 3
+    tracker.close()
+
+
+def test_sqlite_queries_wait_for_background_write(open_tracker):
+    tracker = open_tracker("sqlite", write_behind=60)
+    add_homework(tracker)
+    assert len(tracker.select_homeworks()) == 1
+    tracker.writer.flush()
+    assert tracker.disk_current() and len(tracker.select_homeworks()) == 1
+    tracker.close()
@@ -0,0 +1,110 @@
+from datetime import date
+
+from indexes import HomeworkIndex
+from intervals import IntervalIndex
+from models import PENDING, Priority
+from planner import StudyPlanner, plan_tasks
+from records import HomeworkRecord
+
+TODAY = date(2030, 1, 7).toordinal()
+NINE = 9 * 60
+
+
+def task(deadline, hw_id, minutes=60):
+    return (deadline, 0, deadline, hw_id), minutes
+
+
+def planned(tasks, intervals=None, today=TODAY, minute=NINE):
+    return StudyPlanner().plan(tasks, intervals or IntervalIndex(), today, minute)
+
+
+def homework(hw_id, deadline, priority):
+    return HomeworkRecord.from_dict({
+        "id": hw_id, "title": f"T{hw_id}", "subject": "Fizika", "description": "",
+        "deadline": deadline, "priority": priority, "estimated_time": "1", "status": PENDING,
+        "created_date": "01.01.2030", "completed_date": None, "notes": []})
+
+
+def test_priority_moves_deadline_forward():
+    index = HomeworkIndex()
+    index.rebuild([], {})
+    index.add_homework(homework(1, "10.01.2030", Priority.LOW.value))
+    index.add_homework(homework(2, "11.01.2030", Priority.URGENT.value))
+    index.add_homework(homework(3, "10.01.2030", Priority.HIGH.value))
+    index.add_homework(homework(4, "09.01.2030", Priority.MEDIUM.value))
+    index.add_homework(homework(5, "bir gün", Priority.MEDIUM.value))
+    tasks, skipped = plan_tasks(index)
+    # 2: 11-2=9 (Təcili), 3: 10-1=9 (Yüksək), 4: 9, 1: 10
+    assert [key[3] for key, _ in tasks] == [2, 3, 4, 1]
+    assert skipped == [(5, "tanınmayan tarix")]
+
+
+def test_earliest_deadline_first_with_daily_cap():
+    tasks = [task(TODAY + 2, 1, 120), task(TODAY + 5, 2, 60)]
+    placed = planned(tasks)
+    # Hər tapşırığa gündə ən çox 90 dəqiqə; cari gün 09:00-dan başlayır
+    assert placed[0] == [(TODAY, NINE, NINE + 90), (TODAY + 1, 480, 510)]
+    assert placed[1] == [(TODAY, NINE + 90, NINE + 150)]
+
+
+def test_second_pass_lifts_the_cap():
+    placed = planned([task(TODAY + 1, 1, 200)])
+    assert placed == [[(TODAY, NINE, NINE + 200)]]
+
+
+def test_task_that_cannot_fit_reports_missing_minutes():
+    planner = StudyPlanner()
+    placed = planner.plan([task(TODAY, 1), task(TODAY + 1, 2, 15 * 60)], IntervalIndex(),
+                          TODAY, NINE)
+    assert placed == [60, 15 * 60 - 13 * 60]
+    plan = planner.schedule(lambda hw_id: {"title": f"T{hw_id}", "deadline": "-",
+                                           "subject": "Fizika"}, today=TODAY)
+    assert [item["reason"] for item in plan["unscheduled"]] == ["son tarix bu gündür",
+                                                               "vaxt çatmır"]
+
+
+def test_replans_from_first_changed_task():
+    tasks = [task(TODAY + 1, 1), task(TODAY + 2, 2), task(TODAY + 3, 3)]
+    intervals = IntervalIndex()
+    planner = StudyPlanner()
+    planner.plan(tasks, intervals, TODAY, NINE)
+    assert planner.replanned == 3
+    planner.plan(tasks, intervals, TODAY, NINE)
+    assert planner.replanned == 0
+
+    changed = tasks[:2] + [task(TODAY + 3, 3, 90)]
+    assert planner.plan(changed, intervals, TODAY, NINE) == planned(changed)
+    assert planner.replanned == 1
+
+    inserted = changed[:1] + [task(TODAY + 1, 4)] + changed[1:]
+    assert planner.plan(inserted, intervals, TODAY, NINE) == planned(inserted)
+    assert planner.replanned == 3
+
+    assert planner.plan(inserted[:2], intervals, TODAY, NINE) == planned(inserted[:2])
+    assert planner.replanned == 0
+
+
+def test_schedule_change_rebuilds_slots():
+    tasks = [task(TODAY + 1, 1, 90)]
+    intervals = IntervalIndex()
+    planner = StudyPlanner()
+    assert planner.plan(tasks, intervals, TODAY, NINE) == [[(TODAY, NINE, NINE + 90)]]
+    version = intervals.version
+    intervals.add("monday", {"subject": "Fizika", "start": "09:00", "end": "10:00"})
+    assert intervals.version == version + 1
+    assert planner.plan(tasks, intervals, TODAY, NINE) == [[(TODAY, 600, 690)]]
+    assert planner.replanned == 1
+
+
+def test_new_day_and_later_minute_rebuild_slots():
+    tasks = [task(TODAY + 3, 1)]
+    intervals = IntervalIndex()
+    planner = StudyPlanner()
+    planner.plan(tasks, intervals, TODAY, NINE)
+    # Dəqiqə 15-lik addıma yuxarı yuvarlaqlaşdırılır
+    assert planner.plan(tasks, intervals, TODAY, NINE + 1) == [[(TODAY, 555, 615)]]
+    assert planner.replanned == 1
+    assert planner.plan(tasks, intervals, TODAY + 1, 1) == [[(TODAY + 1, 480, 540)]]
+    assert planner.slots[0][0] == TODAY + 1
+    assert planner.plan(tasks, intervals, TODAY + 1, 14) == [[(TODAY + 1, 480, 540)]]
+    assert planner.replanned == 0
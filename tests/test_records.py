@@ -0,0 +1,61 @@
+import json
+
+import pytest
+
+from records import HomeworkRecord, SessionRecord
+from storage import open_storage
+
+ODD_HOMEWORKS = [
+    {"id": 1, "title": "Kod", "subject": 3, "description": "", "deadline": "01.06.2030",
+     "priority": 99, "estimated_time": "1", "status": 0, "created_date": "2030-05-01",
+     "completed_date": None, "notes": []},
+    {"id": 2, "title": "Naməlum", "subject": "Astronomiya", "description": None,
+     "deadline": "31.02.2030", "priority": "Təcili", "estimated_time": 2.5,
+     "status": "Gözlənilir", "created_date": 738000, "completed_date": "01.01.0999",
+     "notes": ["a", {"text": "b"}]},
+    {"id": 3, "title": "Əlavə", "subject": None, "deadline": "", "priority": 7.5,
+     "status": True, "created_date": "1.6.2030", "notes": "mətn", "tags": ["x"],
+     "source": {"kind": "import"}},
+]
+
+
+@pytest.mark.parametrize("data", ODD_HOMEWORKS, ids=lambda data: data["title"])
+def test_homework_record_round_trip(data):
+    record = HomeworkRecord.from_dict(data)
+    assert record.to_dict() == data
+    unhashable = dict(data, subject=["Fizika"], status=(1,))
+    assert HomeworkRecord.from_dict(unhashable).to_dict() == unhashable
+    assert dict(record) == data
+    assert HomeworkRecord.from_dict(json.loads(json.dumps(data))).to_dict() == data
+
+
+def test_columns_round_trip_keeps_codes_and_values_apart():
+    records = [HomeworkRecord.from_dict(data) for data in ODD_HOMEWORKS[:2]]
+    columns = HomeworkRecord.to_columns(records)
+    assert [r.to_dict() for r in HomeworkRecord.from_columns(columns)] == ODD_HOMEWORKS[:2]
+
+
+def test_session_record_keeps_integer_subject():
+    data = {"subject": 0, "start": "10:00", "end": "11:00", "room": 12}
+    assert SessionRecord.from_dict(data).to_dict() == data
+
+
+@pytest.mark.parametrize("storage", ["json", "journal"])
+def test_odd_homeworks_survive_reload(open_tracker, data_dir, storage):
+    tracker = open_tracker(storage)
+    for data in ODD_HOMEWORKS:
+        tracker.commit_op({"op": "add_homework", "homework": dict(data)})
+    tracker.close()
+    for _ in range(2):
+        # İkinci açılış JSON fayllarının yanında yazılmış ikili keşdən oxuyur
+        tracker = open_tracker(storage)
+        assert [hw.to_dict() for hw in tracker.homeworks] == ODD_HOMEWORKS
+        tracker.close()
+    store = open_storage(storage, data_dir=data_dir)
+    try:
+        homeworks, _, _, ops = store.load()
+    finally:
+        store.close()
+    homeworks = [dict(hw) for hw in homeworks]
+    homeworks += [op["homework"] for op in ops if op["op"] == "add_homework"]
+    assert homeworks == ODD_HOMEWORKS
@@ -0,0 +1,72 @@
+import threading
+from datetime import datetime, timedelta
+
+from notify import Dispatcher
+from scheduler import ReminderScheduler
+
+SCHEDULE = {"monday": [{"subject": "Riyaziyyat", "start": "10:00", "end": "11:00"}]}
+MONDAY = datetime(2025, 3, 3, 10, 0)
+
+
+class BlockingSink:
+    name = "blocking"
+
+    def __init__(self):
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.sent = []
+
+    def send(self, event):
+        self.started.set()
+        self.release.wait(5)
+        self.sent.append(event["key"])
+
+
+def run_tick(scheduler, now):
+    due, _ = scheduler.tick(now)
+    for when, day, session in due:
+        scheduler.fire(when, day, session)
+    return len(due)
+
+
+def test_rejected_reminder_is_retried():
+    now = [MONDAY]
+    accepted = []
+    answers = [False, True]
+
+    def on_due(day, session, when):
+        ok = answers.pop(0)
+        if ok:
+            accepted.append((day, session["subject"], when))
+        return ok
+
+    scheduler = ReminderScheduler(lambda: SCHEDULE, on_due, clock=lambda: now[0],
+                                  retry_delay=5)
+    scheduler.last_check = MONDAY - timedelta(hours=1)
+    assert run_tick(scheduler, now[0]) == 1
+    assert accepted == []
+    now[0] = MONDAY + timedelta(seconds=2)
+    assert run_tick(scheduler, now[0]) == 0
+    now[0] = MONDAY + timedelta(seconds=6)
+    assert run_tick(scheduler, now[0]) == 1
+    assert accepted == [("monday", "Riyaziyyat", MONDAY)]
+    now[0] = MONDAY + timedelta(seconds=20)
+    assert run_tick(scheduler, now[0]) == 0
+
+
+def test_full_queue_rejects_without_remembering():
+    sink = BlockingSink()
+    dispatcher = Dispatcher([sink], workers=1, queue_size=1)
+    try:
+        assert dispatcher.submit({"key": "a"})
+        # İşçi "a"-nı göndərir; növbədə bir yer qalır
+        assert sink.started.wait(5)
+        assert dispatcher.submit({"key": "b"})
+        assert not dispatcher.submit({"key": "c"})
+        assert dispatcher.stats["dropped"] == 1
+        assert dispatcher.submit({"key": "a"})
+        assert dispatcher.stats["duplicates"] == 1
+    finally:
+        sink.release.set()
+        dispatcher.close()
+    assert sink.sent == ["a", "b"]
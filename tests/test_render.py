@@ -0,0 +1,83 @@
+import io
+
+import pytest
+
+from render import Pages, show_pages
+
+
+class Counting:
+    """Mənbədən neçə element oxunduğunu sayan iterator"""
+
+    def __init__(self, n):
+        self.items = iter(range(n))
+        self.taken = 0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        value = next(self.items)
+        self.taken += 1
+        return value
+
+
+def test_pages_load_lazily_and_navigate_back():
+    source = Counting(25)
+    pages = Pages(source, page_size=10)
+    assert pages.page(0) == list(range(10))
+    # Növbəti səhifənin varlığını bilmək üçün bir element artıq oxunur
+    assert source.taken == 11 and pages.known_pages() is None
+    assert pages.has_next(0) and pages.page(2) == list(range(20, 25))
+    assert not pages.has_next(2) and pages.known_pages() == 3
+    assert pages.page(1) == list(range(10, 20))
+    assert pages.page(5) == []
+
+
+def test_pages_without_history_drop_read_items():
+    pages = Pages(range(25), page_size=10, keep=False)
+    assert pages.page(0) == list(range(10))
+    assert pages.page(1) == list(range(10, 20))
+    assert len(pages.loaded) <= 1
+    with pytest.raises(IndexError):
+        pages.page(0)
+
+
+def test_empty_source_has_one_page():
+    pages = Pages([], page_size=10)
+    assert pages.page(0) == [] and not pages.has_next(0) and pages.known_pages() == 1
+
+
+def test_non_interactive_output_is_one_stream():
+    out = io.StringIO()
+    shown = show_pages(range(7), lambda n: f"{n}\n", header="#\n", page_size=3, out=out,
+                       interactive=False)
+    assert shown == 7 and out.getvalue() == "#\n0\n1\n2\n3\n4\n5\n6\n"
+
+
+def test_interactive_navigation(monkeypatch):
+    answers = iter(["n", "n", "p", "1", "9", ""])
+    monkeypatch.setattr("builtins.input", lambda prompt="": next(answers))
+    out = io.StringIO()
+    show_pages(range(7), lambda n: f"<{n}>", page_size=3, out=out, interactive=True)
+    text = out.getvalue()
+    pages = [line for line in text.splitlines() if line.startswith("<")]
+    assert pages == ["<0><1><2>", "<3><4><5>", "<6>", "<3><4><5>", "<0><1><2>", "<0><1><2>"]
+    assert "📄 Səhifə 3/3" in text
+
+
+def test_sorted_sessions_cache_follows_schedule_edits(open_tracker):
+    tracker = open_tracker()
+    tracker.add_session("saturday", {"subject": "Kimya", "start": "18:00", "end": "19:00"})
+    tracker.add_session("saturday", {"subject": "Fizika", "start": "09:00", "end": "10:00"})
+
+    def order():
+        sessions = tracker.index.sorted_sessions("saturday", tracker.schedule["saturday"])
+        return [session["subject"] for session in sessions]
+
+    assert order() == ["Fizika", "Təkrar", "Kimya"]
+    assert "saturday" in tracker.index.day_order
+    tracker.add_session("saturday", {"subject": "Tarix", "start": "13:00", "end": "14:00"})
+    assert order() == ["Fizika", "Təkrar", "Tarix", "Kimya"]
+    tracker.remove_session("saturday", 2)
+    assert order() == ["Təkrar", "Tarix", "Kimya"]
+    tracker.close()
@@ -0,0 +1,61 @@
+from search import SearchIndex, fold, tokenize
+
+
+def homework(hw_id, title, description="", notes=()):
+    return {"id": hw_id, "title": title, "description": description, "notes": list(notes)}
+
+
+def build(*homeworks):
+    index = SearchIndex()
+    for hw in homeworks:
+        index.add(hw)
+    return index
+
+
+def ids(results):
+    return [hw_id for hw_id, _ in results]
+
+
+def test_fold_handles_azerbaijani_letters():
+    assert fold("İNŞA") == fold("inşa") == "insa"
+    assert fold("QIZ") == fold("qız") == "qiz"
+    assert fold("İ̇") == "i"
+    assert tokenize("Ədəbiyyat: GÜNƏŞ, çay!") == ["edebiyyat", "gunes", "cay"]
+
+
+def test_all_words_must_match():
+    index = build(homework(1, "Riyaziyyat məsələləri"), homework(2, "Fizika məsələləri"),
+                  homework(3, "Riyaziyyat testi"))
+    assert sorted(ids(index.search("məsələləri riyaziyyat"))) == [1]
+    assert index.search("riyaziyyat kimya") == []
+    assert index.search("") == []
+
+
+def test_only_last_word_is_a_prefix():
+    index = build(homework(1, "Riyaziyyat məsələləri"), homework(2, "Riyazi testlər"))
+    assert sorted(ids(index.search("riya"))) == [1, 2]
+    assert index.search("riya test") == []
+    assert ids(index.search("riyazi test")) == [2]
+    assert index.search("riyazi test", prefix=False) == []
+    assert index.search("riyazi məsələ") == []
+
+
+def test_title_outweighs_description():
+    index = build(homework(1, "Kimya", description="inşa planı"),
+                  homework(2, "İnşa yazmaq"),
+                  homework(3, "Tarix", notes=["inşa üçün mənbə"]))
+    assert ids(index.search("INSA"))[0] == 2
+    assert ids(index.search("insa tarix")) == [3]
+    assert ids(index.search("insa", limit=1)) == [2]
+    assert ids(index.search("insa", allowed={1, 3})) == [1, 3]
+
+
+def test_index_follows_update_and_remove():
+    index = build(homework(1, "Köhnə başlıq"), homework(2, "Köhnə mövzu"))
+    index.update(homework(1, "Yeni başlıq"))
+    assert ids(index.search("köhnə")) == [2]
+    assert ids(index.search("yeni")) == [1]
+    index.remove(2)
+    assert index.search("köhnə") == [] and index.search("mövz") == []
+    assert "kohne" not in index.postings and "kohne" not in index.vocabulary()
+    assert len(index) == 1
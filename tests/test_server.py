@@ -0,0 +1,152 @@
+import asyncio
+from urllib.parse import quote
+
+from conftest import add_homework
+from dt import HomeworkTracker
+from models import COMPLETED, PENDING
+from server import ApiClient, ApiServer, route
+from storage import open_storage
+from tenants import TrackerManager
+
+HOMEWORK = {"title": "İnşa", "subject": "Ədəbiyyat", "priority": "Orta",
+            "deadline": "01.06.2030", "estimated_time": "2"}
+
+
+class FailingServer(ApiServer):
+    @route("POST", "/explode", mutates=True)
+    def explode(self, tracker, params, query, data):
+        add_homework(tracker, "Yarımçıq")
+        raise KeyError("daxili xəta")
+
+
+def run_api(data_dir, scenario, server_class=ApiServer, **manager_options):
+    async def main():
+        manager = TrackerManager(data_dir, **manager_options)
+        server = await server_class(manager, port=0).start()
+        try:
+            async with ApiClient(port=server.port) as client:
+                return await scenario(client)
+        finally:
+            await server.close()
+            manager.close()
+    return asyncio.run(main())
+
+
+def test_homework_round_trip(data_dir):
+    async def scenario(client):
+        status, created = await client.post("/students/ali/homeworks", HOMEWORK)
+        assert status == 201 and created["id"] == 1
+        status, listed = await client.get("/students/ali/homeworks?status=" + quote(PENDING))
+        assert status == 200 and [hw["title"] for hw in listed] == ["İnşa"]
+        status, completed = await client.post("/students/ali/homeworks/1/complete")
+        assert status == 200 and completed["status"] == COMPLETED
+        status, events = await client.get("/students/ali/events?since=0")
+        assert [event["type"] for event in events["events"]] == ["homework.added",
+                                                                 "homework.completed"]
+        assert (await client.get("/students/ali/homeworks/7"))[0] == 404
+        assert (await client.delete("/students/ali/homeworks"))[0] == 405
+
+    run_api(data_dir, scenario)
+    tracker = HomeworkTracker(data_dir=f"{data_dir}/ali")
+    try:
+        assert tracker.find_homework(1)["status"] == COMPLETED
+    finally:
+        tracker.close()
+
+
+def test_client_errors_are_400(data_dir):
+    async def scenario(client):
+        status, body = await client.post("/students/ali/homeworks", dict(HOMEWORK, title=""))
+        assert status == 400 and body["error"]
+        assert (await client.post("/students/ali/homeworks", [1, 2]))[0] == 400
+        assert (await client.get("/students/ali/calendar?days=abc"))[0] == 400
+        assert (await client.get("/students/ali/calendar?days=0"))[0] == 400
+        assert (await client.get("/students/ali/calendar?days=100000"))[0] == 400
+        assert (await client.get("/students/../homeworks"))[0] == 400
+
+    run_api(data_dir, scenario)
+
+
+def test_failed_handler_still_persists_applied_changes(data_dir):
+    async def scenario(client):
+        status, body = await client.post("/students/ali/explode")
+        assert status == 500 and "KeyError" in body["error"]
+        # Server hələ işləyir: dəyişiklik sorğu bitəndə artıq jurnalda olmalıdır
+        store = open_storage("journal", data_dir=f"{data_dir}/ali")
+        try:
+            _, _, _, ops = store.load()
+        finally:
+            store.close()
+        assert [op["homework"]["title"] for op in ops] == ["Yarımçıq"]
+        status, events = await client.get("/students/ali/events?since=0")
+        assert [event["type"] for event in events["events"]] == ["homework.added"]
+
+    run_api(data_dir, scenario, FailingServer, storage="journal")
+
+
+def test_eviction_after_release(data_dir):
+    async def scenario(client):
+        for student in ("ali", "leyla", "nigar"):
+            assert (await client.post(f"/students/{student}/homeworks", HOMEWORK))[0] == 201
+        status, listed = await client.get("/students/ali/homeworks")
+        assert status == 200 and len(listed) == 1
+
+    run_api(data_dir, scenario, max_tenants=1, write_behind=60)
+
+
+def test_bad_content_length_is_400(data_dir):
+    async def scenario(client):
+        reader, writer = await asyncio.open_connection(client.host, client.port)
+        try:
+            for length in ("abc", "-1", "²"):
+                writer.write(("POST /students/ali/homeworks HTTP/1.1\r\n"
+                              f"Content-Length: {length}\r\n\r\n").encode("latin-1"))
+                await writer.drain()
+                status = int((await reader.readline()).split()[1])
+                assert status == 400
+                # Cavabdan sonra server əlaqəni bağlayır
+                assert (await reader.read()).endswith(b"}")
+                writer.close()
+                reader, writer = await asyncio.open_connection(client.host, client.port)
+        finally:
+            writer.close()
+        assert (await client.get("/students/ali/homeworks"))[0] == 200
+
+    run_api(data_dir, scenario)
+
+
+def test_first_mutation_writes_default_schedule_in_persist(open_tracker, data_dir):
+    tracker = open_tracker("journal")
+    tracker.begin_batch()
+    tracker.add_session("monday", {"subject": "Fizika", "start": "18:00", "end": "19:00"})
+    sessions = len(tracker.schedule["monday"])
+    # Serverdə işləyici hadisə dövründə işləyir: orada heç nə diskə yazılmamalıdır
+    assert tracker.schedule_write is not None
+    store = open_storage("journal", data_dir=data_dir)
+    try:
+        assert store.load()[1] is None
+    finally:
+        store.close()
+    tracker.persist_ops(tracker.end_batch())
+    assert tracker.schedule_write is None
+    tracker.close()
+
+    tracker = open_tracker("journal")
+    assert len(tracker.schedule["monday"]) == sessions
+    tracker.close()
+
+
+def test_overlapping_session_needs_force(data_dir):
+    async def scenario(client):
+        clash = {"subject": "Kimya", "start": "17:00", "end": "18:30"}
+        status, body = await client.post("/students/ali/schedule/monday", clash)
+        assert status == 409 and "16:00-17:30" in body["error"] and "18:00-19:00" in body["error"]
+        status, free = await client.get("/students/ali/schedule/free-slots?minutes=30&limit=2")
+        assert status == 200 and len(free) == 2
+        assert (await client.post("/students/ali/schedule/monday?force=1", clash))[0] == 201
+        status, schedule = await client.get("/students/ali/schedule")
+        assert [s["subject"] for s in schedule["monday"]] == ["Riyaziyyat", "Fizika", "Kimya"]
+        free_time = {"subject": "Kimya", "start": "20:00", "end": "21:00"}
+        assert (await client.post("/students/ali/schedule/monday", free_time))[0] == 201
+
+    run_api(data_dir, scenario)
@@ -0,0 +1,119 @@
+import json
+import os
+
+import pytest
+
+import storage
+from conftest import add_homework
+from records import HomeworkRecord
+from snapshot import BinarySnapshot, file_stamps
+
+CACHE_FILE = "homework_cache.bin"
+HOMEWORKS = [
+    {"id": 1, "title": "İnşa", "subject": "Ədəbiyyat", "description": "", "deadline": "01.06.2030",
+     "priority": "Orta", "estimated_time": "2", "status": "Gözləmədə",
+     "created_date": "01.05.2030", "completed_date": None, "notes": []},
+    {"id": 2, "title": "İnşa", "subject": "Naməlum", "description": None, "deadline": "sabah",
+     "priority": "Təcili", "estimated_time": 1.5, "status": "Tamamlandı",
+     "created_date": "01.05.2030", "completed_date": "02.05.2030", "notes": ["qeyd"]},
+]
+
+
+def write_snapshot(path, stamps=(1, 2, 3, 4, 5, 6, 7, 8, 9)):
+    snapshot = BinarySnapshot(path)
+    assert snapshot.write([HomeworkRecord.from_dict(hw) for hw in HOMEWORKS],
+                          {"monday": [{"subject": "Fizika"}]}, {"next_id": 3}, stamps)
+    return snapshot
+
+
+def test_binary_round_trip(data_dir):
+    snapshot = write_snapshot(os.path.join(data_dir, CACHE_FILE))
+    homeworks, schedule, meta = snapshot.load((1, 2, 3, 4, 5, 6, 7, 8, 9))
+    assert [hw.to_dict() for hw in homeworks] == HOMEWORKS
+    assert schedule == {"monday": [{"subject": "Fizika"}]} and meta == {"next_id": 3}
+
+
+def test_stale_stamps_are_ignored(data_dir):
+    snapshot = write_snapshot(os.path.join(data_dir, CACHE_FILE))
+    assert snapshot.load((1, 2, 3, 4, 5, 6, 7, 8, 10)) is None
+
+
+@pytest.mark.parametrize("damage", [
+    lambda data: data[:20],
+    lambda data: data[:-7],
+    lambda data: b"XXXXXXXX" + data[8:],
+    lambda data: data[:200] + b"\xff" * 16 + data[216:],
+])
+def test_corrupt_cache_is_ignored(data_dir, damage):
+    path = os.path.join(data_dir, CACHE_FILE)
+    snapshot = write_snapshot(path)
+    with open(path, "rb") as f:
+        data = f.read()
+    with open(path, "wb") as f:
+        f.write(damage(data))
+    assert snapshot.load((1, 2, 3, 4, 5, 6, 7, 8, 9)) is None
+
+
+def test_tracker_falls_back_to_changed_json(open_tracker, data_dir):
+    tracker = open_tracker()
+    add_homework(tracker, "A")
+    tracker.close()
+    cache = os.path.join(data_dir, CACHE_FILE)
+    assert os.path.exists(cache)
+
+    # Başqa alət JSON-u dəyişir: ölçü/mtime/inode möhürü keşlə uyğun gəlmir
+    data_file = os.path.join(data_dir, "homework_data.json")
+    with open(data_file, encoding="utf-8") as f:
+        homeworks = json.load(f)
+    homeworks[0]["title"] = "Xaricdən dəyişdirilmiş"
+    with open(data_file, "w", encoding="utf-8") as f:
+        json.dump(homeworks, f, ensure_ascii=False)
+    tracker = open_tracker()
+    assert not tracker.store.cache_fresh
+    assert [hw["title"] for hw in tracker.homeworks] == ["Xaricdən dəyişdirilmiş"]
+    tracker.close()
+
+    tracker = open_tracker()
+    assert tracker.store.cache_fresh
+    assert [hw["title"] for hw in tracker.homeworks] == ["Xaricdən dəyişdirilmiş"]
+    tracker.close()
+
+
+def test_no_checkpoint_after_failed_write(open_tracker, data_dir, monkeypatch):
+    tracker = open_tracker()
+    add_homework(tracker, "A")
+    tracker.close()
+    stamps = file_stamps([os.path.join(data_dir, CACHE_FILE)])
+
+    tracker = open_tracker()
+    assert tracker.store.cache_fresh
+
+    def fail(path, text, sync=True):
+        raise OSError("disk dolub")
+
+    monkeypatch.setattr(storage, "atomic_write_text", fail)
+    with pytest.raises(OSError):
+        add_homework(tracker, "B")
+    with pytest.raises(OSError):
+        tracker.close()
+    monkeypatch.undo()
+    assert file_stamps([os.path.join(data_dir, CACHE_FILE)]) == stamps
+
+    tracker = open_tracker()
+    assert [hw["title"] for hw in tracker.homeworks] == ["A"]
+    tracker.close()
+
+
+def test_no_checkpoint_over_unwritten_batch(open_tracker, data_dir):
+    tracker = open_tracker()
+    add_homework(tracker, "A")
+    tracker.begin_batch()
+    add_homework(tracker, "B")
+    tracker.close()
+
+    # Keş yalnız diskdəki JSON-u əks etdirə bilər
+    with open(os.path.join(data_dir, "homework_data.json"), encoding="utf-8") as f:
+        on_disk = [hw["title"] for hw in json.load(f)]
+    tracker = open_tracker()
+    assert [hw["title"] for hw in tracker.homeworks] == on_disk
+    tracker.close()
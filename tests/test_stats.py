@@ -0,0 +1,40 @@
+from datetime import date
+
+import pytest
+
+from conftest import add_homework
+
+
+@pytest.mark.parametrize("storage", ["json", "sqlite"])
+def test_counters_match_full_recount(open_tracker, storage):
+    tracker = open_tracker(storage)
+    for title in ("A", "B", "C", "D"):
+        add_homework(tracker, title)
+    tracker.complete_homework(1)
+    tracker.complete_homework(2)
+    tracker.delete_homework(3)
+    assert tracker.verify_stats() == []
+    stats = tracker.homework_stats()
+    assert (stats["total"], stats["completed"]) == (3, 2)
+
+    # Arxivləmə aktiv sayğaclardan çıxarır, tarixçə isə arxivi də sayır
+    archived = tracker.archive_completed(0, today=date(2100, 1, 1))
+    assert archived == 2 and tracker.verify_stats() == []
+    assert tracker.homework_stats()["total"] == 1
+    history = tracker.history_stats()
+    assert (history["total"], history["completed"]) == (3, 2)
+    tracker.close()
+
+    tracker = open_tracker(storage)
+    assert tracker.verify_stats() == []
+    assert tracker.homework_stats()["total"] == 1
+    tracker.close()
+
+
+def test_empty_groups_are_dropped(open_tracker):
+    tracker = open_tracker()
+    hw = add_homework(tracker)
+    tracker.delete_homework(hw["id"])
+    assert tracker.homework_stats() == {"total": 0, "completed": 0, "subjects": {},
+                                        "priorities": {}}
+    tracker.close()
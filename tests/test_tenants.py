@@ -0,0 +1,69 @@
+import threading
+
+import pytest
+
+import tenants
+from conftest import add_homework
+from tenants import TrackerManager
+
+
+def test_lru_eviction_flushes_and_reloads(data_dir):
+    manager = TrackerManager(data_dir, max_tenants=2, write_behind=60)
+    try:
+        add_homework(manager.get("ali"), "Ali-nin tapşırığı")
+        manager.get("leyla")
+        manager.get("ali")
+        manager.get("nigar")
+        assert "leyla" not in manager
+        assert "ali" in manager and "nigar" in manager
+        assert manager.evictions == 1
+
+        manager.get("kamran")
+        assert "ali" not in manager
+        assert [hw["title"] for hw in manager.get("ali").homeworks] == ["Ali-nin tapşırığı"]
+    finally:
+        manager.close()
+
+
+def test_pinned_tracker_is_not_evicted(data_dir):
+    manager = TrackerManager(data_dir, max_tenants=1)
+    try:
+        manager.acquire("ali")
+        manager.get("leyla")
+        assert "ali" in manager and "leyla" in manager
+        assert manager.release("ali")
+        assert "ali" in manager
+        manager.enforce_limits()
+        assert "ali" not in manager
+    finally:
+        manager.close()
+
+
+def test_cached_tenant_is_served_while_another_loads(data_dir, monkeypatch):
+    manager = TrackerManager(data_dir)
+    cached = manager.get("ali")
+    started, finish = threading.Event(), threading.Event()
+
+    class SlowTracker(tenants.HomeworkTracker):
+        def __init__(self, **kwargs):
+            started.set()
+            assert finish.wait(5)
+            super().__init__(**kwargs)
+
+    monkeypatch.setattr(tenants, "HomeworkTracker", SlowTracker)
+    loader = threading.Thread(target=manager.get, args=("leyla",))
+    loader.start()
+    try:
+        assert started.wait(5)
+        assert manager.get("ali", load=False) is cached
+        assert manager.get("leyla", load=False) is None
+    finally:
+        finish.set()
+        loader.join()
+        manager.close()
+    assert "leyla" not in manager
+
+
+def test_invalid_student_id(data_dir):
+    with pytest.raises(ValueError):
+        TrackerManager(data_dir).get("../ali")